@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# row-count column added by sum_counts; ratios may reference it
+ROWS = "_n"
+
+Terms = Union[str, Mapping[str, float]]
+
+
+@dataclass
+class Ratio:
+    """
+    A rate stat declared as linear combinations of summed indicator columns,
+    e.g. ``Ratio("OBP", {"H": 1, "BB": 1, "HBP": 1}, {"AB": 1, "BB": 1, "HBP": 1, "SF": 1})``.
+    """
+
+    name: str
+    num: Terms
+    den: Terms
+    digits: Optional[int] = 3
+    empty: float = 0.0      # value when the denominator is not positive
+    min_den: float = 0.0    # floor applied to the denominator (e.g. max(1, swings))
+    terms: Dict[str, Dict[str, float]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        as_dict = lambda t: {t: 1.0} if isinstance(t, str) else dict(t)
+        self.terms = {"num": as_dict(self.num), "den": as_dict(self.den)}
+
+    @property
+    def columns(self) -> set:
+        return set(self.terms["num"]) | set(self.terms["den"])
+
+
+def _linear(counts: pd.DataFrame, terms: Mapping[str, float]) -> np.ndarray:
+    out = np.zeros(len(counts), dtype=float)
+    for col, coef in terms.items():
+        out += coef * counts[col].to_numpy(dtype=float)
+    return out
+
+
+def sum_counts(df: pd.DataFrame, by: Optional[Sequence[str]], columns: Sequence[str]) -> pd.DataFrame:
+    """One grouped sum over indicator columns plus the group row count."""
+    cols = list(columns)
+    if not by:
+        sums = {c: [df[c].sum()] for c in cols}
+        sums[ROWS] = [len(df)]
+        return pd.DataFrame(sums)
+    g = df.groupby(list(by), dropna=False, sort=True)
+    sums = g[cols].sum() if cols else pd.DataFrame(index=g.size().index)
+    sums[ROWS] = g.size()
+    return sums
+
+
+def apply_ratios(counts: pd.DataFrame, ratios: Sequence[Ratio]) -> pd.DataFrame:
+    """Evaluate every ratio as column arithmetic on a frame of summed counts."""
+    out = counts.copy()
+    for r in ratios:
+        num = _linear(out, r.terms["num"])
+        den = _linear(out, r.terms["den"])
+        if r.min_den:
+            den = np.maximum(den, r.min_den)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            val = np.where(den > 0, num / np.where(den > 0, den, 1.0), r.empty)
+        out[r.name] = np.round(val, r.digits) if r.digits is not None else val
+    return out
+
+
+def aggregate(
+    df: pd.DataFrame,
+    by: Optional[Sequence[str]],
+    counts: Sequence[str] = (),
+    ratios: Sequence[Ratio] = (),
+    means: Optional[Mapping[str, int]] = None,
+    first: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Sum ``counts`` per group, divide them into ``ratios``, and attach
+    rounded ``means`` ({column: digits}) and ``first`` values per group.
+    Ratio inputs are summed automatically; the result has ``by`` as columns.
+    """
+    means = means or {}
+    needed = list(dict.fromkeys(list(counts) + [c for r in ratios for c in sorted(r.columns) if c != ROWS]))
+    out = apply_ratios(sum_counts(df, by, needed), ratios)
+    if by:
+        g = df.groupby(list(by), dropna=False, sort=True)
+        for col, digits in means.items():
+            out[col] = g[col].mean().round(digits) if col in df.columns else 0.0
+        if first:
+            out = out.join(g[list(first)].first())
+        return out.reset_index()
+    for col, digits in means.items():
+        out[col] = round(df[col].dropna().mean(), digits) if col in df.columns else 0.0
+    for col in first:
+        out[col] = df[col].iloc[0]
+    return out
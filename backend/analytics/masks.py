@@ -0,0 +1,39 @@
+"""Vectorized per-pitch classification (same rules as the row helpers in ``metrics``)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+_WHIFF_PATTERN = "swinging_strike|missed_bunt"
+
+def _num(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col]
+
+def zone_mask(df: pd.DataFrame) -> np.ndarray:
+    px, pz = _num(df, "plate_x"), _num(df, "plate_z")
+    with np.errstate(invalid="ignore"):
+        return (np.abs(px) <= 0.83) & (pz >= _num(df, "sz_bot")) & (pz <= _num(df, "sz_top"))
+
+def swing_mask(df: pd.DataFrame) -> np.ndarray:
+    typ, desc = _text(df, "type"), _text(df, "description")
+    called = desc.astype(str).str.contains("called_strike", regex=False, na=False).to_numpy(dtype=bool)
+    return typ.eq("X").to_numpy(dtype=bool) | (typ.eq("S").to_numpy(dtype=bool) & desc.notna().to_numpy(dtype=bool) & ~called)
+
+def whiff_mask(df: pd.DataFrame) -> np.ndarray:
+    desc = _text(df, "description")
+    return desc.astype(str).str.contains(_WHIFF_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
+
+def bip_mask(df: pd.DataFrame) -> np.ndarray:
+    return _text(df, "type").eq("X").to_numpy(dtype=bool)
+
+def barrel_mask(df: pd.DataFrame) -> np.ndarray:
+    ev, la = _num(df, "launch_speed"), _num(df, "launch_angle")
+    with np.errstate(invalid="ignore"):
+        return (ev >= 98) & (la >= 26) & (la <= 30)
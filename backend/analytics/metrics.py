@@ -2,6 +2,10 @@ import math
 import numpy as np
 import pandas as pd
 
+from backend.analytics.aggregate import ROWS, Ratio, aggregate, apply_ratios, sum_counts
+from backend.analytics.masks import barrel_mask, bip_mask, swing_mask, whiff_mask, zone_mask
+from backend.analytics.zones import ZONE_25, pitch_layers, zone_layers
+
 HIT_EVENTS = {"single","double","triple","home_run"}
 AB_EVENTS_INC = {"single","double","triple","home_run","field_out","force_out","other_out","grounded_into_double_play","field_error","double_play","triple_play"}
 AB_EVENTS_EXC = {"walk","intent_walk","hit_by_pitch","sac_bunt","sac_fly","catcher_interf"}
@@ -38,118 +42,133 @@ def _barrel_like(ev, la):
         return False
     return 26 <= la <= 30
 
+# ---------- metric declarations (numerator / denominator over indicator sums) ----------
+
+TB_WEIGHTS = {"single":1, "double":2, "triple":3, "home_run":4}
+
+PA_COUNTS = ["AB","H","BB","SF","HBP","HR","TB"]
+AVG = Ratio("AVG", "H", "AB")
+OBP = Ratio("OBP", {"H":1, "BB":1, "HBP":1}, {"AB":1, "BB":1, "HBP":1, "SF":1})
+SLG = Ratio("SLG", "TB", "AB")
+BATTING_RATIOS = [AVG, OBP, SLG]
+
+PITCH_COUNTS = ["bip","hard_bip","barrel_bip","swing","whiff_swing","chase"]
+PITCH_RATIOS = [
+    Ratio("HardHitPct", "hard_bip", "bip"),
+    Ratio("BarrelPct", "barrel_bip", "bip"),
+    Ratio("WhiffSwingPct", "whiff_swing", "swing"),
+    Ratio("ChasePct", "chase", "swing"),
+]
+BABIP = Ratio("BABIP", {"H":1, "HR":-1}, {"AB":1, "whiff_swing":-1, "HR":-1, "SF":1})
+
+ZONE_RATIOS = [
+    Ratio("swing_pct", "is_swing", ROWS),
+    Ratio("whiff_swing_pct", "is_whiff", "is_swing", min_den=1),
+    Ratio("contact_pct", "is_contact", ROWS),
+]
+XWOBA_MEAN = Ratio("xwoba", "xwoba_sum", "xwoba_n", empty=np.nan)
+
+def pa_indicators(pas: pd.DataFrame) -> pd.DataFrame:
+    """Per-PA indicator columns (one row per terminal pitch)."""
+    e = pas["events"].fillna("")
+    return pas.assign(
+        AB=e.isin(list(AB_EVENTS_INC)) & (~e.isin(list(AB_EVENTS_EXC))),
+        H=e.isin(list(HIT_EVENTS)),
+        BB=e.isin(list(BB_EVENTS)),
+        SF=e.isin(list(SF_EVENTS)),
+        HBP=e.isin(list(HBP_EVENTS)),
+        HR=e.eq("home_run"),
+        TB=e.map(TB_WEIGHTS).fillna(0).astype(int),
+    )
+
+def pitch_indicators(ev: pd.DataFrame) -> pd.DataFrame:
+    """Per-pitch indicator columns derived from the classification masks."""
+    bip, swing = ev["is_bip"].to_numpy(bool), ev["is_swing"].to_numpy(bool)
+    return ev.assign(
+        bip=bip,
+        hard_bip=bip & ev["hard_hit"].to_numpy(bool),
+        barrel_bip=bip & ev["barrel_like"].to_numpy(bool),
+        swing=swing,
+        whiff_swing=swing & ev["is_whiff"].to_numpy(bool),
+        chase=swing & ~ev["in_zone"].to_numpy(bool),
+    )
+
 def season_rollup(events: pd.DataFrame) -> pd.DataFrame:
     if events.empty:
         return pd.DataFrame(columns=["batter","player_name","season","PA","AB","H","AVG","OBP","SLG","ISO","BABIP","EV","LA","HardHitPct","BarrelPct","WhiffSwingPct","ChasePct","xwOBA","xBA","xSLG"])
     ev = events.copy()
-    ev["in_zone"] = ev.apply(_is_zone, axis=1)
-    ev["is_swing"] = ev.apply(lambda r: _is_swing(r.get("description",""), r.get("type","")), axis=1)
-    ev["is_whiff"] = ev["description"].astype(str).apply(_is_whiff)
-    ev["is_bip"] = ev["type"].astype(str).apply(_is_ball_in_play)
+    ev["in_zone"] = zone_mask(ev)
+    ev["is_swing"] = swing_mask(ev)
+    ev["is_whiff"] = whiff_mask(ev)
+    ev["is_bip"] = bip_mask(ev)
     ev["hard_hit"] = ev["launch_speed"].astype(float) >= 95
-    ev["barrel_like"] = ev.apply(lambda r: _barrel_like(r.get("launch_speed",np.nan), r.get("launch_angle",np.nan)), axis=1)
+    ev["barrel_like"] = barrel_mask(ev)
     pas = _dedupe_pas(ev)
-    e = pas["events"].fillna("")
-    ab_mask = e.isin(list(AB_EVENTS_INC)) & (~e.isin(list(AB_EVENTS_EXC)))
-    h_mask = e.isin(list(HIT_EVENTS))
-    bb_mask = e.isin(list(BB_EVENTS))
-    sf_mask = e.isin(list(SF_EVENTS))
-    hbp_mask = e.isin(list(HBP_EVENTS))
-    pa = len(pas)
-    ab = int(ab_mask.sum())
-    h = int(h_mask.sum())
-    bb = int(bb_mask.sum())
-    sf = int(sf_mask.sum())
-    hbp = int(hbp_mask.sum())
-    tb = int((e=="single").sum()*1 + (e=="double").sum()*2 + (e=="triple").sum()*3 + (e=="home_run").sum()*4)
-    avg = round(h/ab,3) if ab>0 else 0.0
-    obp = round((h+bb+hbp)/(ab+bb+hbp+sf),3) if (ab+bb+hbp+sf)>0 else 0.0
-    slg = round(tb/ab,3) if ab>0 else 0.0
-    iso = round(slg-avg,3) if ab>0 else 0.0
-    bip = ev[ev["is_bip"]]
-    hard = round((bip["hard_hit"].sum()/len(bip)),3) if len(bip)>0 else 0.0
-    barrel = round((bip["barrel_like"].sum()/len(bip)),3) if len(bip)>0 else 0.0
-    swings = ev[ev["is_swing"]]
-    whiff = round((swings["is_whiff"].sum()/len(swings)),3) if len(swings)>0 else 0.0
-    chase = round((swings[~swings["in_zone"]].shape[0]/len(swings)),3) if len(swings)>0 else 0.0
-    ev_mean = round(ev["launch_speed"].dropna().mean(),1) if "launch_speed" in ev else 0.0
-    la_mean = round(ev["launch_angle"].dropna().mean(),1) if "launch_angle" in ev else 0.0
-    xwoba = round(ev["estimated_woba_using_speedangle"].dropna().mean(),3) if "estimated_woba_using_speedangle" in ev else 0.0
-    xba = round(ev["estimated_ba_using_speedangle"].dropna().mean(),3) if "estimated_ba_using_speedangle" in ev else 0.0
-    xslg = round(ev["estimated_slg_using_speedangle"].dropna().mean(),3) if "estimated_slg_using_speedangle" in ev else 0.0
-    season = int(events["game_year"].iloc[0])
+    counts = pd.concat([
+        sum_counts(pa_indicators(pas), None, PA_COUNTS),
+        sum_counts(pitch_indicators(ev), None, PITCH_COUNTS).drop(columns=[ROWS]),
+    ], axis=1)
+    c = apply_ratios(counts, BATTING_RATIOS + PITCH_RATIOS + [BABIP]).iloc[0]
+    ab = int(c["AB"])
+    means = {
+        "EV": ("launch_speed", 1), "LA": ("launch_angle", 1),
+        "xwOBA": ("estimated_woba_using_speedangle", 3),
+        "xBA": ("estimated_ba_using_speedangle", 3),
+        "xSLG": ("estimated_slg_using_speedangle", 3),
+    }
+    mean = {k: (round(ev[col].dropna().mean(), d) if col in ev else 0.0) for k, (col, d) in means.items()}
     row = {
         "batter": int(events["batter"].iloc[0]),
         "player_name": str(events["player_name"].iloc[0]),
-        "season": season,
-        "PA": pa,
+        "season": int(events["game_year"].iloc[0]),
+        "PA": int(c[ROWS]),
         "AB": ab,
-        "H": h,
-        "AVG": avg,
-        "OBP": obp,
-        "SLG": slg,
-        "ISO": iso,
-        "BABIP": round(((h - (e=="home_run").sum())/(ab - swings["is_whiff"].sum() - (e=="home_run").sum() + sf)),3) if (ab - swings["is_whiff"].sum() - (e=="home_run").sum() + sf)>0 else 0.0,
-        "EV": ev_mean,
-        "LA": la_mean,
-        "HardHitPct": hard,
-        "BarrelPct": barrel,
-        "WhiffSwingPct": whiff,
-        "ChasePct": chase,
-        "xwOBA": xwoba,
-        "xBA": xba,
-        "xSLG": xslg
+        "H": int(c["H"]),
+        "AVG": c["AVG"],
+        "OBP": c["OBP"],
+        "SLG": c["SLG"],
+        "ISO": round(c["SLG"] - c["AVG"], 3) if ab > 0 else 0.0,
+        "BABIP": c["BABIP"],
+        "EV": mean["EV"],
+        "LA": mean["LA"],
+        "HardHitPct": c["HardHitPct"],
+        "BarrelPct": c["BarrelPct"],
+        "WhiffSwingPct": c["WhiffSwingPct"],
+        "ChasePct": c["ChasePct"],
+        "xwOBA": mean["xwOBA"],
+        "xBA": mean["xBA"],
+        "xSLG": mean["xSLG"],
     }
     return pd.DataFrame([row])
 
 def split_by(events: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    cols = ["batter","player_name","season","PA","AB","H","AVG","OBP","SLG"]
     if events.empty:
-        cols = ["batter","player_name","season","PA","AB","H","AVG","OBP","SLG"]
         return pd.DataFrame(columns=by+cols)
-    ev = events.copy()
-    ev["in_zone"] = ev.apply(_is_zone, axis=1)
-    ev["is_swing"] = ev.apply(lambda r: _is_swing(r.get("description",""), r.get("type","")), axis=1)
-    ev["is_whiff"] = ev["description"].astype(str).apply(_is_whiff)
-    ev["is_bip"] = ev["type"].astype(str).apply(_is_ball_in_play)
-    pas = _dedupe_pas(ev)
-    e = pas["events"].fillna("")
-    pas["AB"] = e.isin(list(AB_EVENTS_INC)) & (~e.isin(list(AB_EVENTS_EXC)))
-    pas["H"] = e.isin(list(HIT_EVENTS))
-    pas["BB"] = e.isin(list(BB_EVENTS))
-    pas["SF"] = e.isin(list(SF_EVENTS))
-    pas["HBP"] = e.isin(list(HBP_EVENTS))
-    gb = pas.groupby(by, dropna=False)
-    out = gb.apply(lambda g: pd.Series({
-        "batter": int(g["batter"].iloc[0]),
-        "player_name": str(g["player_name"].iloc[0]),
-        "season": int(g["game_year"].iloc[0]),
-        "PA": int(len(g)),
-        "AB": int(g["AB"].sum()),
-        "H": int(g["H"].sum()),
-        "AVG": round((g["H"].sum()/g["AB"].sum()),3) if g["AB"].sum()>0 else 0.0,
-        "OBP": round(((g["H"].sum()+g["BB"].sum()+g["HBP"].sum())/(g["AB"].sum()+g["BB"].sum()+g["HBP"].sum()+g["SF"].sum())),3) if (g["AB"].sum()+g["BB"].sum()+g["HBP"].sum()+g["SF"].sum())>0 else 0.0,
-        "SLG": 0.0
-    })).reset_index()
-    return out
+    pas = pa_indicators(_dedupe_pas(events))
+    pas["season"] = pas["game_year"]
+    out = aggregate(pas, by, counts=["AB","H"], ratios=BATTING_RATIOS, first=["batter","player_name","season"])
+    out = out.rename(columns={ROWS: "PA"})
+    out[["batter","season","PA","AB","H"]] = out[["batter","season","PA","AB","H"]].astype(int)
+    out["player_name"] = out["player_name"].astype(str)
+    return out[by+cols]
 
 def bin25(events: pd.DataFrame) -> pd.DataFrame:
     if events.empty:
         return pd.DataFrame(columns=["row","col","swing_pct","whiff_swing_pct","contact_pct","xwoba"])
-    ev = events.copy()
-    z_bot = ev["sz_bot"].fillna(1.5)
-    z_top = ev["sz_top"].fillna(3.5)
-    nx = ((ev["plate_x"]+0.83)/(0.83*2)).clip(0,1)
-    nz = ((ev["plate_z"]-z_bot)/(z_top-z_bot)).clip(0,1)
-    ev["col"] = (nx*5).clip(0,0.9999).astype(int)+1
-    ev["row"] = (nz*5).clip(0,0.9999).astype(int)+1
-    ev["is_swing"] = ev.apply(lambda r: _is_swing(r.get("description",""), r.get("type","")), axis=1)
-    ev["is_whiff"] = ev["description"].astype(str).apply(_is_whiff)
-    ev["is_contact"] = ev["type"].astype(str).eq("X")
-    g = ev.groupby(["row","col"], dropna=False)
-    out = g.apply(lambda s: pd.Series({
-        "swing_pct": round((s["is_swing"].sum()/len(s)),3) if len(s)>0 else 0.0,
-        "whiff_swing_pct": round((s["is_whiff"].sum()/max(1,s["is_swing"].sum())),3),
-        "contact_pct": round((s["is_contact"].sum()/len(s)),3) if len(s)>0 else 0.0,
-        "xwoba": round(s["estimated_woba_using_speedangle"].dropna().mean(),3) if "estimated_woba_using_speedangle" in s else 0.0
-    })).reset_index()
-    return out
+    layers = zone_layers(events, ZONE_25, pitch_layers(events))
+    rows, cols = np.indices(ZONE_25.shape)
+    counts = pd.DataFrame({
+        "row": rows.ravel() + 1,
+        "col": cols.ravel() + 1,
+        ROWS: layers["pitches"].ravel(),
+        "is_swing": layers["swings"].ravel(),
+        "is_whiff": layers["whiffs"].ravel(),
+        "is_contact": layers["contact"].ravel(),
+        "xwoba_sum": layers["xwoba_sum"].ravel(),
+        "xwoba_n": layers["xwoba_n"].ravel(),
+    })
+    out = apply_ratios(counts[counts[ROWS] > 0].reset_index(drop=True), ZONE_RATIOS + [XWOBA_MEAN])
+    if "estimated_woba_using_speedangle" not in events:
+        out["xwoba"] = 0.0
+    return out[["row","col","swing_pct","whiff_swing_pct","contact_pct","xwoba"]]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from backend.sequence_src.singleflight import SingleFlight
+
+# Map common Statcast pitch names to families (extend as needed)
+PITCH_FAMILY_MAP = {
+    "4-Seam Fastball":"fastball", "4-Seam":"fastball", "FF":"fastball", "Fastball":"fastball",
+    "Sinker":"sinker", "SI":"sinker", "Two-Seam Fastball":"sinker", "FT":"sinker",
+    "Cutter":"cutter", "FC":"cutter",
+    "Slider":"slider", "SL":"slider",
+    "Curveball":"curveball", "CU":"curveball", "Knuckle Curve":"curveball", "KC":"curveball",
+    "Sweeper":"slider", "SV":"slider",  # treat sweeper as slider fam for now
+    "Changeup":"changeup", "CH":"changeup",
+    "Splitter":"splitter", "FS":"splitter",
+    "Knuckleball":"knuckleball", "KN":"knuckleball",
+}
+
+PA_KEY = ["game_pk", "at_bat_number", "batter"]
+PITCH_ORDER = ["game_pk", "at_bat_number", "pitch_number"]
+
+PA_TABLE_MAX_BYTES = int(os.getenv("SEQUENCE_BIOLAB_PA_TABLE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def build_pa_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pitch-level frame prepared once for every hitter endpoint: sorted in
+    pitch order, ``pitch_family`` mapped and ``is_pa_end`` flagging the
+    terminal pitch of each plate appearance.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    df = df.sort_values(PITCH_ORDER, kind="stable").reset_index(drop=True)
+    if "pitch_name" not in df.columns:
+        df["pitch_name"] = None
+    df["pitch_family"] = df["pitch_name"].map(PITCH_FAMILY_MAP).fillna("unknown")
+    df["is_pa_end"] = ~df.duplicated(PA_KEY, keep="last")
+    return df
+
+
+def pa_rows(table: pd.DataFrame) -> pd.DataFrame:
+    """Last pitch of each plate appearance (same rows as sort + drop_duplicates)."""
+    if table.empty:
+        return table
+    return table.loc[table["is_pa_end"]]
+
+
+@dataclass
+class _Frame:
+    df: pd.DataFrame
+    nbytes: int
+    expires: float
+
+
+class FrameCache:
+    """
+    Thread-safe LRU of DataFrames bounded by their in-memory size.
+
+    Cached frames are shared between requests and must be treated as
+    read-only; filter into new frames instead of assigning columns.
+    """
+
+    def __init__(self, max_bytes: int = PA_TABLE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._frames: "OrderedDict[Hashable, _Frame]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None or frame.expires < time.time():
+                if frame is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frame.df
+
+    def put(self, key: Hashable, df: pd.DataFrame, ttl: Optional[float] = None) -> None:
+        nbytes = int(df.memory_usage(index=True, deep=True).sum()) if not df.empty else 0
+        expires = time.time() + ttl if ttl else float("inf")
+        with self._lock:
+            self._drop(key)
+            self._frames[key] = _Frame(df, nbytes, expires)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._frames) > 1:
+                old_key = next(iter(self._frames))
+                self._drop(old_key)
+                self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        frame = self._frames.pop(key, None)
+        if frame is not None:
+            self._bytes -= frame.nbytes
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], pd.DataFrame], ttl: Optional[float] = None) -> pd.DataFrame:
+        df = self.get(key)
+        if df is not None:
+            return df
+
+        def build() -> pd.DataFrame:
+            built = builder()
+            self.put(key, built, ttl=ttl)
+            return built
+
+        return self._flight.do(key, build)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._frames),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+PA_TABLES = FrameCache()
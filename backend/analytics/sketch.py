@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 100.0
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest with the arcsine scale).
+
+    Holds at most ~``compression`` centroids regardless of how many values
+    went in, keeps the exact min/max, and merges by concatenating centroids
+    and re-compressing, so per-season sketches combine into span or career
+    sketches without the raw values. Accuracy is best in the tails.
+    """
+
+    __slots__ = ("compression", "means", "weights", "min", "max")
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION) -> None:
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.nan
+        self.max = np.nan
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], compression: float = DEFAULT_COMPRESSION) -> "TDigest":
+        v = np.asarray(values, dtype=float)
+        v = v[~np.isnan(v)]
+        digest = cls(compression)
+        if len(v):
+            digest.min, digest.max = float(v.min()), float(v.max())
+            digest._compress(v, np.ones(len(v)))
+        return digest
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def __len__(self) -> int:
+        return len(self.means)
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order].tolist(), weights[order].tolist()
+        total = float(sum(weights))
+        out_m, out_w = [], []
+        cur_m, cur_w = means[0], weights[0]
+        seen = 0.0
+        k_left = self._k(0.0)
+        # a centroid keeps absorbing neighbours while it spans at most one unit of k
+        for m, w in zip(means[1:], weights[1:]):
+            if self._k((seen + cur_w + w) / total) - k_left <= 1.0:
+                cur_m += (m - cur_m) * w / (cur_w + w)
+                cur_w += w
+            else:
+                out_m.append(cur_m)
+                out_w.append(cur_w)
+                seen += cur_w
+                k_left = self._k(seen / total)
+                cur_m, cur_w = m, w
+        out_m.append(cur_m)
+        out_w.append(cur_w)
+        self.means = np.asarray(out_m, dtype=float)
+        self.weights = np.asarray(out_w, dtype=float)
+
+    def merge(self, *others: "TDigest") -> "TDigest":
+        """New digest holding this one's and ``others``' values."""
+        parts = [d for d in (self, *others) if d is not None and len(d)]
+        out = TDigest(self.compression)
+        if parts:
+            out.min = float(min(d.min for d in parts))
+            out.max = float(max(d.max for d in parts))
+            out._compress(np.concatenate([d.means for d in parts]), np.concatenate([d.weights for d in parts]))
+        return out
+
+    def quantile(self, q: float) -> float:
+        if not len(self):
+            return np.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        total = self.weights.sum()
+        target = q * total
+        # each centroid's mass is centred on its mean; interpolate between centres
+        centres = np.cumsum(self.weights) - self.weights / 2
+        xs = np.concatenate([[0.0], centres, [total]])
+        ys = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(target, xs, ys))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "min": None if np.isnan(self.min) else self.min,
+            "max": None if np.isnan(self.max) else self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "TDigest":
+        digest = cls(raw.get("compression", DEFAULT_COMPRESSION))
+        digest.means = np.asarray(raw.get("means", []), dtype=float)
+        digest.weights = np.asarray(raw.get("weights", []), dtype=float)
+        digest.min = np.nan if raw.get("min") is None else float(raw["min"])
+        digest.max = np.nan if raw.get("max") is None else float(raw["max"])
+        return digest
+
+
+def merge_digests(digests: Iterable[Optional[TDigest]]) -> TDigest:
+    parts = [d for d in digests if d is not None]
+    if not parts:
+        return TDigest()
+    return parts[0].merge(*parts[1:])
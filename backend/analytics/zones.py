@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.analytics.masks import swing_mask, whiff_mask
+
+# strike-zone bounds used when a pitch has no sz_bot / sz_top
+DEFAULT_SZ_BOT = 1.5
+DEFAULT_SZ_TOP = 3.5
+
+
+@dataclass(frozen=True)
+class ZoneGrid:
+    """
+    Binning scheme for plate locations.
+
+    ``normalized`` measures height in strike-zone units (0 = sz_bot,
+    1 = sz_top). By default bins are right-closed and pitches outside the
+    ranges are dropped (``pd.cut`` semantics); with ``clip`` they are
+    floored and clamped into the edge bins instead.
+    """
+
+    nx: int = 9
+    nz: int = 9
+    x_range: Tuple[float, float] = (-0.85, 0.85)
+    z_range: Tuple[float, float] = (1.0, 4.0)
+    normalized: bool = False
+    clip: bool = False
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.nz, self.nx)
+
+
+HEATMAP_GRID = ZoneGrid()
+ZONE_25 = ZoneGrid(5, 5, (-0.83, 0.83), (0.0, 1.0), normalized=True, clip=True)
+
+
+def _bin(values: np.ndarray, n: int, lo: float, hi: float, clip: bool) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        if clip:
+            u = np.clip((values - lo) / (hi - lo), 0, 1)
+            idx = np.minimum(np.floor(u * n), n - 1)
+        else:
+            edges = np.linspace(lo, hi, n + 1)
+            idx = np.searchsorted(edges, values, side="left") - 1.0
+            idx[values == edges[0]] = 0
+            idx[(idx < 0) | (idx >= n)] = np.nan
+    idx[np.isnan(values)] = np.nan
+    return idx
+
+
+def cell_index(df: pd.DataFrame, grid: ZoneGrid) -> np.ndarray:
+    """Flat cell index (row * nx + col) per pitch; -1 where the pitch falls outside the grid."""
+    x = pd.to_numeric(df["plate_x"], errors="coerce").to_numpy(dtype=float)
+    z = pd.to_numeric(df["plate_z"], errors="coerce").to_numpy(dtype=float)
+    if grid.normalized:
+        bot = df["sz_bot"].fillna(DEFAULT_SZ_BOT).to_numpy(dtype=float) if "sz_bot" in df else np.full(len(df), DEFAULT_SZ_BOT)
+        top = df["sz_top"].fillna(DEFAULT_SZ_TOP).to_numpy(dtype=float) if "sz_top" in df else np.full(len(df), DEFAULT_SZ_TOP)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (z - bot) / (top - bot)
+    ix = _bin(x, grid.nx, *grid.x_range, grid.clip)
+    iz = _bin(z, grid.nz, *grid.z_range, grid.clip)
+    flat = iz * grid.nx + ix
+    return np.where(np.isnan(flat), -1, flat).astype(np.int64)
+
+
+def zone_layers(
+    df: pd.DataFrame,
+    grid: ZoneGrid,
+    layers: Mapping[str, Optional[np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """
+    Accumulate every weighted layer over one set of bin indices.
+
+    ``layers`` maps a name to per-pitch weights (None counts pitches). Each
+    result is an ``(nz, nx)`` array with row 0 at the bottom of the zone.
+    """
+    cells = grid.nx * grid.nz
+    idx = cell_index(df, grid) if len(df) else np.empty(0, dtype=np.int64)
+    keep = idx >= 0
+    idx = idx[keep]
+    out: Dict[str, np.ndarray] = {}
+    for name, weights in layers.items():
+        w = None if weights is None else np.nan_to_num(np.asarray(weights, dtype=float)[keep])
+        out[name] = np.bincount(idx, weights=w, minlength=cells).reshape(grid.shape)
+    return out
+
+
+def pitch_layers(df: pd.DataFrame) -> Dict[str, Optional[np.ndarray]]:
+    """Standard heatmap layers: pitches, swings, whiffs, contact and xwOBA sum/count."""
+    xw = pd.to_numeric(df.get("estimated_woba_using_speedangle", pd.Series(np.nan, index=df.index)), errors="coerce").to_numpy(dtype=float)
+    return {
+        "pitches": None,
+        "swings": swing_mask(df),
+        "whiffs": whiff_mask(df),
+        "contact": df["type"].astype(str).eq("X").to_numpy(dtype=bool) if "type" in df else np.zeros(len(df), dtype=bool),
+        "xwoba_sum": xw,
+        "xwoba_n": ~np.isnan(xw),
+    }
+
+
+def _gaussian_kernel(sigma: float) -> np.ndarray:
+    if sigma <= 0:
+        return np.ones(1)
+    r = int(np.ceil(4 * sigma))
+    k = np.exp(-0.5 * (np.arange(-r, r + 1) / sigma) ** 2)
+    return k / k.sum()
+
+
+def gaussian_smooth(grid: np.ndarray, sigma: Union[float, Tuple[float, float]]) -> np.ndarray:
+    """
+    Gaussian blur of a 2-D grid by zero-padded FFT convolution (no wrap-around).
+
+    ``sigma`` is in cells, either one value or ``(sigma_z, sigma_x)``.
+    The output has the input's shape; mass blurred past the edges is lost.
+    """
+    sz, sx = (sigma, sigma) if np.isscalar(sigma) else sigma
+    kernel = np.outer(_gaussian_kernel(sz), _gaussian_kernel(sx))
+    rz, rx = kernel.shape[0] // 2, kernel.shape[1] // 2
+    nz, nx = grid.shape
+    shape = (nz + 2 * rz, nx + 2 * rx)
+    spectrum = np.fft.rfft2(np.asarray(grid, dtype=float), shape) * np.fft.rfft2(kernel, shape)
+    full = np.fft.irfft2(spectrum, shape)
+    # drop round-off noise around empty regions
+    return np.clip(full[rz:rz + nz, rx:rx + nx], 0.0, None)
+
+
+def smoothed_rate(num: np.ndarray, den: np.ndarray, min_den: float = 0.0) -> np.ndarray:
+    """Ratio of two smoothed layers; NaN where the smoothed denominator is below ``min_den``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((den > 0) & (den >= min_den), num / den, np.nan)
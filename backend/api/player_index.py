@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from backend.config import CACHE_DIR, PROCESSED_DIR
+from backend.names import normalize_name
+from backend.sequence_src.crosswalk import CROSSWALK, Crosswalk
+
+PLAYERS_CSV = PROCESSED_DIR / "hitters_season.csv"
+PEOPLE_CACHE_PATH = CACHE_DIR / "people" / "people_search.json"
+
+_ID_COLUMNS = ("batter", "bid", "mlb_id", "player_id", "id")
+_NAME_COLUMNS = ("player_name", "name", "full_name")
+
+# remote answers are kept a week; empty answers only a day so call-ups show up
+PEOPLE_TTL = float(os.getenv("SEQUENCE_BIOLAB_PEOPLE_TTL", str(7 * 86400)))
+PEOPLE_MISS_TTL = float(os.getenv("SEQUENCE_BIOLAB_PEOPLE_MISS_TTL", "86400"))
+
+# trigram shortlist size, and the share of query trigrams a name must contain to be re-ranked
+FUZZY_CANDIDATES = 50
+FUZZY_MIN_SIMILARITY = 0.3
+
+
+def trigrams(norm: str) -> Set[str]:
+    """Padded character trigrams of each token ("ab" -> "  a", " ab", "ab ")."""
+    grams: Set[str] = set()
+    for token in norm.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def damerau_levenshtein(a: str, b: str) -> int:
+    """Optimal string alignment distance; an adjacent transposition costs 1."""
+    if a == b:
+        return 0
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _token_distance(qt: str, tokens: Iterable[str]) -> int:
+    # a query token may be a half-typed name, so also compare against the same-length prefix
+    return min(min(damerau_levenshtein(qt, t), damerau_levenshtein(qt, t[:len(qt)])) for t in tokens)
+
+
+def _allowed_typos(qtok: List[str]) -> int:
+    return sum(0 if len(t) < 3 else 1 if len(t) < 8 else 2 for t in qtok)
+
+
+def role_from_position(abbrev: Optional[str]) -> str:
+    """Search role for an MLB primaryPosition abbreviation."""
+    if abbrev == "P":
+        return "pitcher"
+    if abbrev == "TWP":
+        return "two-way"
+    return "hitter"
+
+
+def _role_rank(role: Optional[str]) -> int:
+    return 0 if role is None else 1 if role == "hitter" else 2
+
+
+@dataclass(frozen=True)
+class _Player:
+    id: int
+    name: str
+    norm: str
+    tokens: frozenset
+    sorted_key: str
+    role: Optional[str] = "hitter"  # None: position unknown, matches any role filter
+
+
+class _Trie:
+    """Prefix trie over name tokens; each node keeps the complete tokens below it."""
+
+    __slots__ = ("children", "tokens")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Trie"] = {}
+        self.tokens: Set[str] = set()
+
+    def add(self, token: str) -> None:
+        node = self
+        for ch in token:
+            node = node.children.setdefault(ch, _Trie())
+            node.tokens.add(token)
+
+    def prefixed(self, prefix: str) -> Set[str]:
+        node = self
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.tokens
+
+
+def _pick_columns(columns: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    low = {c.lower(): c for c in columns}
+    id_col = next((low[k] for k in _ID_COLUMNS if k in low), None)
+    name_col = next((low[k] for k in _NAME_COLUMNS if k in low), None)
+    if (not id_col or not name_col) and len(columns) >= 2:
+        # fall back to first two columns if present
+        id_col, name_col = columns[0], columns[1]
+    return id_col, name_col
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+class PeopleCache:
+    """
+    On-disk cache of MLB people-search answers.
+
+    Keeps every person seen (id, name, role) plus, per normalized query, the
+    ids returned and when. The file is shared between workers: it is
+    re-read when its mtime changes and written via a temp file and
+    ``os.replace``.
+    """
+
+    def __init__(self, path: Path = PEOPLE_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._data: Dict[str, Dict[str, Any]] = {"people": {}, "queries": {}}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        mtime = _mtime(self.path)
+        if mtime != self._mtime:
+            try:
+                raw = json.loads(self.path.read_text())
+                self._data = {"people": dict(raw.get("people", {})), "queries": dict(raw.get("queries", {}))}
+            except Exception:
+                self._data = {"people": {}, "queries": {}}
+            self._mtime = mtime
+        return self._data
+
+    def people(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"id": int(pid), **p} for pid, p in self._load()["people"].items()]
+
+    def lookup(self, q: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached answer for ``q``; None when it was never asked or has expired."""
+        with self._lock:
+            data = self._load()
+            hit = data["queries"].get(normalize_name(q))
+            if hit is None:
+                return None
+            ttl = PEOPLE_TTL if hit["ids"] else PEOPLE_MISS_TTL
+            if time.time() - hit["at"] > ttl:
+                return None
+            people = data["people"]
+            return [{"id": int(i), **people[str(i)]} for i in hit["ids"] if str(i) in people]
+
+    def record(self, q: str, people: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            data = self._load()
+            for p in people:
+                data["people"][str(int(p["id"]))] = {"name": str(p["name"]), "role": p.get("role") or "hitter"}
+            data["queries"][normalize_name(q)] = {"ids": [int(p["id"]) for p in people], "at": time.time()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.path)
+            self._mtime = _mtime(self.path)
+
+
+class PlayerSearchIndex:
+    """
+    Type-ahead index over the processed hitters table, cached MLB people and
+    the local id crosswalk (which covers pitchers the hitters table lacks).
+
+    Built on first use and rebuilt whenever a source file's mtime changes.
+    Query tokens match name tokens by prefix through the trie; candidates
+    are then ranked either by score tiers (``rank="score"``: exact 100, all
+    tokens 90, any token 60) or by the (exact, subset, prefix, Jaccard)
+    tuple. When no name carries every query token, a trigram shortlist
+    re-ranked by edit distance fills the remaining slots.
+    """
+
+    def __init__(
+        self,
+        path: Path = PLAYERS_CSV,
+        people: Optional[PeopleCache] = None,
+        crosswalk: Optional[Crosswalk] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.people = people
+        self.crosswalk = crosswalk
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[Optional[float], ...]] = None
+        self._players: List[_Player] = []
+        self._tokens: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._trie = _Trie()
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._players)
+
+    def refresh(self) -> bool:
+        """Rebuild if a source file changed; returns True when a rebuild happened."""
+        signature = (
+            _mtime(self.path),
+            _mtime(self.people.path) if self.people else None,
+            _mtime(self.crosswalk.path) if self.crosswalk else None,
+        )
+        if signature == self._signature:
+            return False
+        with self._lock:
+            if signature == self._signature:
+                return False
+            self._build(signature)
+            return True
+
+    def _rows(self, csv_mtime: Optional[float]) -> List[Tuple[Any, Any, Optional[str]]]:
+        rows: List[Tuple[Any, Any, Optional[str]]] = []
+        if csv_mtime is not None:
+            try:
+                header = list(pd.read_csv(self.path, nrows=0).columns)
+                id_col, name_col = _pick_columns(header)
+                df = pd.read_csv(self.path, usecols=[id_col, name_col]) if id_col and name_col else pd.DataFrame()
+            except Exception:
+                df = pd.DataFrame()
+            if not df.empty:
+                u = df[[id_col, name_col]].dropna().drop_duplicates()
+                rows.extend((pid, name, "hitter") for pid, name in zip(u[id_col], u[name_col]))
+        if self.people is not None:
+            rows.extend((p["id"], p["name"], p.get("role") or "hitter") for p in self.people.people())
+        if self.crosswalk is not None:
+            rows.extend(
+                (p["mlbam"], f"{p['name_last']}, {p['name_first']}".strip(", "),
+                 role_from_position(p["position"]) if p["position"] else None)
+                for p in self.crosswalk.players()
+            )
+        return rows
+
+    def _build(self, signature: Tuple[Optional[float], ...]) -> None:
+        names: Dict[Tuple[int, str], str] = {}
+        roles: Dict[int, Optional[str]] = {}
+        for pid, name, role in self._rows(signature[0]):
+            try:
+                pid = int(pid)
+            except (TypeError, ValueError):
+                continue
+            names.setdefault((pid, normalize_name(name)), str(name))
+            # real positions (people cache, crosswalk) beat the hitters table's implied "hitter",
+            # which beats a crosswalk row without a position
+            if pid not in roles or _role_rank(role) >= _role_rank(roles[pid]):
+                roles[pid] = role
+
+        players: List[_Player] = []
+        for (pid, norm), name in names.items():
+            tokens = frozenset(norm.split())
+            players.append(_Player(pid, name, norm, tokens, " ".join(sorted(tokens)), roles[pid]))
+
+        inverted: Dict[str, Set[int]] = {}
+        grams: Dict[str, List[int]] = {}
+        trie = _Trie()
+        for idx, p in enumerate(players):
+            for t in p.tokens:
+                inverted.setdefault(t, set()).add(idx)
+            for g in trigrams(p.norm):
+                grams.setdefault(g, []).append(idx)
+        for t in inverted:
+            trie.add(t)
+        # swap in the finished structures together
+        self._players, self._tokens, self._grams, self._trie = players, inverted, grams, trie
+        self._signature = signature
+
+    @staticmethod
+    def _role_ok(p: _Player, role: Optional[str]) -> bool:
+        return role is None or p.role is None or p.role == role or p.role == "two-way"
+
+    def search(
+        self,
+        q: str,
+        limit: int = 10,
+        rank: str = "score",
+        role: Optional[str] = None,
+        fuzzy: bool = True,
+    ) -> List[Dict[str, object]]:
+        self.refresh()
+        players, inverted, trie = self._players, self._tokens, self._trie
+        nq = normalize_name(q)
+        qtok = nq.split()
+        if not qtok:
+            return []
+        hits: Dict[int, int] = {}
+        for t in set(qtok):
+            matched: Set[int] = set()
+            for token in trie.prefixed(t):
+                matched |= inverted[token]
+            for idx in matched:
+                if self._role_ok(players[idx], role):
+                    hits[idx] = hits.get(idx, 0) + 1
+
+        qset = set(qtok)
+        if rank == "score":
+            qswap = " ".join(reversed(qtok))
+
+            def key(idx: int):
+                p = players[idx]
+                if p.norm == nq or p.norm == qswap:
+                    s = 100
+                elif hits[idx] == len(qset):
+                    s = 90
+                else:
+                    s = 60
+                return (-s, p.name, p.id)
+        else:
+            qkey = " ".join(sorted(qset))
+
+            def key(idx: int):
+                p = players[idx]
+                ntok = p.tokens
+                exact = ntok == qset
+                subset = qset <= ntok
+                starts = p.sorted_key.startswith(qkey) or qkey.startswith(p.sorted_key)
+                jac = 1.0 - len(ntok & qset) / len(ntok | qset)
+                return (-exact, -subset, -starts, jac, len(ntok), p.name, p.id)
+
+        best = heapq.nsmallest(limit, hits, key=key)
+        if fuzzy and len(best) < limit and not any(hits[i] == len(qset) for i in best):
+            seen = set(best)
+            extra = [i for i in self._fuzzy(nq, qtok, limit, role) if i not in seen]
+            best += extra[:limit - len(best)]
+        return [{"id": players[i].id, "name": players[i].name} for i in best]
+
+    def _fuzzy(self, nq: str, qtok: List[str], limit: int, role: Optional[str]) -> List[int]:
+        """Trigram-similar names within the typo budget, closest edit distance first."""
+        players, grams = self._players, self._grams
+        qgrams = trigrams(nq)
+        if not qgrams:
+            return []
+        overlap: Counter = Counter()
+        for g in qgrams:
+            overlap.update(grams.get(g, ()))
+        shortlist: List[Tuple[int, float]] = []
+        for idx, shared in overlap.most_common():
+            p = players[idx]
+            if not self._role_ok(p, role):
+                continue
+            # word similarity: a long full name should not dilute a one-token query
+            sim = shared / len(qgrams)
+            if sim >= FUZZY_MIN_SIMILARITY:
+                shortlist.append((idx, sim))
+                if len(shortlist) >= FUZZY_CANDIDATES:
+                    break
+        allowed = _allowed_typos(qtok)
+        ranked = []
+        for idx, sim in shortlist:
+            dist = sum(_token_distance(t, players[idx].tokens) for t in qtok)
+            if dist <= allowed:
+                ranked.append((dist, -sim, players[idx].name, idx))
+        return [idx for *_, idx in sorted(ranked)[:limit]]
+
+
+PEOPLE_CACHE = PeopleCache()
+PLAYER_INDEX = PlayerSearchIndex(people=PEOPLE_CACHE, crosswalk=CROSSWALK)
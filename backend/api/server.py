@@ -1,20 +1,45 @@
 
-from fastapi import FastAPI, Query, HTTPException
-import requests
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, HTTPException, Request
 import re
 from typing import Dict, Any, List, Literal, Optional
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 import numpy as np
 import pandas as pd
 
 # Sequence fetcher (your trusted source)
-from backend.sequence_src.scrape_savant import fetch_hitter_statcast, summarize_hitter_seasons
-from sequence_biolab_api.deep_dive import build_pitcher_deep_dive
+from backend.sequence_src.scrape_savant import fetch_batter_statcast, fetch_pitcher_statcast, summarize_hitter_seasons
+from backend.sequence_src.http_pool import HTTP_POOL
+from backend.sequence_src.ratelimit import RATE_LIMITS
+from backend.sequence_src.singleflight import SingleFlight
+from backend.api.player_index import PEOPLE_CACHE, PLAYER_INDEX, role_from_position
+from backend.names import normalize_name
+from backend.sequence_src.statcast_store import POSTSEASON_GAME_TYPES, REGULAR_GAME_TYPES
+from backend.analytics.aggregate import ROWS, Ratio, aggregate
+from backend.analytics.pa_table import PA_TABLES, build_pa_table, pa_rows
+from backend.analytics.zones import (
+    DEFAULT_SZ_BOT, DEFAULT_SZ_TOP, HEATMAP_GRID, ZoneGrid, gaussian_smooth, pitch_layers, smoothed_rate, zone_layers,
+)
+from sequence_biolab_api.deep_dive import pitcher_deep_dive_payload
+from sequence_biolab_api.deep_dive.cache import TTLCache
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # one pooled keep-alive client per upstream host for the app's lifetime
+    await HTTP_POOL.start()
+    # build the player type-ahead index before the first keystroke
+    await asyncio.to_thread(PLAYER_INDEX.refresh)
+    try:
+        yield
+    finally:
+        await HTTP_POOL.aclose()
+        HTTP_POOL.close()
 
-app = FastAPI(title="Biolab API", version="1.0.0")
+app = FastAPI(title="Biolab API", version="1.0.0", lifespan=_lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,120 +56,116 @@ def _json_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
     df = df.replace({np.nan: None})
     return jsonable_encoder(df.to_dict(orient="records"))
 
-# Map common Statcast pitch names to families (extend as needed)
-_PITCH_FAMILY_MAP = {
-    "4-Seam Fastball":"fastball", "4-Seam":"fastball", "FF":"fastball", "Fastball":"fastball",
-    "Sinker":"sinker", "SI":"sinker", "Two-Seam Fastball":"sinker", "FT":"sinker",
-    "Cutter":"cutter", "FC":"cutter",
-    "Slider":"slider", "SL":"slider",
-    "Curveball":"curveball", "CU":"curveball", "Knuckle Curve":"curveball", "KC":"curveball",
-    "Sweeper":"slider", "SV":"slider",  # treat sweeper as slider fam for now
-    "Changeup":"changeup", "CH":"changeup",
-    "Splitter":"splitter", "FS":"splitter",
-    "Knuckleball":"knuckleball", "KN":"knuckleball",
-}
-
-def _add_pitch_family(df: pd.DataFrame) -> pd.DataFrame:
-    if "pitch_name" not in df.columns:
-        df["pitch_name"] = None
-    fam = df["pitch_name"].map(_PITCH_FAMILY_MAP).fillna("unknown")
-    return df.assign(pitch_family=fam)
-
 def _last_pitch_per_PA(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     tmp = df.sort_values(["game_pk","at_bat_number","pitch_number"])
     return tmp.drop_duplicates(["game_pk","at_bat_number","batter"], keep="last")
 
-def _normalize_season_counts(events: pd.Series) -> pd.Series:
-    # Count AB as PAs that are official at-bats (exclude BB, HBP, IBB, catcher interference, sacrifices)
-    if events.empty:
-        return pd.Series({"AB":0, "H":0})
-    ev = events.fillna("")
-    hits = ev.isin(["single","double","triple","home_run"]).sum()
-    non_ab = ev.isin(["walk","intent_walk","hit_by_pitch","catcher_interf","sac_bunt","sac_fly"]).sum()
-    ab = len(ev) - non_ab
-    return pd.Series({"AB": int(ab), "H": int(hits)})
+# the current season keeps gaining games; finished seasons never change
+_PA_TABLE_LIVE_TTL = 15 * 60
+
+def _pa_table(bid: int, season: Optional[int], include_postseason: bool) -> pd.DataFrame:
+    """Cached pitch-level table for one batter/season (read-only, see pa_table)."""
+    game_types = REGULAR_GAME_TYPES + (POSTSEASON_GAME_TYPES if include_postseason else ())
+    if season:
+        start_dt, end_dt = f"{season}-03-01", f"{season}-11-30"
+    else:
+        start_dt, end_dt = None, None
+    live = not season or season >= pd.Timestamp.today().year
+    return PA_TABLES.get_or_build(
+        (int(bid), season, game_types),
+        lambda: build_pa_table(fetch_batter_statcast(bid, start_dt, end_dt, game_types=game_types)),
+        ttl=_PA_TABLE_LIVE_TTL if live else None,
+    )
+
+def _pa_counts(pa: pd.DataFrame) -> pd.Series:
+    ev = pa["events"].fillna("").astype(str).str.lower()
+    is_bb = ev.isin(["walk","intent_walk"])
+    is_hbp = ev.eq("hit_by_pitch")
+    is_sf = ev.eq("sac_fly")
+    non_ab = is_bb | is_hbp | is_sf | ev.isin(["sac_bunt","catcher_interf","catcher_interference"])
+    return pd.Series({
+        "PA": len(ev),
+        "AB": int((~non_ab & ev.ne("")).sum()),
+        "H": int(ev.isin(["single","double","triple","home_run"]).sum()),
+        "2B": int(ev.eq("double").sum()),
+        "3B": int(ev.eq("triple").sum()),
+        "HR": int(ev.eq("home_run").sum()),
+        "BB": int(is_bb.sum()),
+        "K": int(ev.str.startswith("strikeout").sum()),
+        "HBP": int(is_hbp.sum()),
+        "SF": int(is_sf.sum()),
+    })
+
+_HIT_EVENTS = ["single","double","triple","home_run"]
+_NON_AB_EVENTS = ["walk","intent_walk","hit_by_pitch","catcher_interf","sac_bunt","sac_fly"]
+_TB_MAP = {"single":1, "double":2, "triple":3, "home_run":4}
+# split AVG leaves AB == 0 groups empty rather than 0.000
+_SPLIT_AVG = Ratio("AVG", "H", {ROWS: 1, "non_ab": -1}, empty=np.nan)
+_SEASON_COLUMNS = ["batter","player_name","season","PA","AB","H","BB","HBP","SF","TB","AVG","OBP","SLG"]
 
 def _season_table(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
-        return pd.DataFrame(columns=["batter","player_name","season","PA","AB","H","AVG","OBP","SLG"])
-
-    df = df.copy()
-    df["season"] = pd.to_datetime(df["game_date"]).dt.year
-
-    pa_last = _last_pitch_per_PA(df)
-    g = pa_last.groupby(["batter","player_name","season"], dropna=False)
-
-    out = g.agg(
-        PA=("pitch_number","count"),
-        ABH=("events", _normalize_season_counts)
-    ).reset_index()
-
-    # expand AB/H from the dict column
-    out["AB"] = out["ABH"].apply(lambda d: int(d["AB"]))
-    out["H"]  = out["ABH"].apply(lambda d: int(d["H"]))
-    out = out.drop(columns=["ABH"])
-
-    # Simple rate stats
-    out["AVG"] = (out["H"] / out["AB"].replace(0, np.nan)).round(3)
-    # OBP approx from events (walks/HBP captured in non-AB; recompute directly)
-    pa = pa_last
-    walks = pa["events"].isin(["walk","intent_walk"]).sum()
-    hbp   = pa["events"].eq("hit_by_pitch").sum()
-    # If grouping per player-season, recompute per row:
-    def _row_obp(r):
-        pid, yr = r["batter"], r["season"]
-        sel = (pa["batter"]==pid) & (pd.to_datetime(pa["game_date"]).dt.year==yr)
-        pa_sel = pa.loc[sel]
-        w = pa_sel["events"].isin(["walk","intent_walk"]).sum()
-        hb = pa_sel["events"].eq("hit_by_pitch").sum()
-        h  = r["H"]
-        denom = r["PA"]
-        return round((h + w + hb) / denom, 3) if denom else 0.0
-    out["OBP"] = out.apply(_row_obp, axis=1)
-
-    # SLG: total bases / AB; approximate TB from events
-    tb_map = {"single":1, "double":2, "triple":3, "home_run":4}
-    def _row_slg(r):
-        pid, yr = r["batter"], r["season"]
-        sel = (pa_last["batter"]==pid) & (pd.to_datetime(pa_last["game_date"]).dt.year==yr)
-        ev = pa_last.loc[sel, "events"].fillna("")
-        tb = sum(tb_map.get(x, 0) for x in ev)
-        return round(tb / r["AB"], 3) if r["AB"] else 0.0
-    out["SLG"] = out.apply(_row_slg, axis=1)
+        return pd.DataFrame(columns=_SEASON_COLUMNS)
+
+    pa = _last_pitch_per_PA(df)
+    ev = pa["events"]
+    # one indicator column per counting stat, summed in a single groupby
+    ind = pd.DataFrame({
+        "batter": pa["batter"],
+        "player_name": pa["player_name"],
+        "season": pd.to_datetime(pa["game_date"]).dt.year,
+        "PA": pa["pitch_number"].notna().astype(int),
+        "rows": 1,
+        "non_ab": ev.isin(_NON_AB_EVENTS).astype(int),
+        "H": ev.isin(_HIT_EVENTS).astype(int),
+        "BB": ev.isin(["walk","intent_walk"]).astype(int),
+        "HBP": ev.eq("hit_by_pitch").astype(int),
+        "SF": ev.eq("sac_fly").astype(int),
+        "TB": ev.map(_TB_MAP).fillna(0).astype(int),
+    })
+    out = ind.groupby(["batter","player_name","season"], dropna=False).sum().reset_index()
+    out["AB"] = out["rows"] - out["non_ab"]
+
+    ab = out["AB"].replace(0, np.nan)
+    out["AVG"] = (out["H"] / ab).round(3)
+    out["OBP"] = ((out["H"] + out["BB"] + out["HBP"]) / out["PA"].replace(0, np.nan)).round(3).fillna(0.0)
+    out["SLG"] = (out["TB"] / ab).round(3).fillna(0.0)
 
     # Clean types for JSON
-    out[["batter","season","PA","AB","H"]] = out[["batter","season","PA","AB","H"]].astype(int, errors="ignore")
-    return out
+    out[["batter","season"]] = out[["batter","season"]].astype(int, errors="ignore")
+    return out[_SEASON_COLUMNS]
 
 # ---------- routes ----------
 
 
 @app.get("/hitters/{bid}/season")
-async def hitters_season(bid: int, season: int):
-    
+def hitters_season(bid: int, season: int, include_postseason: bool = Query(True)):
     try:
-        from fastapi import Request
-        # normalize inputs
-        bid = int(bid)
-        season = int(season)
-        include = str(request.query_params.get("include_postseason", "true")).lower() in ("1","true","yes")
-
-        row = summarize_hitter_seasons(bid=bid, season=season, include_postseason=include)
-
-        if hasattr(row, "empty") and row.empty:
+        row = summarize_hitter_seasons(pa_rows(_pa_table(bid, season, include_postseason)))
+        if row.empty:
             return {"data": []}
-        if hasattr(row, "to_dict"):
-            return {"data": row.head(1).to_dict(orient="records")}
-        if isinstance(row, dict) and "data" in row:
-            return row
-        return {"data": []}
+        return {"data": _json_records(row.head(1))}
     except Exception as e:
         print("hitters/season error", bid, season, e)
         return {"data": []}
 
 
+_SPLIT_COLUMNS = {"pitch_family":"pitch_family", "pitch_type":"pitch_name",
+                  "stand":"stand", "count":"balls", "zone":"zone"}
+# combined splits: "pitch_family*count" (also accepts × or :)
+_SPLIT_SEP = re.compile(r"\s*[*×:]\s*")
+
+def _split_indicators(pa: pd.DataFrame) -> pd.DataFrame:
+    ev = pa["events"].fillna("")
+    return pa.assign(non_ab=ev.isin(_NON_AB_EVENTS), H=ev.isin(_HIT_EVENTS))
+
+def _split_table(ind: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    out = aggregate(ind, keys, counts=["non_ab","H"], ratios=[_SPLIT_AVG])
+    out["AB"] = out[ROWS] - out["non_ab"]
+    return out[keys + ["AB","H","AVG"]].sort_values("AB", ascending=False)
+
 @app.get("/hitters/{bid}/splits")
 def hitter_splits(
     bid: int,
@@ -152,90 +173,177 @@ def hitter_splits(
     split: Literal["pitch_family","pitch_type","stand","count","zone"] = "pitch_family",
     include_postseason: bool = Query(False)
 ) -> Dict[str, Any]:
-    if season:
-        start_dt, end_dt = f"{season}-03-01", f"{season}-10-31"
-    else:
-        start_dt, end_dt = None, None
-
-    df = fetch_hitter_statcast(bid, start_dt, end_dt)
-    if not include_postseason:
-        df = df[df["game_type"].fillna("") != "P"]
-
-    if split in ("pitch_family","pitch_type"):
-        df = _add_pitch_family(df)
-
-    pa = _last_pitch_per_PA(df)
-    key = {"pitch_family":"pitch_family", "pitch_type":"pitch_name",
-           "stand":"stand", "count":"balls", "zone":"zone"}[split]
-
-    grp = pa.groupby(key, dropna=False)["events"].apply(
-        lambda s: _normalize_season_counts(s)["AB"]
-    ).reset_index(name="AB")
-    # Hits per split
-    hits = pa.groupby(key, dropna=False)["events"].apply(
-        lambda s: _normalize_season_counts(s)["H"]
-    ).reset_index(name="H")
-    out = pd.merge(grp, hits, on=key, how="outer").fillna(0)
-    out["AVG"] = (out["H"] / out["AB"].replace(0, np.nan)).round(3)
-    out = out.sort_values("AB", ascending=False)
+    pa = pa_rows(_pa_table(bid, season, include_postseason))
+    if pa.empty:
+        return {"bid": bid, "season": season, "split": split, "data": []}
 
+    out = _split_table(_split_indicators(pa), [_SPLIT_COLUMNS[split]])
     return {"bid": bid, "season": season, "split": split, "data": _json_records(out)}
 
+@app.get("/hitters/{bid}/splits/multi")
+def hitter_splits_multi(
+    bid: int,
+    season: Optional[int] = Query(None),
+    splits: str = Query("pitch_family,pitch_type,stand,count,zone",
+                        description="comma sep splits; combine with *, e.g. pitch_family*count"),
+    include_postseason: bool = Query(False)
+) -> Dict[str, Any]:
+    specs: Dict[str, List[str]] = {}
+    for spec in splits.split(","):
+        names = list(dict.fromkeys(n for n in _SPLIT_SEP.split(spec.strip()) if n))
+        if not names:
+            continue
+        unknown = [n for n in names if n not in _SPLIT_COLUMNS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"unknown split: {', '.join(unknown)}")
+        specs["*".join(names)] = [_SPLIT_COLUMNS[n] for n in names]
+
+    # one cached table and one indicator pass shared by every split
+    pa = pa_rows(_pa_table(bid, season, include_postseason))
+    if pa.empty:
+        return {"bid": bid, "season": season, "splits": {name: [] for name in specs}}
+    ind = _split_indicators(pa)
+    data = {name: _json_records(_split_table(ind, keys)) for name, keys in specs.items()}
+    return {"bid": bid, "season": season, "splits": data}
+
+_HEATMAP_LAYERS = ("pitches","swings","whiffs","contact","xwoba")
+
+def _heatmap_grid(size: int, normalized: bool) -> ZoneGrid:
+    if normalized:
+        # strike-zone units with a quarter-zone margin above and below
+        return ZoneGrid(size, size, HEATMAP_GRID.x_range, (-0.25, 1.25), normalized=True)
+    return ZoneGrid(size, size, HEATMAP_GRID.x_range, HEATMAP_GRID.z_range)
+
 @app.get("/hitters/{bid}/heatmap")
 def hitter_heatmap(
     bid: int,
     season: Optional[int] = Query(None),
     pitch_family: Optional[str] = Query(None),
     pitch_type: Optional[str] = Query(None),
-    include_postseason: bool = Query(False)
+    include_postseason: bool = Query(False),
+    size: int = Query(9, ge=1, le=200, description="bins per side"),
+    normalized: bool = Query(False, description="heights in strike-zone units (sz_bot/sz_top)"),
+    layers: Optional[str] = Query(None, description="comma sep: pitches,swings,whiffs,contact,xwoba"),
 ) -> Dict[str, Any]:
-    if season:
-        start_dt, end_dt = f"{season}-03-01", f"{season}-10-31"
-    else:
-        start_dt, end_dt = None, None
-
-    df = fetch_hitter_statcast(bid, start_dt, end_dt)
-    if not include_postseason:
-        df = df[df["game_type"].fillna("") != "P"]
+    wanted = [name.strip() for name in layers.split(",") if name.strip()] if layers else []
+    unknown = [name for name in wanted if name not in _HEATMAP_LAYERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown layer: {', '.join(unknown)}")
 
-    df = _add_pitch_family(df)
+    df = _pa_table(bid, season, include_postseason)
 
-    if pitch_family:
+    if not df.empty and pitch_family:
         want = pitch_family.strip().lower()
         df = df[df["pitch_family"].str.lower()==want]
-    if pitch_type:
+    if not df.empty and pitch_type:
         # allow friendly like "slider" or Statcast "Slider"
         want = pitch_type.strip().lower()
         df = df[df["pitch_name"].str.lower()==want]
 
-    # 9x9 bins on plate_x [-0.85, 0.85], plate_z [1.0, 4.0]
+    # default: 9x9 bins on plate_x [-0.85, 0.85], plate_z [1.0, 4.0]
+    zone = _heatmap_grid(size, normalized)
     if df.empty:
-        grid = [[0]*9 for _ in range(9)]
-        return {"bid": bid, "season": season, "grid": grid}
+        empty = [[0]*size for _ in range(size)]
+        out = {"bid": bid, "season": season, "grid": empty}
+        if wanted:
+            out["layers"] = {name: empty for name in wanted}
+        return out
+
+    weights = pitch_layers(df) if wanted else {}
+    weights["grid"] = df["pitch_number"].notna().to_numpy()
+    acc = zone_layers(df, zone, weights)
+    out = {"bid": bid, "season": season, "grid": acc["grid"].astype(int).tolist()}
+    if wanted:
+        grids = {}
+        for name in wanted:
+            if name == "xwoba":
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    mean = np.round(acc["xwoba_sum"] / acc["xwoba_n"], 3)
+                grids[name] = [[None if np.isnan(v) else float(v) for v in row] for row in mean]
+            else:
+                grids[name] = acc[name].astype(int).tolist()
+        out["layers"] = grids
+    return out
 
-    xb = pd.cut(df["plate_x"], bins=np.linspace(-0.85, 0.85, 10), labels=False, include_lowest=True)
-    zb = pd.cut(df["plate_z"], bins=np.linspace(1.0, 4.0, 10),  labels=False, include_lowest=True)
-    tmp = df.assign(xb=xb, zb=zb).dropna(subset=["xb","zb"])
-    pivot = tmp.pivot_table(index="zb", columns="xb", values="pitch_number", aggfunc="count", fill_value=0)
+# smoothed surfaces are cached per player-season-filter; a rebuild is a few FFTs
+_SMOOTH_CACHE = TTLCache(ttl_seconds=_PA_TABLE_LIVE_TTL, max_entries=256)
+
+def _surface(values: np.ndarray, digits: int = 4) -> List[List[Optional[float]]]:
+    rounded = np.round(values, digits)
+    return [[None if np.isnan(v) else float(v) for v in row] for row in rounded]
+
+def _smooth_heatmap(bid: int, season: Optional[int], include_postseason: bool,
+                    pitch_family: Optional[str], pitch_type: Optional[str],
+                    size: int, normalized: bool, bandwidth: float, min_weight: float) -> Dict[str, Any]:
+    df = _pa_table(bid, season, include_postseason)
+    if not df.empty and pitch_family:
+        df = df[df["pitch_family"].str.lower()==pitch_family.strip().lower()]
+    if not df.empty and pitch_type:
+        df = df[df["pitch_name"].str.lower()==pitch_type.strip().lower()]
+
+    zone = _heatmap_grid(size, normalized)
+    acc = zone_layers(df, zone, pitch_layers(df))
+    # bandwidth is in feet; normalized heights use a nominal 2 ft zone
+    cell_x = (zone.x_range[1] - zone.x_range[0]) / zone.nx
+    cell_z = (zone.z_range[1] - zone.z_range[0]) / zone.nz * (DEFAULT_SZ_TOP - DEFAULT_SZ_BOT if normalized else 1.0)
+    sigma = (bandwidth / cell_z, bandwidth / cell_x)
+    sm = {name: gaussian_smooth(grid, sigma) for name, grid in acc.items()}
+    # a smoothed cell times the kernel area ~ pitches within one bandwidth
+    min_den = min_weight / (2 * np.pi * sigma[0] * sigma[1])
+
+    total = acc["pitches"].sum()
+    density = sm["pitches"] / total if total else sm["pitches"]
+    return {
+        "bid": bid, "season": season, "size": size, "normalized": normalized,
+        "bandwidth": bandwidth, "pitches": int(total),
+        "x_range": list(zone.x_range), "z_range": list(zone.z_range),
+        "density": _surface(density, 6),
+        "rates": {
+            "swing_rate": _surface(smoothed_rate(sm["swings"], sm["pitches"], min_den)),
+            "whiff_rate": _surface(smoothed_rate(sm["whiffs"], sm["swings"], min_den)),
+            "contact_rate": _surface(smoothed_rate(sm["contact"], sm["pitches"], min_den)),
+            "xwoba": _surface(smoothed_rate(sm["xwoba_sum"], sm["xwoba_n"], min_den)),
+        },
+    }
 
-    # Ensure 9x9 shape and python ints
-    pivot = pivot.reindex(index=range(0,9), columns=range(0,9), fill_value=0)
-    grid = pivot.astype(int).values.tolist()
-    return {"bid": bid, "season": season, "grid": grid}
+@app.get("/hitters/{bid}/heatmap/smooth")
+async def hitter_heatmap_smooth(
+    bid: int,
+    season: Optional[int] = Query(None),
+    pitch_family: Optional[str] = Query(None),
+    pitch_type: Optional[str] = Query(None),
+    include_postseason: bool = Query(False),
+    size: int = Query(100, ge=10, le=400, description="bins per side of the fine grid"),
+    normalized: bool = Query(False),
+    bandwidth: float = Query(0.15, gt=0, le=2.0, description="Gaussian sigma in feet"),
+    min_weight: float = Query(5.0, ge=0, description="hide rates backed by fewer effective pitches than this"),
+) -> Dict[str, Any]:
+    args = (bid, season, include_postseason, pitch_family, pitch_type, size, normalized, bandwidth, min_weight)
+    return await _SMOOTH_CACHE.get_or_load(args, lambda: asyncio.to_thread(_smooth_heatmap, *args))
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    # weak comparison, as RFC 9110 prescribes for If-None-Match
+    return "*" in tags or any(t.removeprefix("W/") == etag.removeprefix("W/") for t in tags)
 
 @app.get("/api/deep-dive/pitcher/full")
 async def pitcher_deep_dive_full(
+    request: Request,
     mlbam: int = Query(..., ge=1),
     year: int = Query(..., ge=1900),
     span: Literal["regular", "postseason", "total"] = Query("regular"),
     rollup: Literal["season", "last3", "career"] = Query("season"),
-) -> Dict[str, Any]:
+    sections: Optional[str] = Query(None, description="comma-separated section names; default all"),
+) -> Response:
     try:
-        payload = await build_pitcher_deep_dive(
+        payload = await pitcher_deep_dive_payload(
             mlbam=mlbam,
             year=year,
             span=span,
             rollup=rollup,
+            sections=sections.split(",") if sections else None,
         )
     except HTTPException:
         raise
@@ -243,33 +351,28 @@ async def pitcher_deep_dive_full(
         raise HTTPException(status_code=404, detail=str(exc))
     except Exception as exc:  # pragma: no cover
         raise HTTPException(status_code=500, detail=str(exc))
-    return JSONResponse(content=jsonable_encoder(payload))
+    headers = {
+        "ETag": payload.etag,
+        # past seasons never change; current ones must revalidate (cheap 304s)
+        "Cache-Control": "public, max-age=86400, immutable" if payload.immutable else "no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
 
-from pathlib import Path as _Path
 
-def _local_player_search(q: str):
+def _local_player_search(q: str, role: Optional[str] = None):
     try:
-        import pandas as _pd
-        csv = _Path(__file__).resolve().parents[2] / "data" / "processed" / "hitters_season.csv"
-        if not csv.exists():
-            return []
-        df = _pd.read_csv(csv, dtype={"batter":"Int64","player_name":"string","season":"Int64"})
-        if df.empty:
-            return []
-        qtok = [t for t in q.lower().split() if t]
-        def _ok(name: str) -> bool:
-            n = str(name or "").lower()
-            return all(t in n for t in qtok)
-        sub = df.loc[df["player_name"].apply(_ok), ["batter","player_name"]].dropna()
-        sub = sub.drop_duplicates(subset=["batter"])
-        out = [{"id": int(r["batter"]), "name": str(r["player_name"])} for _, r in sub.iterrows()]
-        return out[:10]
+        return PLAYER_INDEX.search(q, limit=10, role=role)
     except Exception:
         return []
 
-def _mlb_people_search(q: str) -> List[Dict[str, Any]]:
-    url = "https://statsapi.mlb.com/api/v1/people/search"
-    r = requests.get(url, params={"q": q}, timeout=10)
+_PEOPLE_URL = "https://statsapi.mlb.com/api/v1/people/search"
+_PEOPLE_FLIGHT = SingleFlight()
+
+async def _mlb_people_search(q: str) -> List[Dict[str, Any]]:
+    await RATE_LIMITS.bucket(_PEOPLE_URL).acquire()
+    r = await HTTP_POOL.async_client(_PEOPLE_URL).get(_PEOPLE_URL, params={"names": q}, timeout=10)
     r.raise_for_status()
     data = r.json() or {}
     out: List[Dict[str, Any]] = []
@@ -277,64 +380,43 @@ def _mlb_people_search(q: str) -> List[Dict[str, Any]]:
         out.append({
             "id": p.get("id"),
             "name": f"{p.get('lastName', '')}, {p.get('firstName', '')}".strip(", "),
+            "role": role_from_position((p.get("primaryPosition") or {}).get("abbreviation")),
         })
     return out
 
-@app.get("/players/search")
-def players_search(q: str):
-    import pandas as pd, re, unicodedata
-    from pathlib import Path
-
-    def _norm(x: str) -> str:
-        x = unicodedata.normalize("NFKD", str(x)).encode("ascii","ignore").decode()
-        x = re.sub(r"[^a-z0-9\s]", " ", x.lower())
-        return re.sub(r"\s+", " ", x).strip()
-
-    def _tokens(x: str):
-        return [t for t in _norm(x).split() if t]
-
-    processed = Path("data/processed")
-    csv = processed / "hitters_season.csv"
-    if not csv.exists():
-        return {"items": []}
-
-    g = pd.read_csv(csv, usecols=["batter","player_name"]).drop_duplicates()
-    g["__norm"] = g["player_name"].map(_norm)
-
-    nq = _norm(q)
-    qswap = " ".join(reversed(nq.split()))
-    qtok = set(_tokens(q))
-
-    def score(row):
-        ns = row["__norm"]
-        if ns == nq or ns == qswap:
-            return 100
-        hits = sum(1 for t in qtok if t in ns)
-        if qtok and hits == len(qtok):
-            return 90
-        if hits > 0:
-            return 60
-        return 0
-
-    g["__score"] = g.apply(score, axis=1)
-    g = g.sort_values(["__score","player_name"], ascending=[False, True])
-    out = [{"id": int(r.batter), "name": str(r.player_name)} for r in g.itertuples() if r.__score > 0]
-    return {"items": out[:10]}
-@app.get("/pitchers/search")
-def pitchers_search(q: str):
+async def _remote_people(q: str) -> List[Dict[str, Any]]:
+    """People-search answer for ``q`` from the on-disk cache, else statsapi (recorded for next time)."""
+    cached = PEOPLE_CACHE.lookup(q)
+    if cached is not None:
+        return cached
+    key = normalize_name(q)
     try:
-        pid = lookup_pitcher_id(q)
+        people = await _PEOPLE_FLIGHT.do_async(key, lambda: _mlb_people_search(q))
     except Exception:
-        pid = None
-    items = []
-    try:
-        qn = int(q)
-        items.append({"id": qn, "name": str(qn)})
-    except Exception:
-        pass
-    if pid and not any(it["id"] == int(pid) for it in items):
-        items.append({"id": int(pid), "name": q})
-    return {"items": items}
+        return []
+    people = [p for p in people if p.get("id")]
+    await asyncio.to_thread(PEOPLE_CACHE.record, key, people)
+    return people
+
+async def _search_people(q: str, role: Optional[str] = None) -> List[Dict[str, Any]]:
+    items = await asyncio.to_thread(_local_player_search, q, role)
+    if items or len(normalize_name(q)) < 3:
+        return items
+    # unknown locally: ask statsapi once, then answer from the refreshed index
+    if await _remote_people(q):
+        items = await asyncio.to_thread(_local_player_search, q, role)
+    return items
+
+@app.get("/players/search")
+async def players_search(q: str):
+    return {"items": await _search_people(q)}
+
+@app.get("/pitchers/search")
+async def pitchers_search(q: str):
+    q = (q or "").strip()
+    if q.isdigit():
+        return {"items": [{"id": int(q), "name": q}]}
+    return {"items": await _search_people(q, role="pitcher")}
 
 
 @app.get("/pitchers/{pid}/season")
@@ -457,37 +539,30 @@ def hitters_season_all(
     group_by: Optional[str] = Query('season', description="season|total"),
 ):
     try:
-        from backend.sequence_src.scrape_savant import fetch_hitter_statcast, summarize_hitter_seasons
         years = [int(x) for x in seasons.split(',')] if seasons else []
         if not years:
             years = [pd.Timestamp.today().year]
         frames = []
         for y in years:
-            # regular season
-            ev = fetch_hitter_statcast(start=f"{y}-03-01", end=f"{y}-12-31", bid=bid, season_type="regular", cache=True)
-            df = _normalize_hitters(ev)
-            if include_postseason:
-                post = fetch_hitter_statcast(start=f"{y}-10-01", end=f"{y}-12-31", bid=bid, season_type="postseason", cache=True)
-                if not post.empty:
-                    df = pd.concat([df, _normalize_hitters(post)], ignore_index=True)
+            df = pa_rows(_pa_table(bid, y, include_postseason))
             if df.empty:
                 continue
             # optional filters
             if count:
                 keep = {c.strip() for c in count.split(',') if c.strip()}
-                if 'count' in df.columns and keep:
-                    df = df[df['count'].isin(keep)]
-            if pitch_family and 'pitch_family' in df.columns:
+                if keep:
+                    counts = df['balls'].astype('Int64').astype(str) + '-' + df['strikes'].astype('Int64').astype(str)
+                    df = df[counts.isin(keep)]
+            if pitch_family:
                 df = df[df['pitch_family'] == pitch_family]
-            if pitch_type and 'pitch_type' in df.columns:
+            if pitch_type:
                 df = df[df['pitch_type'] == pitch_type]
-            if zone and 'zone' in df.columns:
-                df = df[df['zone'] == zone]
+            if zone:
+                df = df[pd.to_numeric(df['zone'], errors='coerce') == pd.to_numeric(zone, errors='coerce')]
             if df.empty:
                 continue
             # aggregate to season
-            agg_spec = {c:'sum' for c in ['PA','AB','H','2B','3B','HR','BB','K','HBP','SF']}
-            g = df.agg(agg_spec).to_frame().T
+            g = _pa_counts(df).to_frame().T
             g['season'] = y
             g['batter'] = bid
             g = _compute_batter_metrics(g)
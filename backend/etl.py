@@ -3,6 +3,7 @@ import datetime as dt
 import pandas as pd
 from pathlib import Path
 from backend.sequence_src.scrape_savant import fetch_batter_statcast, lookup_batter_id
+from backend.sequence_src.statcast_store import REGULAR_GAME_TYPES
 from .config import ensure_dirs, PROCESSED_DIR, WATERMARKS_PATH, FRESHNESS_PATH, read_json, write_json
 
 def _today_str(): return dt.date.today().isoformat()
@@ -72,9 +73,7 @@ def run(mode: str="incremental", season: int|None=None) -> Path:
         if pd.notna(pid): batter_id = int(pid)
     except Exception:
         pass
-    df = fetch_batter_statcast(batter_id, start_dt, end_dt)
-    if 'game_type' in df.columns:
-        df = df[df['game_type'].astype(str).str.upper().eq('R')].copy()
+    df = fetch_batter_statcast(batter_id, start_dt, end_dt, game_types=REGULAR_GAME_TYPES)
     hitters = _normalize_hitters(df)
     out_csv = PROCESSED_DIR / "hitters_season.csv"
     hitters.to_csv(out_csv, index=False)
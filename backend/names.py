@@ -0,0 +1,12 @@
+"""Player-name normalization shared by the data layer and the API."""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+
+def normalize_name(x: str) -> str:
+    """Accent-stripped, lower-case, alphanumeric tokens separated by single spaces."""
+    x = unicodedata.normalize("NFKD", str(x)).encode("ascii", "ignore").decode()
+    x = re.sub(r"[^a-z0-9\s]", " ", x.lower())
+    return re.sub(r"\s+", " ", x).strip()
@@ -0,0 +1,181 @@
+"""
+Local player-id crosswalk: MLBAM <-> FanGraphs <-> name.
+
+Built offline from the Chadwick register (``scripts/build_crosswalk.py``)
+into one SQLite file with a primary key on ``mlbam`` and indexes on ``fg``
+and the normalized name, so every lookup is a single indexed read. Rows
+may also carry bats/throws/position from the statsapi season rosters.
+
+Lookups return None (or an empty list) when the file is missing or the
+player is unknown; callers keep their remote fallback for that case.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from backend.config import DATA_DIR
+from backend.names import normalize_name
+
+CROSSWALK_PATH = Path(os.getenv("SEQUENCE_BIOLAB_CROSSWALK_PATH", DATA_DIR / "crosswalk.sqlite")).resolve()
+
+COLUMNS = (
+    "mlbam", "fg", "bbref", "retro", "name_first", "name_last", "name_norm",
+    "bats", "throws", "position", "first_season", "last_season",
+)
+PITCHER_POSITIONS = ("P", "TWP")
+
+_SCHEMA = """
+CREATE TABLE players (
+    mlbam INTEGER PRIMARY KEY,
+    fg INTEGER,
+    bbref TEXT,
+    retro TEXT,
+    name_first TEXT,
+    name_last TEXT,
+    name_norm TEXT NOT NULL,
+    bats TEXT,
+    throws TEXT,
+    position TEXT,
+    first_season INTEGER,
+    last_season INTEGER
+);
+CREATE INDEX players_fg ON players (fg);
+CREATE INDEX players_name ON players (name_norm);
+"""
+
+
+def _int_or_none(values: pd.Series) -> pd.Series:
+    v = pd.to_numeric(values, errors="coerce")
+    return v.where(v > 0).astype("Int64")
+
+
+def crosswalk_frame(register: pd.DataFrame, people: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Crosswalk rows from a Chadwick register frame (pybaseball layout:
+    ``key_mlbam``, ``key_fangraphs``, ``name_first``, ...). ``people`` may add
+    ``mlbam``, ``bats``, ``throws`` and ``position`` columns; its rows win.
+    """
+    reg = register.copy()
+    out = pd.DataFrame({
+        "mlbam": _int_or_none(reg["key_mlbam"]),
+        "fg": _int_or_none(reg.get("key_fangraphs", pd.Series(index=reg.index, dtype=float))),
+        "bbref": reg.get("key_bbref"),
+        "retro": reg.get("key_retro"),
+        "name_first": reg["name_first"].fillna("").astype(str).str.strip(),
+        "name_last": reg["name_last"].fillna("").astype(str).str.strip(),
+        "first_season": _int_or_none(reg.get("mlb_played_first", pd.Series(index=reg.index, dtype=float))),
+        "last_season": _int_or_none(reg.get("mlb_played_last", pd.Series(index=reg.index, dtype=float))),
+    })
+    out = out.dropna(subset=["mlbam"]).drop_duplicates("mlbam", keep="last")
+    for col in ("bats", "throws", "position"):
+        out[col] = None
+    if people is not None and not people.empty:
+        extra = people.drop_duplicates("mlbam", keep="last").set_index("mlbam")
+        idx = out["mlbam"].astype("int64")
+        for col in ("bats", "throws", "position"):
+            if col in extra:
+                out[col] = idx.map(extra[col]).to_numpy()
+    out["name_norm"] = [normalize_name(f"{f} {l}") for f, l in zip(out["name_first"], out["name_last"])]
+    out = out[out["name_norm"] != ""]
+    return out[list(COLUMNS)].reset_index(drop=True)
+
+
+def write_crosswalk(frame: pd.DataFrame, path: Path = CROSSWALK_PATH) -> Path:
+    """Write ``frame`` to a fresh SQLite file and swap it into place atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript(_SCHEMA)
+        rows = frame[list(COLUMNS)].astype(object).where(frame[list(COLUMNS)].notna(), None)
+        con.executemany(
+            f"INSERT INTO players ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            rows.itertuples(index=False, name=None),
+        )
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return path
+
+
+class Crosswalk:
+    """Read side of the crosswalk file; reconnects when the file is rebuilt."""
+
+    def __init__(self, path: Path = CROSSWALK_PATH) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._con: Optional[sqlite3.Connection] = None
+        self._mtime: Optional[float] = None
+
+    def _query(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return []
+        with self._lock:
+            if self._con is None or mtime != self._mtime:
+                if self._con is not None:
+                    self._con.close()
+                self._con = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+                self._con.row_factory = sqlite3.Row
+                self._mtime = mtime
+            try:
+                return [dict(r) for r in self._con.execute(sql, params).fetchall()]
+            except sqlite3.DatabaseError:
+                return []
+
+    @property
+    def available(self) -> bool:
+        return self.path.exists()
+
+    def fg_for_mlbam(self, mlbam: int) -> Optional[int]:
+        rows = self._query("SELECT fg FROM players WHERE mlbam = ?", (int(mlbam),))
+        return int(rows[0]["fg"]) if rows and rows[0]["fg"] is not None else None
+
+    def mlbam_for_fg(self, fg: int) -> Optional[int]:
+        rows = self._query("SELECT mlbam FROM players WHERE fg = ? ORDER BY last_season DESC", (int(fg),))
+        return int(rows[0]["mlbam"]) if rows else None
+
+    def player(self, mlbam: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM players WHERE mlbam = ?", (int(mlbam),))
+        return rows[0] if rows else None
+
+    def players(self) -> List[Dict[str, Any]]:
+        """Every player's ids, name and position, for building search indexes."""
+        return self._query("SELECT mlbam, name_first, name_last, position FROM players", ())
+
+    def by_name(self, name: str, pitcher: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Players whose full name matches ``name`` ("First Last" or "Last, First"),
+        most recently active first. ``pitcher`` keeps only pitchers (True) or
+        non-pitchers (False) where the position is known.
+        """
+        norm = normalize_name(name)
+        if not norm:
+            return []
+        tokens = norm.split()
+        # "Last, First" normalizes to "last first"; also try it rotated
+        swapped = " ".join(tokens[1:] + tokens[:1])
+        rows = self._query(
+            "SELECT * FROM players WHERE name_norm IN (?, ?) ORDER BY last_season DESC, mlbam DESC",
+            (norm, swapped),
+        )
+        if pitcher is not None:
+            # two-way players (TWP) answer both pitcher and non-pitcher lookups
+            rows = [
+                r for r in rows
+                if r["position"] is None or r["position"] == "TWP" or (r["position"] in PITCHER_POSITIONS) == pitcher
+            ]
+        return rows
+
+
+CROSSWALK = Crosswalk()
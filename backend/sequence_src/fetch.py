@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import Optional
 
 import asyncio
-import time
 import random
-from dataclasses import dataclass
 from typing import Any, Dict, Optional, Union
 
 import httpx
 
+from .http_pool import HTTP_POOL
+from .ratelimit import RATE_LIMITS, TokenBucket
+
 try:
     # only needed if you call browser_get()
     from playwright.async_api import async_playwright
@@ -26,19 +27,11 @@ DEFAULT_HEADERS = {
     "cache-control": "no-cache",
 }
 
-@dataclass
-class RateLimiter:
-    """Simple leaky-bucket limiter: ~rps requests/second across awaited tasks."""
-    rps: float = 3.0
-    _t: float = 0.0
+class RateLimiter(TokenBucket):
+    """Token bucket at ~rps requests/second; pass as rl= to pin a limit per call site."""
 
-    async def wait(self) -> None:
-        period = 1.0 / max(self.rps, 0.0001)
-        now = time.time()
-        sleep = max(0.0, self._t + period - now)
-        if sleep:
-            await asyncio.sleep(sleep)
-        self._t = time.time()
+    def __init__(self, rps: float = 3.0, burst: float = 1.0) -> None:
+        super().__init__(rate=rps, burst=burst)
 
 class FetchError(RuntimeError):
     pass
@@ -50,49 +43,54 @@ async def _request(
     params: Optional[Dict[str, Any]] = None,
     headers: Optional[Dict[str, str]] = None,
     timeout: float = 25.0,
-    rl: Optional[RateLimiter] = None,
+    rl: Optional[TokenBucket] = None,
     follow_redirects: bool = True,
 ) -> httpx.Response:
-    if rl:
-        await rl.wait()
+    # explicit limiter wins; otherwise the shared per-host token bucket
+    limiter = rl or RATE_LIMITS.bucket(url)
 
     h = dict(DEFAULT_HEADERS)
     if headers:
         h.update(headers)
 
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=follow_redirects, headers=h) as s:
-        # manual retry loop with jitter
-        for attempt in range(5):
-            try:
-                resp = await s.request(method.upper(), url, params=params)
-                # retry on server throttling / transient errors
-                if resp.status_code in (429, 500, 502, 503, 504):
-                    # honor Retry-After when present
-                    ra = resp.headers.get("retry-after")
-                    base = float(ra) if ra and ra.isdigit() else (1.0 + attempt * 1.5)
-                    await asyncio.sleep(base + random.random() * 0.4)
-                    continue
-                resp.raise_for_status()
-                return resp
-            except (httpx.TimeoutException, httpx.NetworkError) as e:
-                if attempt == 4:
-                    raise FetchError(f"Network error fetching {url}: {e}") from e
-                await asyncio.sleep(0.6 * (attempt + 1) + random.random() * 0.3)
-            except httpx.HTTPStatusError as e:
-                # non-retryable 4xx
-                if 400 <= e.response.status_code < 500 and e.response.status_code not in (429,):
-                    raise
-                if attempt == 4:
-                    raise
-                await asyncio.sleep(0.8 * (attempt + 1) + random.random() * 0.3)
+    s = HTTP_POOL.async_client(url)
+    # manual retry loop with jitter
+    for attempt in range(5):
+        await limiter.acquire()
+        try:
+            resp = await s.request(method.upper(), url, params=params, headers=h,
+                                   timeout=timeout, follow_redirects=follow_redirects)
+            # retry on server throttling / transient errors
+            if resp.status_code in (429, 500, 502, 503, 504):
+                # honor Retry-After when present
+                ra = resp.headers.get("retry-after")
+                base = float(ra) if ra and ra.isdigit() else (1.0 + attempt * 1.5)
+                if resp.status_code in (429, 503):
+                    # hold every queued caller for this host, not just this one
+                    limiter.pause(base)
+                await asyncio.sleep(base + random.random() * 0.4)
+                continue
+            resp.raise_for_status()
+            return resp
+        except (httpx.TimeoutException, httpx.NetworkError) as e:
+            if attempt == 4:
+                raise FetchError(f"Network error fetching {url}: {e}") from e
+            await asyncio.sleep(0.6 * (attempt + 1) + random.random() * 0.3)
+        except httpx.HTTPStatusError as e:
+            # non-retryable 4xx
+            if 400 <= e.response.status_code < 500 and e.response.status_code not in (429,):
+                raise
+            if attempt == 4:
+                raise
+            await asyncio.sleep(0.8 * (attempt + 1) + random.random() * 0.3)
 
 async def get_bytes(
     url: str,
     *,
     params: Optional[Dict[str, Any]] = None,
-    cache: Optional[Any] = None,     # expects SnapshotCache-like with get()/put()
+    cache: Optional[Any] = None,     # SnapshotCache (see snapshot_cache.py) or anything with get()/put()
     cache_ttl: Optional[float] = 60 * 60 * 24,  # 24h
-    rl: Optional[RateLimiter] = None,
+    rl: Optional[TokenBucket] = None,
     headers: Optional[Dict[str, str]] = None,
     timeout: float = 25.0,
 ) -> bytes:
@@ -116,7 +114,7 @@ async def get_json(
     params: Optional[Dict[str, Any]] = None,
     cache: Optional[Any] = None,
     cache_ttl: Optional[float] = 60 * 60,
-    rl: Optional[RateLimiter] = None,
+    rl: Optional[TokenBucket] = None,
     headers: Optional[Dict[str, str]] = None,
     timeout: float = 25.0,
 ) -> Any:
@@ -137,7 +135,7 @@ async def browser_get(
     cache: Optional[Any] = None,
     cache_ttl: Optional[float] = 60 * 60 * 6,
     wait_selector: Optional[str] = None,
-    rl: Optional[RateLimiter] = None,
+    rl: Optional[TokenBucket] = None,
 ) -> str:
     """
     Render a page with headless Chromium and return page HTML.
@@ -178,11 +176,18 @@ async def browser_get(
 
 # ---------- Convenience sync wrappers ----------
 
+async def _closing(coro):
+    # asyncio.run() makes a fresh loop; release its pooled clients before it closes
+    try:
+        return await coro
+    finally:
+        await HTTP_POOL.aclose()
+
 def get_bytes_sync(*args, **kwargs) -> bytes:
-    return asyncio.run(get_bytes(*args, **kwargs))
+    return asyncio.run(_closing(get_bytes(*args, **kwargs)))
 
 def get_json_sync(*args, **kwargs) -> Any:
-    return asyncio.run(get_json(*args, **kwargs))
+    return asyncio.run(_closing(get_json(*args, **kwargs)))
 
 def browser_get_sync(*args, **kwargs) -> str:
     return asyncio.run(browser_get(*args, **kwargs))
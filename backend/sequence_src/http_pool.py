@@ -0,0 +1,109 @@
+# src/http_pool.py
+"""
+Long-lived, pooled HTTP clients shared by every outbound call.
+
+One ``httpx.AsyncClient`` per (event loop, upstream host) and one
+``httpx.Client`` per host for sync code, each with keep-alive, bounded
+connection limits and HTTP/2 when ``h2`` is installed. The API app opens
+the pool on startup and closes it on shutdown; callers only ask for the
+client that matches their URL.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("SEQUENCE_BIOLAB_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("SEQUENCE_BIOLAB_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SEQUENCE_BIOLAB_HTTP_KEEPALIVE_EXPIRY", "90"))
+HTTP_TIMEOUT = float(os.getenv("SEQUENCE_BIOLAB_HTTP_TIMEOUT", "25"))
+HTTP2_ENABLED = os.getenv("SEQUENCE_BIOLAB_HTTP2", "1").lower() in ("1", "true", "yes")
+
+# Upstreams opened eagerly at startup so the first request skips pool setup.
+KNOWN_UPSTREAMS = (
+    "https://www.fangraphs.com",
+    "https://baseballsavant.mlb.com",
+    "https://statsapi.mlb.com",
+)
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _http2_available() -> bool:
+    return HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+class ClientPool:
+    """Registry of per-host pooled clients."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        http2: Optional[bool] = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = _http2_available() if http2 is None else http2
+        # async clients are bound to the loop that created them
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self._sync: Dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def _options(self) -> dict:
+        return {"limits": self.limits, "timeout": self.timeout, "http2": self.http2}
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        host = _host_key(url)
+        with self._lock:
+            clients = self._async.setdefault(loop, {})
+            client = clients.get(host)
+            if client is None or client.is_closed:
+                client = clients[host] = httpx.AsyncClient(**self._options())
+            return client
+
+    def sync_client(self, url: str) -> httpx.Client:
+        host = _host_key(url)
+        with self._lock:
+            client = self._sync.get(host)
+            if client is None or client.is_closed:
+                client = self._sync[host] = httpx.Client(**self._options())
+            return client
+
+    async def start(self, urls: Iterable[str] = KNOWN_UPSTREAMS) -> None:
+        for url in urls:
+            self.async_client(url)
+
+    async def aclose(self) -> None:
+        """Close the async clients owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._sync = self._sync, {}
+        for client in clients.values():
+            client.close()
+
+
+HTTP_POOL = ClientPool()
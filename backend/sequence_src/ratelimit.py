@@ -0,0 +1,170 @@
+# src/ratelimit.py
+"""
+Per-host token-bucket rate limiting for outbound requests.
+
+Each upstream host gets a bucket refilled at ``rate`` tokens/second holding
+at most ``burst`` tokens. Waiters on one event loop are served strictly in
+arrival order (an ``asyncio.Lock`` queues them FIFO); token state itself is
+guarded by a thread lock so buckets stay correct when several loops or
+threads share them. A 429/503 can ``pause`` a bucket so every queued caller
+backs off together instead of retrying into the same throttle.
+
+Limits are configured as ``host=rate:burst`` pairs, e.g.::
+
+    SEQUENCE_BIOLAB_RATE_LIMITS="www.fangraphs.com=4:8,baseballsavant.mlb.com=3:6"
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_RATE = float(os.getenv("SEQUENCE_BIOLAB_RATE_DEFAULT", "4"))
+DEFAULT_BURST = float(os.getenv("SEQUENCE_BIOLAB_RATE_BURST", "4"))
+
+
+def _parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    out: Dict[str, Tuple[float, float]] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        host, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        try:
+            out[host.strip().lower()] = (float(rate), float(burst or rate))
+        except ValueError:
+            continue
+    return out
+
+
+HOST_LIMITS = _parse_limits(os.getenv("SEQUENCE_BIOLAB_RATE_LIMITS", ""))
+
+
+@dataclass
+class LimiterStats:
+    acquired: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    pauses: int = 0
+
+
+class TokenBucket:
+    """Token bucket with FIFO waiters: ``rate`` tokens/sec, up to ``burst``."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST) -> None:
+        self.rate = max(float(rate), 1e-4)
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._state = threading.Lock()
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self.stats = LimiterStats()
+
+    def _queue(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._state:
+            lock = self._queues.get(loop)
+            if lock is None:
+                lock = self._queues[loop] = asyncio.Lock()
+            return lock
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise seconds until one is."""
+        now = time.monotonic()
+        with self._state:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting."""
+        started = time.monotonic()
+        with self._state:
+            self.stats.queue_depth += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+        try:
+            async with self._queue():
+                while True:
+                    delay = self._take()
+                    if not delay:
+                        break
+                    await asyncio.sleep(delay)
+        finally:
+            with self._state:
+                self.stats.queue_depth -= 1
+        waited = time.monotonic() - started
+        with self._state:
+            self.stats.acquired += 1
+            self.stats.total_wait += waited
+            self.stats.max_wait = max(self.stats.max_wait, waited)
+            if waited > 1e-3:
+                self.stats.delayed += 1
+        return waited
+
+    # compatibility with the old RateLimiter interface
+    wait = acquire
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket (e.g. on 429 / Retry-After) and drop saved burst."""
+        with self._state:
+            self._paused_until = max(self._paused_until, time.monotonic() + max(seconds, 0.0))
+            self._tokens = 0.0
+            self.stats.pauses += 1
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by upstream host."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_rate: float = DEFAULT_RATE,
+        default_burst: float = DEFAULT_BURST,
+    ) -> None:
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default = (default_rate, default_burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: Optional[float] = None) -> None:
+        host = host.lower()
+        with self._lock:
+            self.limits[host] = (rate, burst if burst is not None else rate)
+            self._buckets.pop(host, None)
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = (urlsplit(url).hostname or url).lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits.get(host, self.default)
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    async def acquire(self, url: str) -> float:
+        return await self.bucket(url).acquire()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            host: {"rate": b.rate, "burst": b.burst, **vars(b.stats)}
+            for host, b in buckets.items()
+        }
+
+
+RATE_LIMITS = HostRateLimiter()
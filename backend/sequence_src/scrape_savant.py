@@ -1,48 +1,79 @@
 from __future__ import annotations
-from pathlib import Path
-import hashlib
+import datetime as dt
+from typing import Optional, Sequence
 import pandas as pd
 from pybaseball import statcast_pitcher, statcast_batter
 import statsapi
 
-CACHE_DIR = Path("build/cache/savant")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-def _hash_key(*parts) -> Path:
-    h = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
-    return CACHE_DIR / f"{h}.parquet"
-
-def fetch_pitcher_statcast(pitcher_id: int, start: str, end: str) -> pd.DataFrame:
-    key = _hash_key("pitcher", pitcher_id, start, end)
-    if key.exists():
-        return pd.read_parquet(key)
-    df = statcast_pitcher(start, end, pitcher_id)
-    if df is None:
-        df = pd.DataFrame()
-    df.to_parquet(key, index=False)
-    return df
+from backend.sequence_src.crosswalk import CROSSWALK
+from backend.sequence_src.singleflight import SingleFlight
+from backend.sequence_src.statcast_store import (
+    STORE, GAME_TYPES_BY_SEASON_TYPE, merge_intervals, missing_intervals, season_window,
+)
+
+_FETCHERS = {"batter": statcast_batter, "pitcher": statcast_pitcher}
+_INFLIGHT = SingleFlight()
+
+def _resolve_window(start: Optional[str], end: Optional[str]) -> tuple[str, str]:
+    # mirror pybaseball.sanitize_input: no start -> yesterday, no end -> start
+    if not start:
+        start = (dt.date.today() - dt.timedelta(days=1)).isoformat()
+    if not end:
+        end = start
+    return str(start)[:10], str(end)[:10]
+
+def _download_gaps(role: str, player_id: int, start: str, end: str, refresh: bool) -> None:
+    # one downloader per player at a time; later callers re-check coverage and usually find no gaps
+    with STORE.lock(role, player_id):
+        if refresh:
+            # sealed seasons are final; a refresh re-downloads everything else
+            sealed = [season_window(s) for s in STORE.sealed(role, player_id)]
+            gaps = missing_intervals(start, min(end, dt.date.today().isoformat()), merge_intervals(sealed))
+        else:
+            gaps = STORE.missing(role, player_id, start, end)
+        for gap_start, gap_end in gaps:
+            df = _FETCHERS[role](gap_start, gap_end, player_id)
+            empty = df is None or df.empty
+            if not empty:
+                STORE.write(role, player_id, df)
+            # an empty answer may be Savant having nothing *yet*: it is re-checked later, never sealed
+            STORE.mark_covered(role, player_id, gap_start, gap_end, empty=empty)
+
+def _fetch_statcast(role: str, player_id: int, start: Optional[str], end: Optional[str],
+                    game_types: Optional[Sequence[str]] = None, refresh: bool = False) -> pd.DataFrame:
+    start, end = _resolve_window(start, end)
+    player_id = int(player_id)
+    # only download the dates the store has not seen; writes de-dupe on pitch key
+    if refresh or not STORE.covered(role, player_id, start, end):
+        key = (role, player_id, start, end, refresh)
+        _INFLIGHT.do(key, lambda: _download_gaps(role, player_id, start, end, refresh))
+    return STORE.read(role, player_id, start, end, game_types=game_types)
+
+def fetch_pitcher_statcast(pitcher_id: int, start: str, end: str,
+                           game_types: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    return _fetch_statcast("pitcher", pitcher_id, start, end, game_types)
 
 def lookup_batter_id(name: str) -> int:
+    local = CROSSWALK.by_name(name, pitcher=False)
+    if local:
+        return int(local[0]["mlbam"])
     people = statsapi.lookup_player(name)
     if not people:
         raise ValueError(f"Could not locate MLBAM id for hitter: {name}")
     return int(people[0]["id"])
 
-def fetch_batter_statcast(batter_id: int, start: str, end: str) -> pd.DataFrame:
-    key = _hash_key("batter", batter_id, start, end)
-    if key.exists():
-        return pd.read_parquet(key)
-    df = statcast_batter(start, end, batter_id)
-    if df is None:
-        df = pd.DataFrame()
-    df.to_parquet(key, index=False)
-    return df
+def fetch_batter_statcast(batter_id: int, start: str, end: str,
+                          game_types: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    return _fetch_statcast("batter", batter_id, start, end, game_types)
 
 def lookup_pitcher_id(q: str):
     q = (q or "").strip()
     if q.isdigit():
         return {"items": [{"id": int(q), "name": q}]}
-    return {"items": []}
+    return {"items": [
+        {"id": int(p["mlbam"]), "name": f"{p['name_last']}, {p['name_first']}".strip(", ")}
+        for p in CROSSWALK.by_name(q, pitcher=True)
+    ]}
 
 
 
@@ -59,6 +90,17 @@ _WOBA_CONSTS = {
     2025: dict(wBB=0.688, wHBP=0.720, w1B=0.880, w2B=1.247, w3B=1.578, wHR=2.013, scale=1.212, lg_woba=0.318, lgRPA=0.125),
 }
 
+# linear weights indexed by season; unknown seasons fall back to 2023
+WOBA_WEIGHTS = pd.DataFrame.from_dict(_WOBA_CONSTS, orient="index").rename_axis("season")
+_WOBA_FALLBACK_SEASON = 2023
+
+def _linear_weights(seasons: pd.Series) -> pd.DataFrame:
+    """Weights aligned row-for-row with ``seasons`` (one reindex, no per-row lookups)."""
+    w = WOBA_WEIGHTS.reindex(pd.to_numeric(seasons, errors="coerce").to_numpy())
+    w = w.fillna(WOBA_WEIGHTS.loc[_WOBA_FALLBACK_SEASON])
+    w.index = seasons.index
+    return w
+
 def _ensure_season_col(df: pd.DataFrame) -> pd.DataFrame:
     if "season" in df.columns:
         return df
@@ -68,7 +110,11 @@ def _ensure_season_col(df: pd.DataFrame) -> pd.DataFrame:
         return df
     return df
 
-def summarize_hitter_seasons(events: pd.DataFrame) -> pd.DataFrame:
+def summarize_hitter_seasons(events: pd.DataFrame, by: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Season batting lines from pitch-level events. Pass ``by=["batter"]`` to
+    summarize many players at once; rows are keyed by ``by`` + season.
+    """
     if events is None or len(events) == 0:
         return pd.DataFrame()
     df = _ensure_season_col(events)
@@ -86,7 +132,8 @@ def summarize_hitter_seasons(events: pd.DataFrame) -> pd.DataFrame:
     df["is_SO"] = (df["events"].str.startswith("strikeout")).astype(int)
     df["is_CI"] = (df["events"] == "catcher_interference").astype(int)
 
-    gb = df.groupby("season", dropna=False)
+    keys = [k for k in by if k != "season"] + ["season"]
+    gb = df.groupby(keys, dropna=False)
     agg = gb.agg(
         PA=("events","count"),
         _1B=("is_1B","sum"),
@@ -118,34 +165,27 @@ def summarize_hitter_seasons(events: pd.DataFrame) -> pd.DataFrame:
     agg["BB%"] = np.where(agg["PA"]>0, agg["BB"]/agg["PA"], np.nan)
     agg["K%"]  = np.where(agg["PA"]>0, agg["SO"]/agg["PA"], np.nan)
 
-    def _woba_row(r):
-        c = _WOBA_CONSTS.get(int(r["season"]), _WOBA_CONSTS[2023])
-        num = c["wBB"]*max(r["BB"]-r["IBB"],0) + c["wHBP"]*r["HBP"] + c["w1B"]*r["_1B"] + c["w2B"]*r["_2B"] + c["w3B"]*r["_3B"] + c["wHR"]*r["HR"]
-        den = r["AB"] + max(r["BB"]-r["IBB"],0) + r["SF"] + r["HBP"]
-        return num/den if den>0 else np.nan
-    agg["wOBA"] = agg.apply(_woba_row, axis=1)
+    w = _linear_weights(agg["season"])
+    ubb = (agg["BB"] - agg["IBB"]).clip(lower=0)
+    num = (w["wBB"]*ubb + w["wHBP"]*agg["HBP"] + w["w1B"]*agg["_1B"] + w["w2B"]*agg["_2B"]
+           + w["w3B"]*agg["_3B"] + w["wHR"]*agg["HR"])
+    den = agg["AB"] + ubb + agg["SF"] + agg["HBP"]
+    agg["wOBA"] = np.where(den > 0, num / den.where(den > 0), np.nan)
 
     if "estimated_woba_using_speedangle" in df.columns:
-        xw = df.groupby("season")["estimated_woba_using_speedangle"].mean().rename("xwOBA").reset_index()
+        xw = df.groupby(keys)["estimated_woba_using_speedangle"].mean().rename("xwOBA").reset_index()
+        agg = agg.merge(xw, on=keys, how="left")
     else:
-        xw = pd.DataFrame({"season": agg["season"], "xwOBA": np.nan})
-    agg = agg.merge(xw, on="season", how="left")
-
-    def _wrc_plus_row(r):
-        c = _WOBA_CONSTS.get(int(r["season"]), _WOBA_CONSTS[2023])
-        if pd.isna(r["wOBA"]) or r["PA"]<=0:
-            return np.nan
-        wRAA = ((r["wOBA"] - c["lg_woba"]) / c["scale"]) * r["PA"]
-        return ((wRAA / r["PA"] + c["lgRPA"]) / c["lgRPA"]) * 100.0
-    agg["wRC+"] = agg.apply(_wrc_plus_row, axis=1)
-
-    cols = ["season","PA","AB","H","_1B","_2B","_3B","HR","BB","IBB","HBP","SF","SH","SO","AVG","OBP","SLG","OPS","ISO","BABIP","BB%","K%","wOBA","xwOBA","wRC+"]
-    agg = agg[cols].sort_values("season")
-    agg = agg.rename(columns={"_1B":"1B","_2B":"2B","_3B":"3B"})
-    return agg
+        agg["xwOBA"] = np.nan
 
-fetch_hitter_statcast = fetch_batter_statcast
+    pa = agg["PA"].where(agg["PA"] > 0)
+    wraa = (agg["wOBA"] - w["lg_woba"]) / w["scale"] * pa
+    agg["wRC+"] = ((wraa / pa + w["lgRPA"]) / w["lgRPA"]) * 100.0
 
+    cols = keys + ["PA","AB","H","_1B","_2B","_3B","HR","BB","IBB","HBP","SF","SH","SO","AVG","OBP","SLG","OPS","ISO","BABIP","BB%","K%","wOBA","xwOBA","wRC+"]
+    agg = agg[cols].sort_values(keys)
+    agg = agg.rename(columns={"_1B":"1B","_2B":"2B","_3B":"3B"})
+    return agg
 
 # --- Compatibility wrappers (do not remove) ---
 def _resolve_batter_id_kw(**kwargs):
@@ -154,7 +194,9 @@ def _resolve_batter_id_kw(**kwargs):
             return int(kwargs[k])
     raise ValueError("No batter id provided (expected one of batter, bid, player_id, pid, batter_id)")
 
-def fetch_hitter_statcast(*, start:str, end:str, season_type:str="regular", cache:bool=True, **kwargs):
-    batter = _resolve_batter_id_kw(**kwargs)
-    # Delegate to the canonical function (already in this module)
-    return fetch_batter_statcast(start=start, end=end, batter=batter, season_type=season_type, cache=cache)
+def fetch_hitter_statcast(batter_id: Optional[int] = None, start: Optional[str] = None, end: Optional[str] = None, *,
+                          season_type: Optional[str] = None, cache: bool = True, **kwargs):
+    batter = int(batter_id) if batter_id is not None else _resolve_batter_id_kw(**kwargs)
+    # Delegate to the canonical store-backed fetch (already in this module)
+    game_types = GAME_TYPES_BY_SEASON_TYPE.get(season_type) if season_type else None
+    return _fetch_statcast("batter", batter, start, end, game_types, refresh=not cache)
@@ -0,0 +1,82 @@
+# src/singleflight.py
+"""
+Single-flight call coalescing.
+
+Concurrent callers asking for the same key share one in-flight computation:
+the first caller runs it, everyone else waits for (and receives) the same
+result or exception. ``do`` serves threaded callers (sync FastAPI endpoints
+run in a threadpool); ``do_async`` serves coroutines on one event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls per key (threads and asyncio tasks)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        fut = self._tasks.get(slot)
+        if fut is not None:
+            self.shared += 1
+            # shield so one cancelled waiter does not cancel the shared call
+            return await asyncio.shield(fut)
+        self.executed += 1
+        fut = loop.create_task(fn())
+        self._tasks[slot] = fut
+        fut.add_done_callback(lambda f: self._tasks.pop(slot, None) if self._tasks.get(slot) is f else None)
+        return await asyncio.shield(fut)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            inflight = len(self._calls) + len(self._tasks)
+        return {"executed": self.executed, "shared": self.shared, "inflight": inflight}
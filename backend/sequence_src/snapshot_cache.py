@@ -0,0 +1,207 @@
+# src/snapshot_cache.py
+"""
+Disk content cache for raw upstream responses (the ``cache=`` argument of
+``fetch.get_bytes`` / ``get_json`` / ``browser_get``).
+
+Entries are keyed on URL + params, stored as one blob file each and indexed
+in SQLite (WAL mode), which makes the cache safe to share between threads,
+asyncio tasks and worker processes. Blobs are written atomically; the index
+tracks per-entry expiry and last access for LRU eviction under a byte
+budget. Hit/miss/byte counters are kept in the index so every process sees
+the same numbers.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from backend.config import CACHE_DIR
+
+SNAPSHOT_DIR = Path(os.getenv("SEQUENCE_BIOLAB_SNAPSHOT_DIR", CACHE_DIR / "snapshots")).resolve()
+SNAPSHOT_MAX_BYTES = int(os.getenv("SEQUENCE_BIOLAB_SNAPSHOT_MAX_BYTES", str(512 * 1024 * 1024)))
+
+COUNTERS = ("hits", "misses", "expired", "puts", "evictions", "bytes_read", "bytes_written")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    canon = json.dumps(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return hashlib.sha256(f"{url}|{canon}".encode()).hexdigest()
+
+
+class SnapshotCache:
+    """Byte-budgeted LRU disk cache with per-entry TTL."""
+
+    def __init__(self, root: Path = SNAPSHOT_DIR, max_bytes: int = SNAPSHOT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._blobs = self.root / "blobs"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._db_path = self.root / "index.sqlite3"
+        self._local = threading.local()
+        db = self._conn()
+        db.executescript(_SCHEMA)
+        with self._tx() as db:
+            db.executemany("INSERT OR IGNORE INTO counters(name, value) VALUES (?, 0)", [(c,) for c in COUNTERS])
+
+    # ---------- plumbing ----------
+
+    def _conn(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self._db_path, timeout=30.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _blob_path(self, key: str) -> Path:
+        return self._blobs / key[:2] / f"{key}.bin"
+
+    @staticmethod
+    def _bump(db: sqlite3.Connection, **deltas: int) -> None:
+        db.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(v, k) for k, v in deltas.items() if v],
+        )
+
+    def _drop(self, db: sqlite3.Connection, key: str) -> None:
+        db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            self._blob_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    # ---------- public API ----------
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        key = cache_key(url, params)
+        db = self._conn()
+        now = time.time()
+        row = db.execute("SELECT size, expires FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._bump(db, misses=1)
+            return None
+        size, expires = row
+        if expires and expires < now:
+            with self._tx() as db:
+                self._drop(db, key)
+                self._bump(db, misses=1, expired=1)
+            return None
+        try:
+            content = self._blob_path(key).read_bytes()
+        except FileNotFoundError:
+            # evicted by another process between the lookup and the read
+            with self._tx() as db:
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bump(db, misses=1)
+            return None
+        with self._tx() as db:
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._bump(db, hits=1, bytes_read=size)
+        return content
+
+    def put(self, url: str, params: Optional[Dict[str, Any]], content: bytes, ttl: float = 0) -> None:
+        """Store ``content``; ``ttl <= 0`` means the entry never expires."""
+        key = cache_key(url, params)
+        path = self._blob_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+
+        now = time.time()
+        expires = now + ttl if ttl and ttl > 0 else 0.0
+        with self._tx() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries(key, url, size, created, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, len(content), now, expires, now),
+            )
+            self._bump(db, puts=1, bytes_written=len(content))
+        self._evict(keep=key)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        with self._tx() as db:
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = 0
+            now = time.time()
+            # expired entries go first, then least recently used
+            rows = db.execute(
+                "SELECT key, size FROM entries ORDER BY (expires > 0 AND expires < ?) DESC, accessed ASC",
+                (now,),
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                self._drop(db, key)
+                total -= size
+                evicted += 1
+            self._bump(db, evictions=evicted)
+
+    def delete(self, url: str, params: Optional[Dict[str, Any]] = None) -> None:
+        with self._tx() as db:
+            self._drop(db, cache_key(url, params))
+
+    def clear(self) -> None:
+        with self._tx() as db:
+            for (key,) in db.execute("SELECT key FROM entries").fetchall():
+                self._drop(db, key)
+
+    def stats(self) -> Dict[str, int]:
+        db = self._conn()
+        out = {name: int(value) for name, value in db.execute("SELECT name, value FROM counters")}
+        entries, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        out["entries"] = int(entries)
+        out["bytes"] = int(total)
+        out["max_bytes"] = self.max_bytes
+        return out
+
+
+_default: Optional[SnapshotCache] = None
+_default_lock = threading.Lock()
+
+
+def snapshot_cache() -> SnapshotCache:
+    """Process-wide cache under ``SEQUENCE_BIOLAB_SNAPSHOT_DIR``."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SnapshotCache()
+        return _default
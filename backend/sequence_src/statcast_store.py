@@ -0,0 +1,401 @@
+"""
+Partitioned on-disk store for Statcast pitch-level data.
+
+Pitches are written once per (role, season, game_type, player) partition as
+zstd-compressed, dictionary-encoded parquet::
+
+    <root>/<role>/season=<YYYY>/game_type=<GT>/player=<id>/part.parquet
+
+Reads only open the partitions that intersect the requested seasons and game
+types; ``scan`` queries across players/seasons with the same pruning.
+
+Each player also carries a coverage record of the date intervals already
+fetched, so callers can download only the gaps of a requested window.
+Seasons that are over and fully covered are sealed: their partitions are
+never rewritten or re-downloaded, even on refresh. Days that have not
+settled yet are re-checked at most once per ``LIVE_TTL`` seconds.
+
+Tables derived from a sealed season (e.g. the deep dive's pitch summaries)
+can be persisted beside its partitions, so they are computed only once::
+
+    <root>/<role>/season=<YYYY>/summary/<name>/player=<id>/<table>.parquet
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from backend.config import CACHE_DIR
+
+STATCAST_DIR = Path(os.getenv("SEQUENCE_BIOLAB_STATCAST_DIR", CACHE_DIR / "statcast")).resolve()
+# Days before today whose games may still be incomplete; never marked covered.
+SETTLE_DAYS = int(os.getenv("SEQUENCE_BIOLAB_STATCAST_SETTLE_DAYS", "1"))
+# Seconds an unsettled-days fetch counts as current before it is re-checked.
+LIVE_TTL = float(os.getenv("SEQUENCE_BIOLAB_STATCAST_LIVE_TTL", "900"))
+# Seconds an empty download counts as covered; Savant also answers empty when overloaded
+# or before a day is posted, so an empty window is re-checked rather than kept for good.
+EMPTY_TTL = float(os.getenv("SEQUENCE_BIOLAB_STATCAST_EMPTY_TTL", "86400"))
+# Calendar window of one season (spring training through the World Series).
+SEASON_START, SEASON_END = "03-01", "11-30"
+
+ROLES = ("batter", "pitcher")
+PITCH_KEY = ["game_pk", "at_bat_number", "pitch_number"]
+SORT_COLS = ["game_date", "game_pk", "at_bat_number", "pitch_number"]
+UNKNOWN_GAME_TYPE = "U"
+
+REGULAR_GAME_TYPES = ("R",)
+POSTSEASON_GAME_TYPES = ("F", "D", "L", "W", "P")
+GAME_TYPES_BY_SEASON_TYPE = {
+    "regular": REGULAR_GAME_TYPES,
+    "postseason": POSTSEASON_GAME_TYPES,
+    "total": REGULAR_GAME_TYPES + POSTSEASON_GAME_TYPES,
+}
+
+PARQUET_OPTIONS = {"compression": "zstd", "use_dictionary": True}
+
+
+def _season_of(df: pd.DataFrame) -> pd.Series:
+    if "game_year" in df.columns:
+        years = pd.to_numeric(df["game_year"], errors="coerce")
+        if years.notna().all():
+            return years.astype(int)
+    return pd.to_datetime(df["game_date"]).dt.year
+
+
+def _game_type_of(df: pd.DataFrame) -> pd.Series:
+    if "game_type" not in df.columns:
+        return pd.Series(UNKNOWN_GAME_TYPE, index=df.index)
+    return df["game_type"].fillna(UNKNOWN_GAME_TYPE).astype(str).str.upper()
+
+
+def _seasons_between(start: Optional[str], end: Optional[str]) -> Optional[List[int]]:
+    if not start or not end:
+        return None
+    return list(range(int(str(start)[:4]), int(str(end)[:4]) + 1))
+
+
+def _date(value: str) -> dt.date:
+    return dt.date.fromisoformat(str(value)[:10])
+
+
+def merge_intervals(intervals: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Union of inclusive date intervals; touching intervals are joined."""
+    spans = sorted((_date(a), _date(b)) for a, b in intervals if _date(a) <= _date(b))
+    merged: List[List[dt.date]] = []
+    for a, b in spans:
+        if merged and a <= merged[-1][1] + dt.timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    return [(a.isoformat(), b.isoformat()) for a, b in merged]
+
+
+def missing_intervals(start: str, end: str, covered: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Sub-intervals of [start, end] not contained in ``covered``."""
+    lo, hi = _date(start), _date(end)
+    gaps: List[Tuple[str, str]] = []
+    for a, b in merge_intervals(covered):
+        a_d, b_d = _date(a), _date(b)
+        if b_d < lo:
+            continue
+        if a_d > hi:
+            break
+        if a_d > lo:
+            gaps.append((lo.isoformat(), (a_d - dt.timedelta(days=1)).isoformat()))
+        lo = max(lo, b_d + dt.timedelta(days=1))
+        if lo > hi:
+            return gaps
+    if lo <= hi:
+        gaps.append((lo.isoformat(), hi.isoformat()))
+    return gaps
+
+
+def season_window(season: int) -> Tuple[str, str]:
+    return f"{int(season)}-{SEASON_START}", f"{int(season)}-{SEASON_END}"
+
+
+def _season_over(season: int, today: Optional[dt.date] = None) -> bool:
+    settled = (today or dt.date.today()) - dt.timedelta(days=SETTLE_DAYS)
+    return _date(season_window(season)[1]) <= settled
+
+
+def _recent_empty(raw: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Empty-download windows of a coverage record still inside ``EMPTY_TTL``."""
+    now = time.time()
+    return [e for e in raw.get("empty", []) if now - float(e["at"]) < EMPTY_TTL]
+
+
+def _write_parquet_atomic(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, tmp, **PARQUET_OPTIONS)
+    os.replace(tmp, path)
+
+
+def _write_json_atomic(obj: Any, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(obj))
+    os.replace(tmp, path)
+
+
+class StatcastStore:
+    """Season/game_type/player partitioned parquet store for one cache root."""
+
+    def __init__(self, root: Path = STATCAST_DIR) -> None:
+        self.root = Path(root)
+        self._locks: Dict[Tuple[str, int], threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ---------- layout ----------
+
+    def _role_dir(self, role: str) -> Path:
+        if role not in ROLES:
+            raise ValueError(f"Unknown statcast role: {role!r}")
+        return self.root / role
+
+    def partition_path(self, role: str, season: int, game_type: str, player_id: int) -> Path:
+        return (
+            self._role_dir(role)
+            / f"season={int(season)}"
+            / f"game_type={game_type}"
+            / f"player={int(player_id)}"
+            / "part.parquet"
+        )
+
+    def summary_path(self, role: str, season: int, name: str, table: str, player_id: int) -> Path:
+        return (
+            self._role_dir(role)
+            / f"season={int(season)}"
+            / "summary"
+            / name
+            / f"player={int(player_id)}"
+            / f"{table}.parquet"
+        )
+
+    def _coverage_path(self, role: str, player_id: int) -> Path:
+        return self._role_dir(role) / "_coverage" / f"{int(player_id)}.json"
+
+    def lock(self, role: str, player_id: int) -> threading.RLock:
+        """Per-player re-entrant lock serializing writers inside this process."""
+        key = (role, int(player_id))
+        with self._locks_guard:
+            lk = self._locks.get(key)
+            if lk is None:
+                lk = self._locks[key] = threading.RLock()
+            return lk
+
+    def partitions(
+        self,
+        role: str,
+        player_id: Optional[int] = None,
+        seasons: Optional[Iterable[int]] = None,
+        game_types: Optional[Iterable[str]] = None,
+    ) -> List[Path]:
+        """Existing partition files matching the given prunes (None = all)."""
+        role_dir = self._role_dir(role)
+        if not role_dir.exists():
+            return []
+        season_dirs = (
+            [role_dir / f"season={int(s)}" for s in seasons]
+            if seasons is not None
+            else sorted(role_dir.glob("season=*"))
+        )
+        gts = [str(g).upper() for g in game_types] if game_types is not None else None
+        player_glob = f"player={int(player_id)}" if player_id is not None else "player=*"
+        out: List[Path] = []
+        for sdir in season_dirs:
+            if not sdir.is_dir():
+                continue
+            gdirs = [sdir / f"game_type={g}" for g in gts] if gts is not None else sorted(sdir.glob("game_type=*"))
+            for gdir in gdirs:
+                out.extend(p / "part.parquet" for p in sorted(gdir.glob(player_glob)) if (p / "part.parquet").exists())
+        return out
+
+    # ---------- writes ----------
+
+    def write(self, role: str, player_id: int, df: pd.DataFrame) -> int:
+        """Upsert pitches into the player's partitions; returns rows now stored in them."""
+        if df is None or df.empty:
+            return 0
+        df = df.reset_index(drop=True)
+        seasons = _season_of(df)
+        game_types = _game_type_of(df)
+        written = 0
+        with self.lock(role, player_id):
+            sealed = self.sealed(role, player_id)
+            for (season, game_type), part in df.groupby([seasons, game_types], sort=False):
+                if int(season) in sealed:
+                    continue
+                path = self.partition_path(role, int(season), str(game_type), player_id)
+                if path.exists():
+                    part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+                key = [c for c in PITCH_KEY if c in part.columns]
+                if key:
+                    part = part.drop_duplicates(key, keep="last")
+                part = part.sort_values([c for c in SORT_COLS if c in part.columns], kind="stable")
+                _write_parquet_atomic(part.reset_index(drop=True), path)
+                written += len(part)
+        return written
+
+    def write_summary(self, role: str, player_id: int, season: int, name: str, tables: Mapping[str, pd.DataFrame]) -> bool:
+        """Persist tables derived from a sealed season; returns False (nothing written) if it is not sealed."""
+        with self.lock(role, player_id):
+            if int(season) not in self.sealed(role, player_id):
+                return False
+            for table, frame in tables.items():
+                _write_parquet_atomic(frame.reset_index(drop=True), self.summary_path(role, season, name, table, player_id))
+        return True
+
+    def read_summary(
+        self, role: str, player_id: int, season: int, name: str, tables: Sequence[str]
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """Tables stored by ``write_summary``, or None unless every one of them exists."""
+        paths = {t: self.summary_path(role, season, name, t, player_id) for t in tables}
+        if not all(p.exists() for p in paths.values()):
+            return None
+        return {t: pd.read_parquet(p) for t, p in paths.items()}
+
+    # ---------- coverage ----------
+
+    def _coverage(self, role: str, player_id: int) -> Dict[str, Any]:
+        try:
+            return json.loads(self._coverage_path(role, player_id).read_text())
+        except Exception:
+            return {}
+
+    def windows(self, role: str, player_id: int) -> List[Tuple[str, str]]:
+        """Merged date intervals already fetched for this player."""
+        raw = self._coverage(role, player_id)
+        return merge_intervals((str(a), str(b)) for a, b in raw.get("windows", []))
+
+    def sealed(self, role: str, player_id: int) -> Set[int]:
+        """Finished seasons whose partitions are final for this player."""
+        return {int(s) for s in self._coverage(role, player_id).get("sealed", [])}
+
+    def missing(self, role: str, player_id: int, start: str, end: str) -> List[Tuple[str, str]]:
+        """Gaps of [start, end] still to download; future dates are never missing."""
+        end = min(_date(end), dt.date.today()).isoformat()
+        if _date(start) > _date(end):
+            return []
+        raw = self._coverage(role, player_id)
+        covered = [(str(a), str(b)) for a, b in raw.get("windows", [])]
+        covered += [season_window(s) for s in raw.get("sealed", [])]
+        live = raw.get("live")
+        if live and time.time() - float(live["at"]) < LIVE_TTL:
+            covered.append((str(live["start"]), str(live["end"])))
+        covered += [(str(e["start"]), str(e["end"])) for e in _recent_empty(raw)]
+        return missing_intervals(start, end, merge_intervals(covered))
+
+    def covered(self, role: str, player_id: int, start: str, end: str) -> bool:
+        return not self.missing(role, player_id, start, end)
+
+    def version(self, role: str, player_id: int) -> Optional[int]:
+        """Changes whenever the player's coverage record is rewritten (None before any fetch)."""
+        try:
+            return self._coverage_path(role, player_id).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def mark_covered(self, role: str, player_id: int, start: str, end: str, empty: bool = False) -> None:
+        """
+        Record [start, end] as fetched. Days that have not settled are only
+        remembered for ``LIVE_TTL``; finished seasons that end up fully
+        covered are sealed. An ``empty`` download is only remembered for
+        ``EMPTY_TTL`` and never counts towards sealing.
+        """
+        today = dt.date.today()
+        settled = today - dt.timedelta(days=SETTLE_DAYS)
+        with self.lock(role, player_id):
+            raw = self._coverage(role, player_id)
+            windows = merge_intervals((str(a), str(b)) for a, b in raw.get("windows", []))
+            if _date(start) <= settled:
+                done = (start, min(_date(end), settled).isoformat())
+                if empty:
+                    raw["empty"] = _recent_empty(raw) + [{"start": done[0], "end": done[1], "at": time.time()}]
+                else:
+                    windows = merge_intervals(windows + [done])
+            live_start = max(_date(start), settled + dt.timedelta(days=1))
+            live_end = min(_date(end), today)
+            if live_start <= live_end:
+                raw["live"] = {"start": live_start.isoformat(), "end": live_end.isoformat(), "at": time.time()}
+            sealed = {int(s) for s in raw.get("sealed", [])}
+            for season in range(_date(start).year, _date(end).year + 1):
+                if season not in sealed and _season_over(season, today) and not missing_intervals(*season_window(season), windows):
+                    sealed.add(season)
+            raw["windows"] = windows
+            raw["sealed"] = sorted(sealed)
+            _write_json_atomic(raw, self._coverage_path(role, player_id))
+
+    # ---------- reads ----------
+
+    def read(
+        self,
+        role: str,
+        player_id: int,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        game_types: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Pitches for one player in [start, end] restricted to ``game_types``."""
+        paths = self.partitions(role, player_id, _seasons_between(start, end), game_types)
+        return self._read_paths(paths, start, end, columns)
+
+    def scan(
+        self,
+        role: str,
+        seasons: Optional[Iterable[int]] = None,
+        game_types: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[ds.Expression] = None,
+    ) -> pd.DataFrame:
+        """Query across every stored player (e.g. league-wide season tables)."""
+        paths = self.partitions(role, None, seasons, game_types)
+        if not paths:
+            return pd.DataFrame()
+        dataset = ds.dataset([str(p) for p in paths], format="parquet")
+        return dataset.to_table(columns=list(columns) if columns else None, filter=where).to_pandas()
+
+    def _read_paths(
+        self,
+        paths: List[Path],
+        start: Optional[str],
+        end: Optional[str],
+        columns: Optional[Sequence[str]],
+    ) -> pd.DataFrame:
+        if not paths:
+            return pd.DataFrame()
+        cols = list(columns) if columns else None
+        if cols and (start or end) and "game_date" not in cols:
+            cols.append("game_date")
+        frames = [pd.read_parquet(p, columns=cols) for p in paths]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if start or end:
+            dates = pd.to_datetime(df["game_date"])
+            mask = pd.Series(True, index=df.index)
+            if start:
+                mask &= dates >= pd.Timestamp(start)
+            if end:
+                mask &= dates <= pd.Timestamp(end)
+            df = df.loc[mask]
+        if columns:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+
+STORE = StatcastStore()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Time server._season_table on a synthetic league-sized pitch frame.
+
+Run from the repo root: python -m scripts.bench_season_table
+"""
+from __future__ import annotations
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.api.server import _season_table
+
+EVENTS = np.array(["single","double","triple","home_run","walk","intent_walk","hit_by_pitch",
+                   "sac_fly","sac_bunt","field_out","strikeout","grounded_into_double_play"], dtype=object)
+EVENT_P = np.array([.14,.045,.005,.03,.08,.005,.01,.007,.003,.4,.225,.05])
+
+def synthetic_pitches(n_pitches: int, n_batters: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_pa = n_pitches // 4
+    per_pa = rng.integers(1, 8, n_pa)
+    pa_id = np.repeat(np.arange(n_pa), per_pa)[:n_pitches]
+    pitch_number = (pd.Series(pa_id).groupby(pa_id).cumcount() + 1).to_numpy()
+    batter = rng.integers(100000, 100000 + n_batters, n_pa)[pa_id]
+    game_pk = pa_id // 70
+    events = np.where(np.r_[pa_id[1:] != pa_id[:-1], True],
+                      rng.choice(EVENTS, len(pa_id), p=EVENT_P), None)
+    dates = pd.Timestamp("2024-03-28") + pd.to_timedelta(game_pk % 185, unit="D")
+    return pd.DataFrame({
+        "game_pk": game_pk,
+        "at_bat_number": pa_id % 70 + 1,
+        "pitch_number": pitch_number,
+        "batter": batter,
+        "player_name": pd.Series(batter).map(lambda b: f"Player {b}").to_numpy(),
+        "game_date": dates.strftime("%Y-%m-%d"),
+        "events": events,
+    })
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--pitches", type=int, default=700_000)
+    p.add_argument("--batters", type=int, default=1000)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+    df = synthetic_pitches(args.pitches, args.batters)
+    best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        out = _season_table(df)
+        best = min(best, time.perf_counter() - t0)
+    print(f"[BENCH] _season_table: {len(df):,} pitches, {len(out):,} player-seasons, best of {args.repeat}: {best:.3f}s")
+
+if __name__ == "__main__":
+    main()
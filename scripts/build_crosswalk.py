@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Build the MLBAM/FanGraphs/name crosswalk from the Chadwick register.
+
+Run from the repo root: python -m scripts.build_crosswalk [--seasons 2015 2025]
+
+With --seasons, the statsapi roster for each season adds bats/throws/position.
+"""
+from __future__ import annotations
+import argparse
+import time
+
+import pandas as pd
+from pybaseball import chadwick_register
+
+from backend.sequence_src.crosswalk import CROSSWALK_PATH, crosswalk_frame, write_crosswalk
+from backend.sequence_src.http_pool import HTTP_POOL
+
+PLAYERS_URL = "https://statsapi.mlb.com/api/v1/sports/1/players"
+
+def season_people(first: int, last: int) -> pd.DataFrame:
+    rows = []
+    for season in range(first, last + 1):
+        r = HTTP_POOL.sync_client(PLAYERS_URL).get(PLAYERS_URL, params={"season": season}, timeout=30)
+        r.raise_for_status()
+        for p in (r.json() or {}).get("people", []):
+            rows.append({
+                "mlbam": p.get("id"),
+                "bats": (p.get("batSide") or {}).get("code"),
+                "throws": (p.get("pitchHand") or {}).get("code"),
+                "position": (p.get("primaryPosition") or {}).get("abbreviation"),
+            })
+    # later seasons come last so drop_duplicates(keep="last") keeps the newest position
+    return pd.DataFrame(rows, columns=["mlbam", "bats", "throws", "position"])
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seasons", type=int, nargs=2, metavar=("FIRST", "LAST"))
+    p.add_argument("--out", default=str(CROSSWALK_PATH))
+    args = p.parse_args()
+    t0 = time.perf_counter()
+    register = chadwick_register()
+    people = season_people(*args.seasons) if args.seasons else None
+    frame = crosswalk_frame(register, people)
+    path = write_crosswalk(frame, args.out)
+    print(f"[CROSSWALK] {len(frame)} players -> {path} ({time.perf_counter() - t0:.1f}s)")
+    HTTP_POOL.close()
+
+if __name__ == "__main__":
+    main()
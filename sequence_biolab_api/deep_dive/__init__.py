@@ -2,6 +2,6 @@
 Deep dive domain logic.
 """
 
-from .pitcher import build_pitcher_deep_dive  # noqa: F401
+from .pitcher import build_pitcher_deep_dive, pitcher_deep_dive_payload  # noqa: F401
 
-__all__ = ["build_pitcher_deep_dive"]
+__all__ = ["build_pitcher_deep_dive", "pitcher_deep_dive_payload"]
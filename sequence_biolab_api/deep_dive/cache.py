@@ -0,0 +1,162 @@
+"""
+In-process caches for the deep dive builders.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from backend.sequence_src.singleflight import SingleFlight
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored: float
+    fresh_until: float
+    stale_until: float
+    weight: int
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    evictions: int = 0
+
+
+class TTLCache:
+    """
+    Size/byte-bounded LRU with TTL and stale-while-revalidate.
+
+    Entries are fresh for ``ttl_seconds``; for a further ``stale_seconds``
+    they are still served immediately while one background task reloads
+    them. Reads never take a lock: every mutation happens synchronously on
+    the event loop, and concurrent misses for one key share a single load.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 1800.0,
+        stale_seconds: float = 0.0,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ) -> None:
+        self.ttl = ttl_seconds
+        self.stale = stale_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._weigher = weigher
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self._flight = SingleFlight()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until < time.time():
+            self._remove(key)
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.weight
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        weight = int(self._weigher(value)) if self._weigher else 1
+        self._remove(key)
+        self._data[key] = _Entry(value, now, now + self.ttl, now + self.ttl + self.stale, weight)
+        self._bytes += weight
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            old_key, _ = next(iter(self._data.items()))
+            if old_key == key and len(self._data) == 1:
+                break
+            self._remove(old_key)
+            self.stats.evictions += 1
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        """Fresh value or None (stale entries are not returned here)."""
+        entry = self._lookup(key)
+        if entry is None or entry.fresh_until < time.time():
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry.value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        self._store(key, value)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._lookup(key)
+        if entry is not None:
+            if entry.fresh_until >= time.time():
+                self.stats.hits += 1
+                return entry.value
+            self.stats.stale_hits += 1
+            self._schedule_refresh(key, loader)
+            return entry.value
+        self.stats.misses += 1
+        return await self._flight.do_async(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self.stats.loads += 1
+        self._store(key, value)
+        return value
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                await self._flight.do_async(key, lambda: self._load(key, loader))
+                self.stats.refreshes += 1
+            except Exception:
+                # keep serving the stale value; the next stale read retries
+                self.stats.refresh_errors += 1
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stored_at(self, key: Hashable) -> Optional[float]:
+        """When ``key``'s current value was stored (a version stamp); no stats or LRU update."""
+        entry = self._data.get(key)
+        return entry.stored if entry is not None else None
+
+    def invalidate(self, key: Hashable) -> None:
+        self._remove(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**vars(self.stats), "entries": len(self._data), "bytes": self._bytes}
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import datetime as dt
+import hashlib
+import json
 import math
-import re
+import os
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
@@ -12,12 +16,26 @@ import httpx
 import numpy as np
 import pandas as pd
 from fastapi import HTTPException
-from pybaseball import playerid_reverse_lookup, statcast_pitcher
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pybaseball import playerid_reverse_lookup
+
+from backend.sequence_src.crosswalk import CROSSWALK
+from backend.sequence_src.http_pool import HTTP_POOL
+from backend.sequence_src.ratelimit import RATE_LIMITS
+from backend.sequence_src.scrape_savant import fetch_pitcher_statcast
+from backend.sequence_src.singleflight import SingleFlight
+from backend.sequence_src.statcast_store import GAME_TYPES_BY_SEASON_TYPE, STORE as STATCAST_STORE, season_window
+
+from . import summary as pitch_summary
+from .cache import TTLCache
+from .summary import EMPTY as EMPTY_SUMMARY, PitchSummary, merge_summaries, rollup, rollup_sketches, summarize_pitches
 
 SpanLiteral = Literal["regular", "postseason", "total"]
 RollupLiteral = Literal["season", "last3", "career"]
 
 FG_API_BASE = "https://www.fangraphs.com/api/players/stats"
+PAYLOAD_CACHE_MAX_BYTES = int(os.getenv("SEQUENCE_BIOLAB_DEEP_DIVE_PAYLOAD_MAX_BYTES", str(128 * 1024 * 1024)))
 FG_SEASON_TYPE = {"regular": 1, "postseason": 2}  # combine manually for total
 
 # Columns that remain strings (avoid numeric coercion)
@@ -228,29 +246,17 @@ RUN_VALUE_COLS = {
 }
 
 
-def _strip_html(text: Any) -> str:
-    if text is None:
-        return ""
-    return re.sub(r"<.*?>", "", str(text))
-
-
-def _ip_to_outs(ip_val: Any) -> int:
-    if ip_val is None or (isinstance(ip_val, float) and math.isnan(ip_val)):
-        return 0
-    try:
-        ip_float = float(ip_val)
-    except (TypeError, ValueError):
-        return 0
-    whole = int(math.floor(ip_float))
-    frac = int(round((ip_float - whole) * 10))
-    frac = min(max(frac, 0), 2)
+def _ip_to_outs(ip: np.ndarray) -> np.ndarray:
+    """Outs from FanGraphs innings (``6.2`` is six and two thirds); missing innings count as zero."""
+    ip = np.nan_to_num(np.asarray(ip, dtype=float), nan=0.0)
+    whole = np.floor(ip)
+    frac = np.clip(np.round((ip - whole) * 10), 0, 2)
     return whole * 3 + frac
 
 
-def _outs_to_ip(outs: int) -> float:
-    whole = outs // 3
-    rem = outs % 3
-    return round(whole + rem / 10.0, 1)
+def _outs_to_ip(outs: np.ndarray) -> np.ndarray:
+    outs = np.asarray(outs, dtype=float)
+    return np.round(outs // 3 + (outs % 3) / 10.0, 1)
 
 
 def _safe_div(num: float, denom: float) -> Optional[float]:
@@ -267,79 +273,96 @@ def _safe_pct(num: float, denom: float) -> Optional[float]:
     return val if val is None else float(val)
 
 
-def _weighted_average(pairs: Iterable[Tuple[Optional[float], float]]) -> Optional[float]:
-    total_weight = 0.0
-    total = 0.0
-    for value, weight in pairs:
-        if value is None:
-            continue
-        if weight <= 0:
-            continue
-        total += float(value) * weight
-        total_weight += weight
-    if total_weight <= 0:
-        return None
-    return total / total_weight
+def _ratio(num: np.ndarray, denom: np.ndarray, where: Optional[np.ndarray] = None) -> np.ndarray:
+    """``num / denom`` where ``where`` holds (default: non-zero denominators), NaN elsewhere."""
+    num, denom = np.broadcast_arrays(np.asarray(num, dtype=float), np.asarray(denom, dtype=float))
+    out = np.full(num.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(num, denom, out=out, where=denom != 0 if where is None else where)
+    return out
+
 
+def _weighted_average(*sides: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    """
+    Column-wise weighted mean over ``(values, present, weights)`` sides.
 
-class TTLCache:
-    """Very small async-safe TTL cache for expensive network responses."""
+    ``values``/``present`` are (slices x columns); ``weights`` is one per slice.
+    Absent values and non-positive weights drop out; a slice with no weight
+    left comes back NaN. NaN values or weights propagate.
+    """
+    total = total_weight = 0.0
+    for values, present, weights in sides:
+        use = present & ~(weights <= 0)[:, None]
+        total = total + np.where(use, values * weights[:, None], 0.0)
+        total_weight = total_weight + np.where(use, weights[:, None], 0.0)
+    return _ratio(total, total_weight, ~(total_weight <= 0))
 
-    def __init__(self, ttl_seconds: float = 1800.0) -> None:
-        self.ttl = ttl_seconds
-        self._data: Dict[Any, Tuple[float, Any]] = {}
-        self._lock = asyncio.Lock()
 
-    async def get(self, key: Any) -> Optional[Any]:
-        async with self._lock:
-            entry = self._data.get(key)
-            if not entry:
-                return None
-            expires_at, value = entry
-            if expires_at < time.time():
-                del self._data[key]
-                return None
-            return value
+def _json_weight(value: Any) -> int:
+    return len(json.dumps(value, default=str))
 
-    async def set(self, key: Any, value: Any) -> None:
-        async with self._lock:
-            self._data[key] = (time.time() + self.ttl, value)
 
+# FanGraphs responses: fresh for 30 min, then served stale for up to 6h while refreshed
+_fg_cache = TTLCache(
+    ttl_seconds=1800.0,
+    stale_seconds=6 * 3600.0,
+    max_entries=2048,
+    max_bytes=256 * 1024 * 1024,
+    weigher=_json_weight,
+)
 
-_fg_cache = TTLCache(ttl_seconds=1800.0)
+
+def _fg_cache_key(url: str, params: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+    return (url, tuple(sorted(params.items())))
 
 
 async def _http_get_json(url: str, params: Dict[str, Any], timeout: float = 20.0) -> Dict[str, Any]:
-    cache_key = (url, tuple(sorted(params.items())))
-    cached = await _fg_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    cache_key = _fg_cache_key(url, params)
+    # concurrent misses for one key share a single upstream request
+    return await _fg_cache.get_or_load(cache_key, lambda: _download_json(url, params, timeout))
+
 
+async def _download_json(url: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
     backoff = 0.75
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for attempt in range(5):
-            try:
-                response = await client.get(url, params=params)
-                if response.status_code in (429, 500, 502, 503, 504):
-                    await asyncio.sleep(backoff * (attempt + 1))
-                    continue
-                response.raise_for_status()
-                data = response.json()
-                await _fg_cache.set(cache_key, data)
-                return data
-            except (httpx.TimeoutException, httpx.NetworkError):
-                if attempt == 4:
-                    raise
+    client = HTTP_POOL.async_client(url)
+    limiter = RATE_LIMITS.bucket(url)
+    for attempt in range(5):
+        await limiter.acquire()
+        try:
+            response = await client.get(url, params=params, timeout=timeout)
+            if response.status_code in (429, 500, 502, 503, 504):
+                if response.status_code in (429, 503):
+                    limiter.pause(backoff * (attempt + 1))
                 await asyncio.sleep(backoff * (attempt + 1))
+                continue
+            response.raise_for_status()
+            return response.json()
+        except (httpx.TimeoutException, httpx.NetworkError):
+            if attempt == 4:
+                raise
+            await asyncio.sleep(backoff * (attempt + 1))
     raise RuntimeError("unreachable")
 
 
 @lru_cache(maxsize=512)
-def _lookup_fg_id(mlbam: int) -> int:
+def _register_fg_id(mlbam: int) -> Optional[int]:
+    """FanGraphs id from the Chadwick register; None (remembered too) when it has none."""
     df = playerid_reverse_lookup([mlbam], key_type="mlbam")
     if df.empty or "key_fangraphs" not in df.columns:
+        return None
+    fg_id = pd.to_numeric(df.iloc[0]["key_fangraphs"], errors="coerce")
+    return int(fg_id) if pd.notna(fg_id) and fg_id > 0 else None
+
+
+@lru_cache(maxsize=512)
+def _lookup_fg_id(mlbam: int) -> int:
+    fg_id = CROSSWALK.fg_for_mlbam(mlbam)
+    if fg_id is None:
+        # not in the local crosswalk (missing file or brand-new player): fall back to the
+        # register, pulled at most once per player per process
+        fg_id = _register_fg_id(mlbam)
+    if fg_id is None:
         raise ValueError(f"No FanGraphs id for MLBAM {mlbam}")
-    fg_id = int(df.iloc[0]["key_fangraphs"])
     return fg_id
 
 
@@ -355,48 +378,40 @@ def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _season_label_from_row(row: pd.Series) -> Tuple[Optional[int], str]:
-    row_type = row.get("type")
-    season_int = None
-    if pd.notna(row.get("aseason")):
-        try:
-            season_int = int(row["aseason"])
-        except Exception:
-            season_int = None
-
-    if row_type == -1:
-        return season_int, "Career"
-    if row_type == -2:
-        return season_int, "Postseason"
-    label = season_int if season_int is not None else _strip_html(row.get("Season"))
-    return season_int, str(label)
-
-
 def _normalize_fg_data(raw: List[Dict[str, Any]]) -> pd.DataFrame:
     df = pd.DataFrame(raw or [])
     if df.empty:
         return df
     df = _coerce_numeric(df)
-    seasons: List[str] = []
-    season_ints: List[Optional[int]] = []
-    for _, row in df.iterrows():
-        season_int, label = _season_label_from_row(row)
-        season_ints.append(season_int)
-        seasons.append(label)
-    return df.assign(season_label=seasons, season_int=season_ints)
+    missing = pd.Series(None, index=df.index, dtype=object)
+    season = np.trunc(pd.to_numeric(df.get("aseason", missing), errors="coerce"))
+    row_type = df.get("type", missing)
+    text = df.get("Season", missing)
+    text = text.astype(str).str.replace(r"<.*?>", "", regex=True).where(text.notna(), "")
+    # career (-1) and postseason career (-2) rows are labelled by kind, the rest by season
+    labels = np.select(
+        [row_type.eq(-1).to_numpy(), row_type.eq(-2).to_numpy(), season.notna().to_numpy()],
+        ["Career", "Postseason", season.astype("Int64").astype(str).to_numpy(dtype=object)],
+        default=text.to_numpy(dtype=object),
+    )
+    if season.notna().all():
+        season = season.astype("int64")
+    return df.assign(season_label=labels, season_int=season)
 
 
-async def _fetch_fg_table(fg_id: int, year: int, span: SpanLiteral) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-    seasontype = FG_SEASON_TYPE.get(span, 1)
-    params = {
+def _fg_params(fg_id: int, year: int, span: SpanLiteral) -> Dict[str, Any]:
+    return {
         "playerid": fg_id,
         "position": "P",
         "stats": "pit",
         "season": year,
         "grid": "season",
-        "seasontype": seasontype,
+        "seasontype": FG_SEASON_TYPE.get(span, 1),
     }
-    data = await _http_get_json(FG_API_BASE, params)
+
+
+async def _fetch_fg_table(fg_id: int, year: int, span: SpanLiteral) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    data = await _http_get_json(FG_API_BASE, _fg_params(fg_id, year, span))
     df = _normalize_fg_data(data.get("data") or [])
     meta = data.get("playerInfo") or {}
     return df, meta
@@ -410,17 +425,6 @@ def _split_regular_post(df: pd.DataFrame) -> pd.DataFrame:
     return df.loc[mask].copy()
 
 
-def _series_to_dict(row: Optional[pd.Series]) -> Dict[str, Any]:
-    if row is None:
-        return {}
-    out: Dict[str, Any] = {}
-    for key, value in row.items():
-        if isinstance(value, (np.generic,)):
-            value = value.item()
-        out[key] = value
-    return out
-
-
 def _merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
     merged = dict(a)
     for key, value in b.items():
@@ -431,76 +435,182 @@ def _merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
 
 @dataclass
 class SeasonSlice:
+    """
+    One row of the FanGraphs sections.
+
+    ``values`` is the span's FanGraphs line (for ``total`` the regular and
+    postseason lines merged per weighting basis); ``totals`` holds the
+    counting stats summed across both.
+    """
+
     label: str
     season: Optional[int]
     span: SpanLiteral
-    regular: Dict[str, Any]
-    postseason: Dict[str, Any]
+    values: Dict[str, Any]
     totals: Dict[str, float]
 
 
-def _compute_totals(regular: Dict[str, Any], postseason: Dict[str, Any]) -> Dict[str, float]:
-    def g(src: Dict[str, Any], key: str) -> float:
-        val = src.get(key)
-        if val is None:
-            return 0.0
-        try:
-            return float(val)
-        except (TypeError, ValueError):
-            return 0.0
-
-    outs_reg = _ip_to_outs(regular.get("IP"))
-    outs_post = _ip_to_outs(postseason.get("IP"))
-    outs_total = outs_reg + outs_post
-    totals: Dict[str, float] = {
-        "outs": float(outs_total),
-        "ip_inn": outs_total / 3.0 if outs_total else 0.0,
-        "ip_display": _outs_to_ip(outs_total),
-        "IP": _outs_to_ip(outs_total),
-        "TBF": g(regular, "TBF") + g(postseason, "TBF"),
-        "H": g(regular, "H") + g(postseason, "H"),
-        "R": g(regular, "R") + g(postseason, "R"),
-        "ER": g(regular, "ER") + g(postseason, "ER"),
-        "HR": g(regular, "HR") + g(postseason, "HR"),
-        "BB": g(regular, "BB") + g(postseason, "BB"),
-        "IBB": g(regular, "IBB") + g(postseason, "IBB"),
-        "HBP": g(regular, "HBP") + g(postseason, "HBP"),
-        "SO": g(regular, "SO") + g(postseason, "SO"),
-        "Balls": g(regular, "Balls") + g(postseason, "Balls"),
-        "Strikes": g(regular, "Strikes") + g(postseason, "Strikes"),
-        "Pitches": g(regular, "Pitches") + g(postseason, "Pitches"),
-        "Events": g(regular, "Events") + g(postseason, "Events"),
-        "HardHit": g(regular, "HardHit") + g(postseason, "HardHit"),
-        "Barrels": g(regular, "Barrels") + g(postseason, "Barrels"),
-        "GB": g(regular, "GB") + g(postseason, "GB"),
-        "FB": g(regular, "FB") + g(postseason, "FB"),
-        "LD": g(regular, "LD") + g(postseason, "LD"),
-        "IFFB": g(regular, "IFFB") + g(postseason, "IFFB"),
-        "W": g(regular, "W") + g(postseason, "W"),
-        "L": g(regular, "L") + g(postseason, "L"),
-        "G": g(regular, "G") + g(postseason, "G"),
-        "GS": g(regular, "GS") + g(postseason, "GS"),
-        "SV": g(regular, "SV") + g(postseason, "SV"),
-        "QS": g(regular, "QS") + g(postseason, "QS"),
-        "RS": g(regular, "RS") + g(postseason, "RS"),
-        "RAR": g(regular, "RAR") + g(postseason, "RAR"),
-        "WAR": g(regular, "WAR") + g(postseason, "WAR"),
-        "Dollars": g(regular, "Dollars") + g(postseason, "Dollars"),
-        "WPA": g(regular, "WPA") + g(postseason, "WPA"),
-        "-WPA": g(regular, "-WPA") + g(postseason, "-WPA"),
-        "+WPA": g(regular, "+WPA") + g(postseason, "+WPA"),
-        "RE24": g(regular, "RE24") + g(postseason, "RE24"),
-        "REW": g(regular, "REW") + g(postseason, "REW"),
-        "pLI_sum": g(regular, "pLI") * g(regular, "G") + g(postseason, "pLI") * g(postseason, "G"),
-        "inLI_sum": g(regular, "inLI") * g(regular, "G") + g(postseason, "inLI") * g(postseason, "G"),
-        "gmLI_sum": g(regular, "gmLI") * g(regular, "G") + g(postseason, "gmLI") * g(postseason, "G"),
-    }
+# Counting stats summed into SeasonSlice.totals; leverage indexes are summed per game as "<col>_sum"
+TOTAL_COLS = (
+    "TBF", "H", "R", "ER", "HR", "BB", "IBB", "HBP", "SO", "Balls", "Strikes", "Pitches", "Events",
+    "HardHit", "Barrels", "GB", "FB", "LD", "IFFB", "W", "L", "G", "GS", "SV", "QS", "RS", "RAR",
+    "WAR", "Dollars", "WPA", "-WPA", "+WPA", "RE24", "REW",
+)
+LEVERAGE_COLS = ("pLI", "inLI", "gmLI")
+
+# Weighting basis for merging regular + postseason columns; a column takes the first set it is in,
+# anything unlisted is weighted by games
+WEIGHT_CLASSES = (
+    ("additive", ADDITIVE_COLS),
+    ("ip", IP_WEIGHT_COLS),
+    ("tbf", TBF_WEIGHT_COLS),
+    ("events", EVENT_WEIGHT_COLS),
+    ("batted_ball", BBALL_RATE_COLS),
+    ("pitches", VELOCITY_COLS | RUN_VALUE_COLS | PITCH_TYPE_RATE_COLS),
+)
+
+
+@lru_cache(maxsize=64)
+def _weight_classes(columns: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """Column positions per weighting basis."""
+    basis = np.full(len(columns), "games", dtype=object)
+    for name, cols in reversed(WEIGHT_CLASSES):
+        basis[np.isin(np.asarray(columns, dtype=object), list(cols))] = name
+    return {name: np.flatnonzero(basis == name) for name in ["games", *(n for n, _ in WEIGHT_CLASSES)]}
+
+
+def _span_columns(df: pd.DataFrame, positions: np.ndarray, columns: pd.Index) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ``df``'s numeric columns at row ``positions`` (-1: no row), aligned to ``columns``.
+
+    Returns (values, present, filled): ``present`` marks cells the line
+    actually has, ``filled`` is ``values`` with absent cells as zero.
+    """
+    values = np.full((len(positions), len(columns)), np.nan)
+    present = np.zeros(values.shape, dtype=bool)
+    rows = positions >= 0
+    if not df.empty and rows.any():
+        numeric = df.select_dtypes("number")
+        cols = columns.get_indexer(numeric.columns)
+        values[np.ix_(rows, cols)] = numeric.to_numpy(dtype=float)[positions[rows]]
+        present[np.ix_(rows, cols)] = True
+    return values, present, np.where(present, values, 0.0)
+
+
+def _span_totals(columns: pd.Index, reg: np.ndarray, post: np.ndarray) -> Dict[str, np.ndarray]:
+    """Totals for every slice at once from the absent-as-zero regular and postseason columns."""
+    ip = columns.get_loc("IP")
+    outs = _ip_to_outs(reg[:, ip]) + _ip_to_outs(post[:, ip])
+    totals = {"outs": outs, "ip_inn": outs / 3.0, "ip_display": _outs_to_ip(outs), "IP": _outs_to_ip(outs)}
+    idx = columns.get_indexer(TOTAL_COLS)
+    totals.update(zip(TOTAL_COLS, (reg[:, idx] + post[:, idx]).T))
+    li, g = columns.get_indexer(LEVERAGE_COLS), columns.get_loc("G")
+    leverage = reg[:, li] * reg[:, [g]] + post[:, li] * post[:, [g]]
+    totals.update(zip((f"{col}_sum" for col in LEVERAGE_COLS), leverage.T))
     return totals
 
 
-def _build_slice(label: str, season: Optional[int], span: SpanLiteral, regular: Dict[str, Any], postseason: Dict[str, Any]) -> SeasonSlice:
-    totals = _compute_totals(regular, postseason)
-    return SeasonSlice(label=label, season=season, span=span, regular=regular, postseason=postseason, totals=totals)
+def _merge_spans(
+    columns: pd.Index,
+    reg: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    post: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    totals: Dict[str, np.ndarray],
+) -> np.ndarray:
+    """
+    The combined regular + postseason line for every slice, one weighting basis at a time.
+
+    Each side is ``(values, present, filled)`` with absent cells zero in ``filled``.
+    Additive columns add (an absent side counts as zero, a NaN stays NaN);
+    rates are averaged by innings, batters faced, batted-ball events, pitches
+    or games; batted-ball rates are recomputed from the summed counts.
+    """
+    (reg_v, reg_p, reg_f), (post_v, post_p, post_f) = reg, post
+    classes = _weight_classes(tuple(columns))
+    merged = np.full(reg_v.shape, np.nan)
+
+    def col(filled: np.ndarray, key: str) -> np.ndarray:
+        return filled[:, columns.get_loc(key)]
+
+    def weigh(idx: np.ndarray, reg_w: np.ndarray, post_w: np.ndarray) -> None:
+        merged[:, idx] = _weighted_average((reg_v[:, idx], reg_p[:, idx], reg_w), (post_v[:, idx], post_p[:, idx], post_w))
+
+    additive = classes["additive"]
+    merged[:, additive] = reg_f[:, additive] + post_f[:, additive]
+    weigh(classes["ip"], _ip_to_outs(col(reg_f, "IP")) / 3.0, _ip_to_outs(col(post_f, "IP")) / 3.0)
+    weigh(classes["tbf"], col(reg_f, "TBF"), col(post_f, "TBF"))
+    weigh(classes["events"], col(reg_f, "Events"), col(post_f, "Events"))
+    # a regular line without a pitch count borrows the combined count
+    reg_pitches = col(reg_f, "Pitches")
+    weigh(classes["pitches"], np.where(reg_pitches != 0, reg_pitches, totals["Pitches"]), col(post_f, "Pitches"))
+    weigh(classes["games"], col(reg_f, "G"), col(post_f, "G"))
+
+    gb, fb, ld, iffb, hr = (totals[key] for key in ("GB", "FB", "LD", "IFFB", "HR"))
+    batted = gb + fb + ld + iffb
+    derived = {
+        "GB%": _ratio(gb, batted),
+        "FB%": _ratio(fb, batted),
+        "LD%": _ratio(ld, batted),
+        "IFFB%": _ratio(iffb, batted),
+        "GB/FB": _ratio(gb, fb),
+        "HR/FB": _ratio(hr, fb),
+    }
+    for key, value in derived.items():
+        merged[:, columns.get_loc(key)] = value
+    # contact quality is weighted by balls in play, falling back to events
+    reg_bip, post_bip = col(reg_f, "Events"), col(post_f, "Events")
+    if "BIP" in columns:
+        i = columns.get_loc("BIP")
+        reg_bip = np.where(reg_p[:, i], reg_v[:, i], reg_bip)
+        post_bip = np.where(post_p[:, i], post_v[:, i], post_bip)
+    weigh(columns.get_indexer(["Soft%", "Med%", "Hard%"]), reg_bip, post_bip)
+    return merged
+
+
+def _season_positions(df: pd.DataFrame) -> Dict[int, int]:
+    """Row position of each season's line; a repeated season keeps its last row."""
+    if df.empty:
+        return {}
+    mask = ((df["type"] == 0) & df["season_int"].notna()).to_numpy()
+    seasons = df["season_int"].to_numpy()[mask].astype(int)
+    return dict(zip(seasons.tolist(), np.flatnonzero(mask).tolist()))
+
+
+def _total_position(df: pd.DataFrame, row_type: int) -> int:
+    if df.empty:
+        return -1
+    hits = np.flatnonzero((df["type"] == row_type).to_numpy())
+    return int(hits[0]) if len(hits) else -1
+
+
+def _build_slices(
+    df_regular: pd.DataFrame,
+    df_post: pd.DataFrame,
+    span: SpanLiteral,
+    plan: List[Tuple[str, Optional[int], int, int]],
+) -> List[SeasonSlice]:
+    if not plan:
+        return []
+    reg_pos = np.array([p[2] for p in plan], dtype=int)
+    post_pos = np.array([p[3] for p in plan], dtype=int)
+    names = set(ADDITIVE_COLS) | BBALL_RATE_COLS
+    for df in (df_regular, df_post):
+        if not df.empty:
+            names.update(df.select_dtypes("number").columns)
+    columns = pd.Index(sorted(names, key=str))
+    reg = _span_columns(df_regular, reg_pos, columns)
+    post = _span_columns(df_post, post_pos, columns)
+    totals = _span_totals(columns, reg[2], post[2])
+
+    if span == "total":
+        values = [dict(zip(columns, row)) for row in _merge_spans(columns, reg, post, totals).tolist()]
+    else:
+        df, pos = (df_regular, reg_pos) if span == "regular" else (df_post, post_pos)
+        values = df.iloc[pos].to_dict("records")
+    slice_totals = [dict(zip(totals, row)) for row in np.column_stack(list(totals.values())).tolist()]
+    return [
+        SeasonSlice(label=label, season=season, span=span, values=vals, totals=tot)
+        for (label, season, _, _), vals, tot in zip(plan, values, slice_totals)
+    ]
 
 
 def _select_rows(
@@ -510,142 +620,27 @@ def _select_rows(
     rollup: RollupLiteral,
     year: int,
 ) -> List[SeasonSlice]:
-    rows: List[SeasonSlice] = []
-
-    reg_map: Dict[int, Dict[str, Any]] = {}
-    if not df_regular.empty:
-        for _, row in df_regular.iterrows():
-            if row["type"] == 0 and pd.notna(row["season_int"]):
-                reg_map[int(row["season_int"])] = _series_to_dict(row)
-    post_map: Dict[int, Dict[str, Any]] = {}
-    if not df_post.empty:
-        for _, row in df_post.iterrows():
-            if row["type"] == 0 and pd.notna(row["season_int"]):
-                post_map[int(row["season_int"])] = _series_to_dict(row)
-
-    if rollup == "season":
-        if span == "regular":
-            data = reg_map.get(year)
-            if data:
-                rows.append(_build_slice(str(year), year, span, data, {}))
-        elif span == "postseason":
-            data = post_map.get(year)
-            if data:
-                rows.append(_build_slice(f"{year} PS", year, span, {}, data))
-        else:  # total
-            reg = reg_map.get(year, {})
-            post = post_map.get(year, {})
-            if reg or post:
-                rows.append(_build_slice(str(year), year, span, reg, post))
-        return rows
-
-    if rollup == "last3":
-        if span == "regular":
-            years = sorted([y for y in reg_map if y <= year], reverse=True)[:3]
-            for y in sorted(years):
-                rows.append(_build_slice(str(y), y, span, reg_map[y], {}))
-        elif span == "postseason":
-            years = sorted([y for y in post_map if y <= year], reverse=True)[:3]
-            for y in sorted(years):
-                rows.append(_build_slice(f"{y} PS", y, span, {}, post_map[y]))
-        else:
-            years = sorted({y for y in reg_map if y <= year} | {y for y in post_map if y <= year}, reverse=True)[:3]
-            for y in sorted(years):
-                rows.append(_build_slice(str(y), y, span, reg_map.get(y, {}), post_map.get(y, {})))
-        return rows
-
-    # career
-    if span == "regular":
-        total_row = df_regular.loc[df_regular["type"] == -1].head(1)
-        data = _series_to_dict(total_row.iloc[0]) if not total_row.empty else {}
-        if data:
-            rows.append(_build_slice("Career", None, span, data, {}))
-    elif span == "postseason":
-        total_row = df_post.loc[df_post["type"] == -2].head(1)
-        data = _series_to_dict(total_row.iloc[0]) if not total_row.empty else {}
-        if data:
-            rows.append(_build_slice("Career (PS)", None, span, {}, data))
+    # (label, season, regular row, postseason row) per slice; -1 means no line on that side
+    plan: List[Tuple[str, Optional[int], int, int]] = []
+    if rollup == "career":
+        reg = _total_position(df_regular, -1) if span != "postseason" else -1
+        post = _total_position(df_post, -2) if span != "regular" else -1
+        plan.append(("Career (PS)" if span == "postseason" else "Career", None, reg, post))
     else:
-        reg_total = df_regular.loc[df_regular["type"] == -1].head(1)
-        post_total = df_post.loc[df_post["type"] == -2].head(1)
-        reg_dict = _series_to_dict(reg_total.iloc[0]) if not reg_total.empty else {}
-        post_dict = _series_to_dict(post_total.iloc[0]) if not post_total.empty else {}
-        if reg_dict or post_dict:
-            rows.append(_build_slice("Career", None, span, reg_dict, post_dict))
-    return rows
+        reg_map = _season_positions(df_regular) if span != "postseason" else {}
+        post_map = _season_positions(df_post) if span != "regular" else {}
+        if rollup == "season":
+            years = [year]
+        else:
+            years = sorted({y for y in (*reg_map, *post_map) if y <= year})[-3:]
+        suffix = " PS" if span == "postseason" else ""
+        plan.extend((f"{y}{suffix}", y, reg_map.get(y, -1), post_map.get(y, -1)) for y in years)
+    plan = [p for p in plan if p[2] >= 0 or p[3] >= 0]
+    return _build_slices(df_regular, df_post, span, plan)
 
 
 def _value_from_slice(s: SeasonSlice, key: str) -> Optional[float]:
-    if s.span == "regular":
-        return s.regular.get(key)
-    if s.span == "postseason":
-        return s.postseason.get(key)
-
-    reg_val = s.regular.get(key)
-    post_val = s.postseason.get(key)
-    if key in ADDITIVE_COLS:
-        return (reg_val or 0) + (post_val or 0)
-
-    if key in IP_WEIGHT_COLS:
-        weights = []
-        ip_reg = _safe_div(_ip_to_outs(s.regular.get("IP")), 3.0) or 0.0
-        ip_post = _safe_div(_ip_to_outs(s.postseason.get("IP")), 3.0) or 0.0
-        weights.append((reg_val, ip_reg))
-        weights.append((post_val, ip_post))
-        return _weighted_average(weights)
-
-    if key in TBF_WEIGHT_COLS:
-        weights = []
-        weights.append((reg_val, s.regular.get("TBF", 0) or 0.0))
-        weights.append((post_val, s.postseason.get("TBF", 0) or 0.0))
-        return _weighted_average(weights)
-
-    if key in EVENT_WEIGHT_COLS:
-        weights = []
-        weights.append((reg_val, s.regular.get("Events", 0) or 0.0))
-        weights.append((post_val, s.postseason.get("Events", 0) or 0.0))
-        return _weighted_average(weights)
-
-    if key in BBALL_RATE_COLS:
-        # Compute from totals when possible
-        gb = s.totals.get("GB", 0.0)
-        fb = s.totals.get("FB", 0.0)
-        ld = s.totals.get("LD", 0.0)
-        iffb = s.totals.get("IFFB", 0.0)
-        denom = gb + fb + ld + iffb
-        if key == "GB%" and denom:
-            return gb / denom
-        if key == "FB%" and denom:
-            return fb / denom
-        if key == "LD%" and denom:
-            return ld / denom
-        if key == "IFFB%" and denom:
-            return iffb / denom
-        if key == "GB/FB" and fb:
-            return gb / fb
-        if key == "HR/FB" and fb:
-            return s.totals.get("HR", 0.0) / fb
-        if key == "Soft%" or key == "Med%" or key == "Hard%":
-            weights = [
-                (reg_val, s.regular.get("BIP", s.regular.get("Events", 0) or 0.0)),
-                (post_val, s.postseason.get("BIP", s.postseason.get("Events", 0) or 0.0)),
-            ]
-            return _weighted_average(weights)
-        return None
-
-    if key in VELOCITY_COLS or key in RUN_VALUE_COLS or key in PITCH_TYPE_RATE_COLS:
-        weights = [
-            (reg_val, s.regular.get("Pitches", 0) or s.totals.get("Pitches", 0.0)),
-            (post_val, s.postseason.get("Pitches", 0) or 0.0),
-        ]
-        return _weighted_average(weights)
-
-    # default weighted by games
-    weights = [
-        (reg_val, s.regular.get("G", 0) or 0.0),
-        (post_val, s.postseason.get("G", 0) or 0.0),
-    ]
-    return _weighted_average(weights)
+    return s.values.get(key)
 
 
 def _standard_section(rows: List[SeasonSlice]) -> List[Dict[str, Any]]:
@@ -878,166 +873,169 @@ def _clean_section(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return cleaned
 
 
-async def _fetch_statcast(mlbam: int, seasons: List[int], span: SpanLiteral) -> pd.DataFrame:
+# per-season summaries; finished seasons are keyed as sealed, the live one by store version
+_summary_cache = TTLCache(ttl_seconds=float("inf"), max_entries=4096)
+
+
+def _sealed_season_summary(mlbam: int, year: int, game_types: Tuple[str, ...]) -> PitchSummary:
+    """A sealed season's summary, computed from the store once for every game type and persisted beside it."""
+    tables = STATCAST_STORE.read_summary("pitcher", mlbam, year, pitch_summary.STORED_NAME, pitch_summary.TABLES)
+    if tables is not None:
+        summary = pitch_summary.from_tables(tables)
+    else:
+        summary = summarize_pitches(STATCAST_STORE.read("pitcher", mlbam, *season_window(year)))
+        STATCAST_STORE.write_summary("pitcher", mlbam, year, pitch_summary.STORED_NAME, pitch_summary.to_tables(summary))
+    return pitch_summary.only_game_types(summary, game_types)
+
+
+async def _season_summary(mlbam: int, year: int, game_types: Tuple[str, ...]) -> PitchSummary:
+    start, end = season_window(year)
+    sealed = year in STATCAST_STORE.sealed("pitcher", mlbam)
+    fetched: Optional[pd.DataFrame] = None
+    if not sealed and not STATCAST_STORE.covered("pitcher", mlbam, start, end):
+        # the live window lapsed (or was never fetched): refetch first so the
+        # summary is keyed on the coverage that fetch wrote, not a stale one
+        fetched = await asyncio.to_thread(fetch_pitcher_statcast, mlbam, start, end, game_types)
+    version = "sealed" if sealed else STATCAST_STORE.version("pitcher", mlbam)
+
+    async def load() -> PitchSummary:
+        if sealed:
+            return await asyncio.to_thread(_sealed_season_summary, mlbam, year, game_types)
+        df = fetched
+        if df is None:
+            df = await asyncio.to_thread(fetch_pitcher_statcast, mlbam, start, end, game_types)
+        return await asyncio.to_thread(summarize_pitches, df)
+
+    return await _summary_cache.get_or_load((mlbam, year, game_types, version), load)
+
+
+async def _fetch_statcast(mlbam: int, seasons: List[int], span: SpanLiteral) -> PitchSummary:
     if not seasons:
-        return pd.DataFrame()
-
-    async def run(year: int) -> pd.DataFrame:
-        start = f"{year}-03-01"
-        end = f"{year}-11-30"
-        return await asyncio.to_thread(statcast_pitcher, start, end, mlbam)
-
-    dfs = await asyncio.gather(*[run(year) for year in seasons])
-    combined = pd.concat([df for df in dfs if df is not None and not df.empty], ignore_index=True) if dfs else pd.DataFrame()
-    if combined.empty:
-        return combined
-
-    if "game_type" in combined.columns:
-        if span == "regular":
-            combined = combined.loc[combined["game_type"].isin(["R", "S"])].copy()
-        elif span == "postseason":
-            combined = combined.loc[combined["game_type"].isin(["P", "W", "D", "L"])].copy()
-        else:
-            combined = combined.loc[combined["game_type"].isin(["R", "S", "P", "W", "D", "L"])].copy()
-    return combined
+        return EMPTY_SUMMARY
 
+    game_types = GAME_TYPES_BY_SEASON_TYPE[span]
+    parts = await asyncio.gather(*[_season_summary(mlbam, year, game_types) for year in seasons])
+    return merge_summaries(parts)
 
-def _pitch_mix_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty:
+
+def _pitch_mix_from_statcast(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
         return []
-    counts = df.groupby("pitch_type").size().rename("count")
-    total = counts.sum()
-    velo = df.groupby("pitch_type")["release_speed"].mean().rename("v_avg")
-    whiff = (
-        df.assign(is_whiff=df["description"].str.contains("swinging_strike", case=False, na=False))
-        .groupby("pitch_type")["is_whiff"]
-        .mean()
-        .rename("whiff_rate")
-    )
+    g = rollup(summary.pitch, ["pitch_type"])
+    total = g["n"].sum()
+    velo, velo_sd = pitch_summary.mean(g, "release_speed"), pitch_summary.std(g, "release_speed")
     out: List[Dict[str, Any]] = []
-    for pitch in counts.index:
+    for i, pitch in enumerate(g["pitch_type"]):
+        n = int(g["n"].iat[i])
         out.append(
             {
                 "pitch_type": pitch,
-                "usage_pct": (counts[pitch] / total) if total else 0.0,
-                "avg_velo": float(velo.get(pitch, np.nan)),
-                "whiff_rate": float(whiff.get(pitch, np.nan)),
-                "count": int(counts[pitch]),
+                "usage_pct": (n / total) if total else 0.0,
+                "avg_velo": float(velo.iat[i]),
+                "whiff_rate": float(g["whiffs"].iat[i] / n),
+                "count": n,
+                "max_velo": float(g["release_speed_max"].iat[i]),
+                "velo_sd": float(velo_sd.iat[i]),
             }
         )
     out.sort(key=lambda r: r["usage_pct"], reverse=True)
     return out
 
 
-def _movement_scatter(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty:
+def _movement_scatter(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
         return []
-    grouped = df.groupby("pitch_type").agg(
-        horz=("pfx_x", "mean"),
-        vert=("pfx_z", "mean"),
-        vel=("release_speed", "mean"),
-        count=("pitch_type", "size"),
-    )
-    out: List[Dict[str, Any]] = []
-    for pitch, row in grouped.iterrows():
-        out.append(
-            {
-                "pitch_type": pitch,
-                "horz": float(row["horz"]),
-                "vert": float(row["vert"]),
-                "velo": float(row["vel"]),
-                "count": int(row["count"]),
-            }
-        )
-    return out
+    g = rollup(summary.pitch, ["pitch_type"])
+    horz, vert, velo = (pitch_summary.mean(g, m) for m in ("pfx_x", "pfx_z", "release_speed"))
+    return [
+        {
+            "pitch_type": pitch,
+            "horz": float(horz.iat[i]),
+            "vert": float(vert.iat[i]),
+            "velo": float(velo.iat[i]),
+            "count": int(g["n"].iat[i]),
+        }
+        for i, pitch in enumerate(g["pitch_type"])
+    ]
 
 
-def _velocity_trend(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty or "game_date" not in df.columns:
+def _velocity_trend(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
         return []
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["game_date"])
-    grouped = df.groupby(["date", "pitch_type"])["release_speed"].mean().reset_index()
-    grouped.sort_values("date", inplace=True)
-    out: List[Dict[str, Any]] = []
-    for _, row in grouped.iterrows():
-        out.append(
-            {
-                "date": row["date"].strftime("%Y-%m-%d"),
-                "pitch_type": row["pitch_type"],
-                "velo": float(row["release_speed"]),
-            }
-        )
-    return out
+    g = rollup(summary.game, ["game_date", "pitch_type"])
+    velo = pitch_summary.mean(g, "release_speed")
+    return [
+        {"date": date, "pitch_type": pitch, "velo": float(v)}
+        for date, pitch, v in zip(g["game_date"], g["pitch_type"], velo)
+    ]
 
 
-def _pitch_type_splits(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty:
-        return []
-    grouped = df.groupby("pitch_type").agg(
-        count=("pitch_type", "size"),
-        avg_velo=("release_speed", "mean"),
-        avg_spin=("release_spin_rate", "mean"),
-        whiff_rate=("description", lambda x: np.mean(x.str.contains("swinging_strike", case=False, na=False))),
-        csw=("description", lambda x: np.mean(x.str.contains("called_strike|swinging_strike", case=False, na=False))),
-        avg_iva=("launch_speed", "mean"),
-    )
-    total = grouped["count"].sum()
-    grouped["usage"] = grouped["count"] / total if total else 0.0
-    grouped.reset_index(inplace=True)
-    grouped.rename(columns={"pitch_type": "pitch_type"}, inplace=True)
-    for col in grouped.columns:
-        if col != "pitch_type":
-            grouped[col] = grouped[col].astype(float, errors="ignore")
-    return grouped.to_dict(orient="records")
+_SKETCH_STATS = (
+    ("velo_p50", "release_speed", 0.5),
+    ("velo_p90", "release_speed", 0.9),
+    ("max_velo", "release_speed", 1.0),
+    ("ev_p50", "launch_speed", 0.5),
+    ("ev_p90", "launch_speed", 0.9),
+    ("max_ev", "launch_speed", 1.0),
+)
 
 
-def _splits_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty:
+def _pitch_type_splits(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
         return []
-    df = df.copy()
-    df["is_whiff"] = df["description"].str.contains("swinging_strike", case=False, na=False)
-    df["is_contact"] = df["description"].str.contains("in_play", case=False, na=False)
-    grouped = df.groupby("stand").agg(
-        pitches=("stand", "size"),
-        whiff_rate=("is_whiff", "mean"),
-        contact_rate=("is_contact", "mean"),
-        avg_velo=("release_speed", "mean"),
-        avg_ev=("launch_speed", "mean"),
-    )
-    grouped.reset_index(inplace=True)
-    grouped.rename(columns={"stand": "handedness"}, inplace=True)
-    return grouped.to_dict(orient="records")
-
-
-def _game_log_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df.empty:
+    g = rollup(summary.pitch, ["pitch_type"])
+    n = g["n"].astype(float)
+    total = n.sum()
+    out = pd.DataFrame({
+        "pitch_type": g["pitch_type"],
+        "count": n,
+        "avg_velo": pitch_summary.mean(g, "release_speed"),
+        "avg_spin": pitch_summary.mean(g, "release_spin_rate"),
+        "whiff_rate": g["whiffs"] / n,
+        "csw": g["csw"] / n,
+        "avg_iva": pitch_summary.mean(g, "launch_speed"),
+        "usage": n / total if total else 0.0,
+    })
+    # percentiles come from the merged sketches, never from raw pitches
+    sk = rollup_sketches(summary.sketches, ["pitch_type"]).set_index("pitch_type")
+    for col, measure, q in _SKETCH_STATS:
+        digests = out["pitch_type"].map(sk[measure]) if not sk.empty else pd.Series(None, index=out.index)
+        out[col] = [d.quantile(q) if d is not None and len(d) else np.nan for d in digests]
+    return out.to_dict(orient="records")
+
+
+def _splits_from_statcast(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
         return []
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["game_date"])
-    df["is_whiff"] = df["description"].str.contains("swinging_strike", case=False, na=False)
-    df["is_contact"] = df["description"].str.contains("in_play", case=False, na=False)
-    grouped = df.groupby(["game_pk", "date"]).agg(
-        pitches=("pitch_type", "size"),
-        whiffs=("is_whiff", "sum"),
-        contacts=("is_contact", "sum"),
-        avg_velo=("release_speed", "mean"),
-        avg_launch_speed=("launch_speed", "mean"),
-        avg_launch_angle=("launch_angle", "mean"),
-    ).reset_index()
-    grouped.sort_values("date", inplace=True)
+    g = rollup(summary.pitch, ["stand"])
+    out = pd.DataFrame({
+        "handedness": g["stand"],
+        "pitches": g["n"],
+        "whiff_rate": g["whiffs"] / g["n"],
+        "contact_rate": g["contacts"] / g["n"],
+        "avg_velo": pitch_summary.mean(g, "release_speed"),
+        "avg_ev": pitch_summary.mean(g, "launch_speed"),
+    })
+    return out.to_dict(orient="records")
+
+
+def _game_log_from_statcast(summary: PitchSummary) -> List[Dict[str, Any]]:
+    if summary.empty:
+        return []
+    g = rollup(summary.game, ["game_pk", "game_date"]).sort_values("game_date", kind="stable")
+    velo, ls, la = (pitch_summary.mean(g, m) for m in ("release_speed", "launch_speed", "launch_angle"))
     out: List[Dict[str, Any]] = []
-    for _, row in grouped.iterrows():
+    for i in range(len(g)):
         out.append(
             {
-                "game_pk": int(row["game_pk"]),
-                "date": row["date"].strftime("%Y-%m-%d"),
-                "pitches": int(row["pitches"]),
-                "whiffs": float(row["whiffs"]),
-                "contacts": float(row["contacts"]),
-                "avg_velo": float(row["avg_velo"]),
-                "avg_launch_speed": float(row["avg_launch_speed"]) if not math.isnan(row["avg_launch_speed"]) else None,
-                "avg_launch_angle": float(row["avg_launch_angle"]) if not math.isnan(row["avg_launch_angle"]) else None,
+                "game_pk": int(g["game_pk"].iat[i]),
+                "date": g["game_date"].iat[i],
+                "pitches": int(g["n"].iat[i]),
+                "whiffs": float(g["whiffs"].iat[i]),
+                "contacts": float(g["contacts"].iat[i]),
+                "avg_velo": float(velo.iat[i]),
+                "avg_launch_speed": float(ls.iat[i]) if not math.isnan(ls.iat[i]) else None,
+                "avg_launch_angle": float(la.iat[i]) if not math.isnan(la.iat[i]) else None,
             }
         )
     return out
@@ -1059,96 +1057,180 @@ def _player_graphs(rows: List[SeasonSlice]) -> List[Dict[str, Any]]:
     return out
 
 
+# FanGraphs sections, in payload order; each builds from the season slices
+FG_SECTIONS = {
+    "standard": _standard_section,
+    "advanced": _advanced_section,
+    "statcast": _statcast_section,
+    "batted_ball": _batted_ball_section,
+    "win_prob": _win_prob_section,
+    "pitch_values": _pitch_values_section,
+    "pitch_type_velo": _pitch_type_velo_section,
+    "plate_discipline": _plate_discipline_section,
+    "pitchingbot": _pitchingbot_section,
+    "fielding_pitcher": _fielding_pitcher_section,
+    "value": _value_section,
+    "player_graphs": _player_graphs,
+}
+# Savant sections built from the pitch frame: (builder, reported in meta.missing)
+SAVANT_SECTIONS = {
+    "pitch_type_splits": (_pitch_type_splits, True),
+    "splits": (_splits_from_statcast, True),
+    "pitch_velocity": (_velocity_trend, True),
+    "pitch_type_mix": (_pitch_mix_from_statcast, False),
+    "movement_scatter": (_movement_scatter, False),
+    "velo_trend": (_velocity_trend, False),
+    "game_log": (_game_log_from_statcast, True),
+}
+ALL_SECTIONS = tuple(FG_SECTIONS) + tuple(SAVANT_SECTIONS)
+
+
+def _resolve_sections(sections: Optional[Iterable[str]]) -> List[str]:
+    """Requested section names in payload order; None or empty means all."""
+    wanted = {name.strip() for name in (sections or ()) if name and name.strip()}
+    if not wanted:
+        return list(ALL_SECTIONS)
+    unknown = sorted(wanted.difference(ALL_SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown sections: {', '.join(unknown)}")
+    return [name for name in ALL_SECTIONS if name in wanted]
+
+
+class _StageTimer:
+    """Wall-clock milliseconds per named stage of one build; stages may overlap."""
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self.ms: Dict[str, float] = {}
+
+    async def timed(self, name: str, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.ms[name] = round((time.perf_counter() - start) * 1000.0, 1)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ms[name] = round((time.perf_counter() - start) * 1000.0, 1)
+
+    def finish(self) -> Dict[str, float]:
+        self.ms["total"] = round((time.perf_counter() - self._t0) * 1000.0, 1)
+        return self.ms
+
+
+def _statcast_seasons(rollup: RollupLiteral, year: int, fg_frames: Optional[Iterable[pd.DataFrame]] = None) -> Optional[List[int]]:
+    """Seasons of pitches a rollup needs; None for career until the FanGraphs rows are known."""
+    if rollup == "season":
+        return [year]
+    if rollup == "last3":
+        return [y for y in range(year - 2, year + 1) if y > 1900]
+    if fg_frames is None:
+        return None
+    # career slices carry no season, so read the debut off the per-season rows
+    years = [
+        int(y)
+        for df in fg_frames if not df.empty
+        for y in df.loc[df["type"] == 0, "season_int"].dropna()
+        if int(y) <= year
+    ]
+    return list(range(min(years), year + 1)) if years else []
+
+
+async def _fg_rows(fg_id: int, year: int, span: SpanLiteral) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    df, meta = await _fetch_fg_table(fg_id, year, span)
+    return _split_regular_post(df), meta
+
+
 async def build_pitcher_deep_dive(
     mlbam: int,
     year: int,
     span: SpanLiteral,
     rollup: RollupLiteral,
+    sections: Optional[Iterable[str]] = None,
 ) -> Dict[str, Any]:
     if span not in {"regular", "postseason", "total"}:
         raise HTTPException(status_code=400, detail="invalid span")
     if rollup not in {"season", "last3", "career"}:
         raise HTTPException(status_code=400, detail="invalid rollup")
+    wanted = _resolve_sections(sections)
+    fg_wanted = [name for name in wanted if name in FG_SECTIONS]
+    savant_wanted = [name for name in wanted if name in SAVANT_SECTIONS]
 
-    try:
-        fg_id = _lookup_fg_id(mlbam)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc))
-
-    df_regular = pd.DataFrame()
-    df_post = pd.DataFrame()
-    meta: Dict[str, Any] = {}
-
-    if span in ("regular", "total"):
-        df_regular, meta = await _fetch_fg_table(fg_id, year, "regular")
-        df_regular = _split_regular_post(df_regular)
-    if span in ("postseason", "total"):
-        df_post, meta_post = await _fetch_fg_table(fg_id, year, "postseason")
-        df_post = _split_regular_post(df_post)
-        if not meta:
-            meta = meta_post
+    timer = _StageTimer()
+    tasks: List[asyncio.Task] = []
 
-    slices = _select_rows(df_regular, df_post, span, rollup, year)
-    sections: Dict[str, List[Dict[str, Any]]] = {}
-    missing: Dict[str, bool] = {}
+    def start(name: str, awaitable) -> asyncio.Task:
+        task = asyncio.ensure_future(timer.timed(name, awaitable))
+        tasks.append(task)
+        return task
 
-    def add_section(name: str, builder):
-        try:
-            data = builder(slices)
-            data = _clean_section(data)
-            sections[name] = data
-            missing[name] = len(data) == 0
-        except Exception:
-            sections[name] = []
-            missing[name] = True
-
-    add_section("standard", _standard_section)
-    add_section("advanced", _advanced_section)
-    add_section("statcast", _statcast_section)
-    add_section("batted_ball", _batted_ball_section)
-    add_section("win_prob", _win_prob_section)
-    add_section("pitch_values", _pitch_values_section)
-    add_section("pitch_type_velo", _pitch_type_velo_section)
-    add_section("plate_discipline", _plate_discipline_section)
-    add_section("pitchingbot", _pitchingbot_section)
-    add_section("fielding_pitcher", _fielding_pitcher_section)
-    add_section("value", _value_section)
-    add_section("player_graphs", _player_graphs)
+    # Statcast only needs the MLBAM id, so it starts before anything else when
+    # the seasons are known up front (season / last3 rollups)
+    # pitches are only downloaded when a Savant section was asked for
+    seasons_for_statcast = _statcast_seasons(rollup, year) if savant_wanted else []
+    statcast_task = start("statcast", _fetch_statcast(mlbam, seasons_for_statcast, span)) if seasons_for_statcast else None
 
-    # Savant-driven sections
-    seasons_for_statcast: List[int] = []
-    if rollup == "season":
-        seasons_for_statcast = [year]
-    elif rollup == "last3":
-        seasons_for_statcast = [y for y in range(year - 2, year + 1) if y > 1900]
-    else:
-        if not slices:
-            seasons_for_statcast = []
-        else:
-            years = []
-            for s in slices:
-                if s.season:
-                    years.append(s.season)
-            if years:
-                seasons_for_statcast = list(range(min(years), year + 1))
+    try:
+        try:
+            fg_id = await timer.timed("fg_id", asyncio.to_thread(_lookup_fg_id, mlbam))
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
 
-    statcast_df = await _fetch_statcast(mlbam, seasons_for_statcast, span) if seasons_for_statcast else pd.DataFrame()
+        regular_task = start("fg_regular", _fg_rows(fg_id, year, "regular")) if span in ("regular", "total") else None
+        post_task = start("fg_postseason", _fg_rows(fg_id, year, "postseason")) if span in ("postseason", "total") else None
 
-    sections["pitch_type_splits"] = _pitch_type_splits(statcast_df)
-    missing["pitch_type_splits"] = len(sections["pitch_type_splits"]) == 0
+        df_regular, meta = await regular_task if regular_task else (pd.DataFrame(), {})
+        df_post, meta_post = await post_task if post_task else (pd.DataFrame(), {})
+        if not meta:
+            meta = meta_post
 
-    sections["splits"] = _splits_from_statcast(statcast_df)
-    missing["splits"] = len(sections["splits"]) == 0
+        slices = _select_rows(df_regular, df_post, span, rollup, year)
+        if seasons_for_statcast is None:
+            # career: the first FanGraphs season decides how far back to fetch
+            seasons_for_statcast = _statcast_seasons(rollup, year, (df_regular, df_post))
+            if seasons_for_statcast:
+                statcast_task = start("statcast", _fetch_statcast(mlbam, seasons_for_statcast, span))
 
-    sections["pitch_velocity"] = _velocity_trend(statcast_df)
-    missing["pitch_velocity"] = len(sections["pitch_velocity"]) == 0
+        payload_sections: Dict[str, List[Dict[str, Any]]] = {}
+        missing: Dict[str, bool] = {}
 
-    sections["pitch_type_mix"] = _pitch_mix_from_statcast(statcast_df)
-    sections["movement_scatter"] = _movement_scatter(statcast_df)
-    sections["velo_trend"] = sections["pitch_velocity"]
+        def add_section(name: str, builder):
+            try:
+                data = builder(slices)
+                data = _clean_section(data)
+                payload_sections[name] = data
+                missing[name] = len(data) == 0
+            except Exception:
+                payload_sections[name] = []
+                missing[name] = True
+
+        # FanGraphs sections are built while the pitch download is still running
+        with timer.stage("fangraphs_sections"):
+            for name in fg_wanted:
+                add_section(name, FG_SECTIONS[name])
+
+        statcast_summary = await statcast_task if statcast_task else EMPTY_SUMMARY
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
-    sections["game_log"] = _game_log_from_statcast(statcast_df)
-    missing["game_log"] = len(sections["game_log"]) == 0
+    # Savant-driven sections
+    with timer.stage("savant_sections"):
+        built: Dict[Any, List[Dict[str, Any]]] = {}
+        for name in savant_wanted:
+            builder, tracked = SAVANT_SECTIONS[name]
+            # velo_trend shares pitch_velocity's rows
+            if builder not in built:
+                built[builder] = builder(statcast_summary)
+            payload_sections[name] = built[builder]
+            if tracked:
+                missing[name] = len(built[builder]) == 0
 
     meta_block = {
         "player": {
@@ -1162,7 +1244,9 @@ async def build_pitcher_deep_dive(
             "birthdate": meta.get("BirthDate"),
             "age": meta.get("Age"),
         },
+        "sections": wanted,
         "missing": missing,
+        "timings_ms": timer.finish(),
         "source": {
             "fangraphs": FG_API_BASE,
             "statcast": "statcast_pitcher",
@@ -1170,5 +1254,85 @@ async def build_pitcher_deep_dive(
     }
 
     payload = {"meta": meta_block}
-    payload.update(sections)
+    payload.update(payload_sections)
     return payload
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """A built deep dive as response bytes plus what is needed to revalidate it."""
+
+    body: bytes
+    etag: str
+    immutable: bool
+    built_at: float
+    sources: Tuple[Any, ...]
+
+
+def _sources_stamp(fg_id: int, mlbam: int, year: int, span: SpanLiteral) -> Tuple[Any, ...]:
+    """Versions of the FanGraphs cache entries and Statcast coverage a payload was built from."""
+    kinds = [k for k in ("regular", "postseason") if span in (k, "total")]
+    fg = tuple(_fg_cache.stored_at(_fg_cache_key(FG_API_BASE, _fg_params(fg_id, year, k))) for k in kinds)
+    return fg + (STATCAST_STORE.version("pitcher", mlbam),)
+
+
+def _payload_is_current(entry: EncodedPayload, fg_id: int, mlbam: int, year: int, span: SpanLiteral) -> bool:
+    if entry.immutable:
+        return True
+    if time.time() - entry.built_at >= _fg_cache.ttl:
+        return False
+    return _sources_stamp(fg_id, mlbam, year, span) == entry.sources
+
+
+# encoded payloads; past seasons never change so their entries only leave by LRU
+_payload_cache = TTLCache(
+    ttl_seconds=float("inf"),
+    max_entries=1024,
+    max_bytes=PAYLOAD_CACHE_MAX_BYTES,
+    weigher=lambda entry: len(entry[1].body),
+)
+_payload_flight = SingleFlight()
+
+
+async def pitcher_deep_dive_payload(
+    mlbam: int,
+    year: int,
+    span: SpanLiteral,
+    rollup: RollupLiteral,
+    sections: Optional[Iterable[str]] = None,
+) -> EncodedPayload:
+    """
+    JSON bytes and ETag for a deep dive, rebuilt only when needed.
+
+    Past seasons are built once. Current-season payloads are reused until
+    the FanGraphs TTL passes or the FanGraphs/Statcast data underneath
+    them is refreshed by any request.
+    """
+    key = (int(mlbam), int(year), span, rollup, tuple(_resolve_sections(sections)))
+    cached = await _payload_cache.get(key)
+    if cached is not None:
+        fg_id, entry = cached
+        if _payload_is_current(entry, fg_id, mlbam, year, span):
+            return entry
+        _payload_cache.invalidate(key)
+    return await _payload_flight.do_async(key, lambda: _build_payload(key))
+
+
+async def _build_payload(key: Tuple[Any, ...]) -> EncodedPayload:
+    mlbam, year, span, rollup, sections = key
+    payload = await build_pitcher_deep_dive(mlbam, year, span, rollup, sections=sections)
+    fg_id = payload["meta"]["player"]["fg_id"]
+    encoded = jsonable_encoder(payload)
+    body = JSONResponse(content=encoded).body
+    # a weak ETag: it hashes the content without the per-build timings, so
+    # rebuilds that differ only in timings_ms are equivalent, not byte-identical
+    content = dict(encoded, meta={k: v for k, v in encoded["meta"].items() if k != "timings_ms"})
+    entry = EncodedPayload(
+        body=body,
+        etag=f'W/"{hashlib.sha256(JSONResponse(content=content).body).hexdigest()[:32]}"',
+        immutable=year < dt.date.today().year,
+        built_at=time.time(),
+        sources=_sources_stamp(fg_id, mlbam, year, span),
+    )
+    await _payload_cache.set(key, (fg_id, entry))
+    return entry
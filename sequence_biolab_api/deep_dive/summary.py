@@ -0,0 +1,184 @@
+"""
+Mergeable per-season pitch summaries for the Savant deep dive sections.
+
+Each season of a pitcher's pitches is reduced once to two small tables of
+additive statistics (counts, sums, sums of squares, min/max):
+
+* ``pitch`` – per (season, game_type, pitch_type, stand)
+* ``game``  – per (season, game_type, game_pk, game_date, pitch_type)
+
+plus ``sketches``: a t-digest of velocity and exit velocity per (season,
+game_type, pitch_type), so percentiles and maxima merge the same way.
+
+Any span or rollup is then a concat + groupby-sum of those rows, so career
+sections scale with the number of seasons rather than pitches. Group keys
+keep missing values (``dropna=False``) so that re-grouping on a subset of
+keys sees every pitch, exactly like grouping the raw frame would.
+
+Every table is keyed by ``game_type``, so a finished season is summarized
+once for all game types, persisted via ``to_tables`` and narrowed to a span
+with ``only_game_types``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.analytics.sketch import TDigest, merge_digests
+
+PITCH_KEYS = ["season", "game_type", "pitch_type", "stand"]
+GAME_KEYS = ["season", "game_type", "game_pk", "game_date", "pitch_type"]
+PITCH_MEASURES = ("release_speed", "release_spin_rate", "launch_speed", "pfx_x", "pfx_z")
+GAME_MEASURES = ("release_speed", "launch_speed", "launch_angle")
+SKETCH_KEYS = ["season", "game_type", "pitch_type"]
+SKETCH_MEASURES = ("release_speed", "launch_speed")
+# stored summaries are named by version; bump it when the tables' columns change
+STORED_NAME = "pitch_summary_v1"
+TABLES = ("pitch", "game", "sketches")
+FLAGS = {
+    "whiffs": "swinging_strike",
+    "csw": "called_strike|swinging_strike",
+    "contacts": "in_play",
+}
+
+
+@dataclass(frozen=True)
+class PitchSummary:
+    pitch: pd.DataFrame
+    game: pd.DataFrame
+    sketches: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=SKETCH_KEYS + list(SKETCH_MEASURES)))
+
+    @property
+    def empty(self) -> bool:
+        return self.pitch.empty
+
+
+EMPTY = PitchSummary(pd.DataFrame(columns=PITCH_KEYS), pd.DataFrame(columns=GAME_KEYS))
+
+
+def _digests(frame: pd.DataFrame, keys: Sequence[str], build, dropna: bool) -> pd.DataFrame:
+    rows = []
+    for key, part in frame.groupby(list(keys), dropna=dropna, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        rows.append((*key, *(build(part[m]) for m in SKETCH_MEASURES)))
+    return pd.DataFrame(rows, columns=list(keys) + list(SKETCH_MEASURES))
+
+
+def _sketch_pitches(df: pd.DataFrame) -> pd.DataFrame:
+    cols = {k: df[k] if k in df.columns else pd.Series(None, index=df.index, dtype=object) for k in SKETCH_KEYS}
+    for m in SKETCH_MEASURES:
+        cols[m] = pd.to_numeric(df[m], errors="coerce") if m in df.columns else pd.Series(np.nan, index=df.index)
+    return _digests(pd.DataFrame(cols, index=df.index), SKETCH_KEYS, lambda v: TDigest.from_values(v.to_numpy()), dropna=False)
+
+
+def rollup_sketches(frame: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Merge sketch rows on ``keys``; rows with a missing key are dropped."""
+    return _digests(frame, keys, merge_digests, dropna=True)
+
+
+def _additive(frame: pd.DataFrame, keys: Sequence[str], dropna: bool = False) -> pd.DataFrame:
+    """Group ``frame`` on ``keys`` adding counts/sums and taking min/max of the extremes."""
+    if frame.empty:
+        return frame.reindex(columns=list(frame.columns)).iloc[0:0]
+    stats = [c for c in frame.columns if c not in keys and c not in PITCH_KEYS + GAME_KEYS]
+    lows = [c for c in stats if c.endswith("_min")]
+    highs = [c for c in stats if c.endswith("_max")]
+    sums = [c for c in stats if c not in lows and c not in highs]
+    grouped = frame.groupby(list(keys), dropna=dropna, sort=True)
+    out = pd.concat([grouped[sums].sum(), grouped[lows].min(), grouped[highs].max()], axis=1)
+    return out[stats].reset_index()
+
+
+def _pitch_stats(df: pd.DataFrame, keys: Sequence[str], measures: Iterable[str]) -> pd.DataFrame:
+    cols = {k: df[k] if k in df.columns else pd.Series(None, index=df.index, dtype=object) for k in keys}
+    cols["n"] = np.ones(len(df), dtype=np.int64)
+    for m in measures:
+        v = pd.to_numeric(df[m], errors="coerce") if m in df.columns else pd.Series(np.nan, index=df.index)
+        cols[f"{m}_n"] = v.notna().astype(np.int64)
+        cols[f"{m}_sum"] = v.fillna(0.0)
+        cols[f"{m}_sq"] = v.fillna(0.0) ** 2
+        cols[f"{m}_min"] = v
+        cols[f"{m}_max"] = v
+    desc = df["description"] if "description" in df.columns else pd.Series("", index=df.index)
+    for flag, pattern in FLAGS.items():
+        cols[flag] = desc.str.contains(pattern, case=False, na=False).astype(np.int64)
+    return pd.DataFrame(cols, index=df.index)
+
+
+def summarize_pitches(df: pd.DataFrame) -> PitchSummary:
+    """Reduce raw Statcast pitches (any number of seasons) to summary rows."""
+    if df is None or df.empty:
+        return EMPTY
+    df = df.copy()
+    if "game_year" in df.columns and pd.to_numeric(df["game_year"], errors="coerce").notna().all():
+        df["season"] = pd.to_numeric(df["game_year"]).astype(int)
+    else:
+        df["season"] = pd.to_datetime(df["game_date"]).dt.year
+    df["game_date"] = pd.to_datetime(df["game_date"]).dt.strftime("%Y-%m-%d")
+    return PitchSummary(
+        pitch=_additive(_pitch_stats(df, PITCH_KEYS, PITCH_MEASURES), PITCH_KEYS),
+        game=_additive(_pitch_stats(df, GAME_KEYS, GAME_MEASURES), GAME_KEYS),
+        sketches=_sketch_pitches(df),
+    )
+
+
+def merge_summaries(parts: Iterable[PitchSummary]) -> PitchSummary:
+    """Combine summaries (e.g. one per season) into one."""
+    parts = [p for p in parts if p is not None and not p.empty]
+    if not parts:
+        return EMPTY
+    if len(parts) == 1:
+        return parts[0]
+    return PitchSummary(
+        pitch=_additive(pd.concat([p.pitch for p in parts], ignore_index=True), PITCH_KEYS),
+        game=_additive(pd.concat([p.game for p in parts], ignore_index=True), GAME_KEYS),
+        sketches=_digests(pd.concat([p.sketches for p in parts], ignore_index=True), SKETCH_KEYS, merge_digests, dropna=False),
+    )
+
+
+def only_game_types(summary: PitchSummary, game_types: Sequence[str]) -> PitchSummary:
+    """The rows of ``summary`` for ``game_types``, as if only those pitches had been summarized."""
+    keep = [str(g).upper() for g in game_types]
+    pitch, game, sketches = (
+        f[f["game_type"].isin(keep)].reset_index(drop=True) for f in (summary.pitch, summary.game, summary.sketches)
+    )
+    return PitchSummary(pitch, game, sketches)
+
+
+def to_tables(summary: PitchSummary) -> Dict[str, pd.DataFrame]:
+    """Plain frames for parquet; each sketch becomes its ``TDigest.to_dict`` JSON."""
+    sketches = summary.sketches.copy()
+    for m in SKETCH_MEASURES:
+        sketches[m] = [json.dumps(d.to_dict()) for d in sketches[m]]
+    return {"pitch": summary.pitch, "game": summary.game, "sketches": sketches}
+
+
+def from_tables(tables: Mapping[str, pd.DataFrame]) -> PitchSummary:
+    """Inverse of ``to_tables``."""
+    sketches = tables["sketches"].copy()
+    for m in SKETCH_MEASURES:
+        sketches[m] = [TDigest.from_dict(json.loads(raw)) for raw in sketches[m]]
+    return PitchSummary(tables["pitch"], tables["game"], sketches)
+
+
+def rollup(frame: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Re-group summary rows on ``keys``; rows with a missing key are dropped like a raw groupby."""
+    return _additive(frame, keys, dropna=True)
+
+
+def mean(frame: pd.DataFrame, measure: str) -> pd.Series:
+    n = frame[f"{measure}_n"]
+    return (frame[f"{measure}_sum"] / n.where(n > 0)).astype(float)
+
+
+def std(frame: pd.DataFrame, measure: str) -> pd.Series:
+    """Sample standard deviation from the count, sum and sum of squares."""
+    n = frame[f"{measure}_n"].astype(float)
+    s, sq = frame[f"{measure}_sum"], frame[f"{measure}_sq"]
+    var = (sq - s * s / n.where(n > 0)) / (n - 1).where(n > 1)
+    return np.sqrt(var.clip(lower=0.0))
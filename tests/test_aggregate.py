@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.analytics.aggregate import ROWS, Ratio, aggregate
+
+
+def test_aggregate_matches_groupby_apply() -> None:
+    """Summed indicators divided once equal the per-group Python computation."""
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        "side": rng.choice(["L", "R", None], 500),
+        "H": rng.random(500) < 0.25,
+        "AB": rng.random(500) < 0.85,
+        "BB": rng.random(500) < 0.08,
+        "xw": np.where(rng.random(500) < 0.3, np.nan, rng.random(500)),
+    })
+    obp = Ratio("OBP", {"H": 1, "BB": 1}, {"AB": 1, "BB": 1})
+    out = aggregate(df, ["side"], counts=["H"], ratios=[Ratio("AVG", "H", "AB"), obp], means={"xw": 3})
+
+    ref = df.groupby("side", dropna=False)[["H", "AB", "BB", "xw"]].apply(lambda g: pd.Series({
+        "H": g["H"].sum(),
+        "n": len(g),
+        "AVG": round(g["H"].sum() / g["AB"].sum(), 3),
+        "OBP": round((g["H"].sum() + g["BB"].sum()) / (g["AB"].sum() + g["BB"].sum()), 3),
+        "xw": round(g["xw"].dropna().mean(), 3),
+    })).reset_index()
+    assert out["side"].tolist() == ref["side"].tolist()
+    assert out["H"].tolist() == ref["H"].astype(int).tolist()
+    assert out[ROWS].tolist() == ref["n"].astype(int).tolist()
+    for col in ["AVG", "OBP", "xw"]:
+        np.testing.assert_allclose(out[col].to_numpy(float), ref[col].to_numpy(float))
+
+
+def test_ratio_empty_and_floor() -> None:
+    """Zero denominators yield ``empty``; ``min_den`` floors the divisor."""
+    df = pd.DataFrame({"g": [1, 1, 2], "num": [1, 0, 1], "den": [0, 0, 0]})
+    out = aggregate(df, None, ratios=[
+        Ratio("plain", "num", "den"),
+        Ratio("nan", "num", "den", empty=np.nan),
+        Ratio("floored", "num", "den", min_den=1),
+        Ratio("per_row", "num", ROWS, digits=None),
+    ])
+    row = out.iloc[0]
+    assert row["plain"] == 0.0 and np.isnan(row["nan"])
+    assert row["floored"] == 2.0 and row["per_row"] == 2 / 3
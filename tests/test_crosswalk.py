@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src.crosswalk import Crosswalk, crosswalk_frame, write_crosswalk
+from sequence_biolab_api.deep_dive import pitcher
+
+
+def _register() -> pd.DataFrame:
+    return pd.DataFrame({
+        "name_last": ["Ohtani", "Skenes", "Smith", "Smith", "Nobody"],
+        "name_first": ["Shohei", "Paul", "Will", "Will", "Old"],
+        "key_mlbam": [660271, 694973, 669257, 519293, -1],
+        "key_retro": ["ohtas001", "skenp001", "smitw003", "smitw002", None],
+        "key_bbref": ["ohtansh01", "skenepa01", "smithwi05", "smithwi04", None],
+        "key_fangraphs": [19755, 33677, 24742, 11368, 5],
+        "mlb_played_first": [2018, 2024, 2019, 2012, 1900],
+        "mlb_played_last": [2025, 2025, 2025, 2024, 1901],
+    })
+
+
+def test_roundtrip_lookups(tmp_path) -> None:
+    """mlbam<->fg and name lookups come back from the SQLite file; unknowns are None."""
+    people = pd.DataFrame({
+        "mlbam": [660271, 694973, 669257, 519293],
+        "bats": ["L", "R", "R", "R"],
+        "throws": ["R", "R", "R", "L"],
+        "position": ["TWP", "P", "C", "P"],
+    })
+    frame = crosswalk_frame(_register(), people)
+    assert len(frame) == 4
+    cw = Crosswalk(write_crosswalk(frame, tmp_path / "crosswalk.sqlite"))
+
+    assert cw.fg_for_mlbam(694973) == 33677 and cw.mlbam_for_fg(19755) == 660271
+    assert cw.fg_for_mlbam(1) is None and cw.mlbam_for_fg(5) is None
+    assert cw.player(660271)["bats"] == "L"
+
+    assert [r["mlbam"] for r in cw.by_name("Will Smith")] == [669257, 519293]
+    assert [r["mlbam"] for r in cw.by_name("Smith, Will", pitcher=True)] == [519293]
+    assert [r["mlbam"] for r in cw.by_name("will smith", pitcher=False)] == [669257]
+    assert cw.by_name("Ohtani, Shohei", pitcher=True)[0]["fg"] == 19755
+
+
+def test_missing_file_is_empty(tmp_path) -> None:
+    cw = Crosswalk(tmp_path / "absent.sqlite")
+    assert not cw.available
+    assert cw.fg_for_mlbam(660271) is None and cw.by_name("Shohei Ohtani") == []
+
+
+def test_register_fallback_is_memoized(tmp_path, monkeypatch) -> None:
+    """After a crosswalk miss the register is pulled once per player, found or not."""
+    pulls = []
+
+    def reverse_lookup(ids, key_type):
+        pulls.append(ids[0])
+        fg = {694973: 33677}.get(ids[0])
+        return pd.DataFrame({"key_fangraphs": [fg]}) if fg else pd.DataFrame()
+
+    monkeypatch.setattr(pitcher, "CROSSWALK", Crosswalk(tmp_path / "absent.sqlite"))
+    monkeypatch.setattr(pitcher, "playerid_reverse_lookup", reverse_lookup)
+    pitcher._lookup_fg_id.cache_clear()
+    pitcher._register_fg_id.cache_clear()
+    try:
+        assert pitcher._lookup_fg_id(694973) == pitcher._lookup_fg_id(694973) == 33677
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                pitcher._lookup_fg_id(1)
+        assert pulls == [694973, 1]
+    finally:
+        pitcher._lookup_fg_id.cache_clear()
+        pitcher._register_fg_id.cache_clear()
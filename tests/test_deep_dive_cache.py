@@ -0,0 +1,53 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from sequence_biolab_api.deep_dive.cache import TTLCache
+
+
+def test_ttl_cache_serves_stale_while_refreshing() -> None:
+    """Expired entries inside the stale window return at once and refresh in the background."""
+    cache = TTLCache(ttl_seconds=0.05, stale_seconds=10.0)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return len(loads)
+
+    async def main():
+        first = await asyncio.gather(*[cache.get_or_load("k", loader) for _ in range(4)])
+        await asyncio.sleep(0.06)
+        stale = await cache.get_or_load("k", loader)
+        await asyncio.sleep(0.05)
+        fresh = await cache.get_or_load("k", loader)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(main())
+    assert first == [1, 1, 1, 1]
+    assert stale == 1
+    assert fresh == 2
+    assert cache.stats.misses == 4
+    assert cache.stats.loads == 2
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.refreshes == 1
+
+
+def test_ttl_cache_is_bounded() -> None:
+    """Entry count and byte budget evict least recently used keys."""
+    cache = TTLCache(ttl_seconds=60.0, max_entries=3, max_bytes=10, weigher=len)
+
+    async def main():
+        await cache.set("a", "xxxx")
+        await cache.set("b", "xxxx")
+        assert await cache.get("a") == "xxxx"
+        await cache.set("c", "xxxx")  # 12 bytes > 10: drops b (LRU)
+        return await cache.get("a"), await cache.get("b"), await cache.get("c")
+
+    assert asyncio.run(main()) == ("xxxx", None, "xxxx")
+    assert cache.stats.evictions == 1
+    assert cache.snapshot()["bytes"] == 8
@@ -0,0 +1,149 @@
+import asyncio
+import datetime as dt
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from sequence_biolab_api.deep_dive import pitcher
+
+
+def _patch(monkeypatch, calls, gate=None):
+    """Stub the fetchers; each records its call, then awaits ``gate(kind)`` if one is given."""
+
+    async def fg_table(fg_id, year, span):
+        calls.append(("fg", span))
+        if gate:
+            await gate("fg")
+        df = pd.DataFrame({
+            "type": [0, 0], "season_int": [2022, 2024], "Season": ["2022", "2024"],
+            "AbbLevel": ["MLB", "MLB"], "IP": [150.0, 180.0],
+        })
+        return df, {"FirstName": "Gerrit", "LastName": "Cole"}
+
+    async def statcast(mlbam, seasons, span):
+        calls.append(("statcast", tuple(seasons)))
+        if gate:
+            await gate("statcast")
+        return pitcher.EMPTY_SUMMARY
+
+    monkeypatch.setattr(pitcher, "_lookup_fg_id", lambda mlbam: 13125)
+    monkeypatch.setattr(pitcher, "_fetch_fg_table", fg_table)
+    monkeypatch.setattr(pitcher, "_fetch_statcast", statcast)
+
+
+def test_fetches_overlap_and_are_timed(monkeypatch) -> None:
+    """FG regular, FG postseason and Statcast run together; each stage lands in meta."""
+    calls = []
+
+    async def run():
+        # no fetcher returns until all three are in flight; run serially, this would time out
+        arrived = []
+        everyone = asyncio.Event()
+
+        async def gate(kind):
+            arrived.append(kind)
+            if len(arrived) == 3:
+                everyone.set()
+            await asyncio.wait_for(everyone.wait(), timeout=10)
+
+        _patch(monkeypatch, calls, gate)
+        return await pitcher.build_pitcher_deep_dive(543037, 2024, "total", "last3")
+
+    data = asyncio.run(run())
+    assert set(calls) == {("fg", "regular"), ("fg", "postseason"), ("statcast", (2022, 2023, 2024))}
+    # Statcast needs only the MLBAM id, so it is started first
+    assert calls[0][0] == "statcast"
+    timings = data["meta"]["timings_ms"]
+    for stage in ("fg_id", "fg_regular", "fg_postseason", "statcast", "fangraphs_sections", "savant_sections", "total"):
+        assert stage in timings
+    assert timings["total"] >= timings["statcast"]
+    assert data["meta"]["player"]["name"] == "Gerrit Cole"
+
+
+def test_career_statcast_waits_for_fangraphs_seasons(monkeypatch) -> None:
+    """Career pulls pitches from the first FanGraphs season, after the FG rows arrive."""
+    calls = []
+
+    async def gate(kind):
+        # yield to the loop a few times so an early Statcast start would show up first
+        for _ in range(5):
+            await asyncio.sleep(0)
+        calls.append((kind, "done"))
+
+    _patch(monkeypatch, calls, gate)
+    asyncio.run(pitcher.build_pitcher_deep_dive(543037, 2024, "regular", "career"))
+    assert calls == [("fg", "regular"), ("fg", "done"), ("statcast", (2022, 2023, 2024)), ("statcast", "done")]
+
+
+def test_sections_skip_unrequested_work(monkeypatch) -> None:
+    """Only requested builders run; no Savant section means no pitch download."""
+    calls = []
+    _patch(monkeypatch, calls)
+    data = asyncio.run(pitcher.build_pitcher_deep_dive(543037, 2024, "regular", "career", sections=["standard"]))
+    assert [c[0] for c in calls] == ["fg"]
+    assert set(data) == {"meta", "standard"} and data["meta"]["sections"] == ["standard"]
+    assert "statcast" not in data["meta"]["timings_ms"]
+
+    calls.clear()
+    data = asyncio.run(pitcher.build_pitcher_deep_dive(543037, 2024, "regular", "season", sections=["velo_trend", "value"]))
+    assert [c[0] for c in sorted(calls)] == ["fg", "statcast"]
+    assert list(data) == ["meta", "value", "velo_trend"]
+    assert set(data["meta"]["missing"]) == {"value"}
+
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(pitcher.build_pitcher_deep_dive(543037, 2024, "regular", "season", sections=["standrd"]))
+    assert err.value.status_code == 400
+
+
+def test_payload_cache_etag_and_revalidation(monkeypatch, tmp_path) -> None:
+    """Encoded payloads are reused, answer If-None-Match with 304 and rebuild when sources move."""
+    from fastapi.testclient import TestClient
+
+    from backend.api import server
+    from backend.sequence_src.statcast_store import StatcastStore
+
+    calls = []
+    _patch(monkeypatch, calls)
+    store = StatcastStore(tmp_path)
+    monkeypatch.setattr(pitcher, "STATCAST_STORE", store)
+    monkeypatch.setattr(pitcher, "_payload_cache", pitcher.TTLCache(ttl_seconds=float("inf")))
+    client = TestClient(server.app)
+    url = "/api/deep-dive/pitcher/full?mlbam=543037&year=2024&span=regular&rollup=season&sections=standard"
+
+    first = client.get(url)
+    assert first.status_code == 200 and first.json()["meta"]["sections"] == ["standard"]
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and "immutable" in first.headers["cache-control"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": etag.removeprefix("W/")}).status_code == 304
+    assert client.get(url).content == first.content
+    assert len(calls) == 1
+
+    current = dt.date.today().year
+    live = url.replace("year=2024", f"year={current}")
+    assert client.get(live).headers["cache-control"] == "no-cache"
+    client.get(live)
+    assert len(calls) == 2
+    # a Statcast refresh for this pitcher invalidates the current-season payload
+    store.mark_covered("pitcher", 543037, f"{current - 1}-04-01", f"{current - 1}-04-02")
+    client.get(live)
+    assert len(calls) == 3
+
+
+def test_independent_builds_share_etag(monkeypatch) -> None:
+    """Two builds from the same inputs (e.g. separate workers) agree on the ETag despite their timings."""
+    calls = []
+    _patch(monkeypatch, calls)
+    monkeypatch.setattr(pitcher, "_payload_cache", pitcher.TTLCache(ttl_seconds=float("inf")))
+    key = (543037, 2024, "regular", "season", ("standard",))
+    first = asyncio.run(pitcher._build_payload(key))
+    second = asyncio.run(pitcher._build_payload(key))
+    assert len(calls) == 2
+    assert first.etag == second.etag
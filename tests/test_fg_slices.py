@@ -0,0 +1,139 @@
+import math
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from sequence_biolab_api.deep_dive import pitcher
+
+# 2024 regular season and postseason lines; the expected totals below are worked by hand
+REGULAR_2024 = {
+    "IP": 180.1, "TBF": 740, "G": 30, "GS": 30, "ER": 60, "H": 150, "BB": 40, "IBB": 2, "HBP": 5,
+    "HR": 20, "SO": 200, "Events": 500, "BIP": 470, "Pitches": 2900, "GB": 200, "FB": 150, "LD": 100,
+    "IFFB": 20, "FIP": 3.20, "K%": 0.27, "EV": 88.0, "FBv": 95.0, "WPA": 2.0, "Soft%": 0.2,
+    "pLI": 1.0, "Clutch": 0.5, "xERA": 3.4,
+}
+POST_2024 = {
+    "IP": 10.2, "TBF": 44, "G": 2, "GS": 2, "ER": 4, "H": 9, "BB": 3, "IBB": 0, "HBP": 0,
+    "HR": 1, "SO": 15, "Events": 30, "Pitches": 180, "GB": 14, "FB": 10, "LD": 5,
+    "IFFB": 1, "FIP": 2.90, "K%": 0.34, "EV": 90.0, "FBv": 96.0, "WPA": 0.5, "Soft%": 0.1,
+    "pLI": 1.5, "Clutch": 1.3,
+}
+
+
+def _row(season, row_type, **values):
+    label = f'<a href="/players">{season}</a>' if season else "Total"
+    return {"type": row_type, "aseason": season, "Season": label, "AbbLevel": "MLB", "Team": "NYY", **values}
+
+
+def _frames():
+    regular = [
+        _row(2021, 0, IP=50.0, G=10, ER=20),
+        _row(2022, 0, IP=60.0, G=12, ER=25),
+        _row(2023, 0, IP=1.0, G=1, ER=9),
+        _row(2023, 0, IP=70.0, G=14, ER=30),  # a repeated season keeps its last line
+        _row(2024, 0, **REGULAR_2024),
+        _row(None, -1, IP=361.1, G=86, ER=135),
+    ]
+    post = [_row(2024, 0, **POST_2024), _row(None, -2, IP=10.2, G=2, ER=4)]
+    return pitcher._normalize_fg_data(regular), pitcher._normalize_fg_data(post)
+
+
+def _select(span, rollup, year=2024):
+    df_regular, df_post = _frames()
+    empty = pd.DataFrame()
+    return pitcher._select_rows(
+        df_regular if span != "postseason" else empty,
+        df_post if span != "regular" else empty,
+        span,
+        rollup,
+        year,
+    )
+
+
+def test_normalize_labels_and_seasons() -> None:
+    df_regular, df_post = _frames()
+    assert df_regular["season_label"].tolist() == ["2021", "2022", "2023", "2023", "2024", "Career"]
+    assert df_post["season_label"].tolist() == ["2024", "Postseason"]
+    assert df_post["season_int"].iloc[0] == 2024 and math.isnan(df_post["season_int"].iloc[1])
+    assert pitcher._normalize_fg_data([{"type": 0, "Season": "<b>2019</b>"}])["season_label"].tolist() == ["2019"]
+
+
+@pytest.mark.parametrize(
+    "span, rollup, labels",
+    [
+        ("regular", "season", ["2024"]),
+        ("regular", "last3", ["2022", "2023", "2024"]),
+        ("regular", "career", ["Career"]),
+        ("postseason", "season", ["2024 PS"]),
+        ("postseason", "last3", ["2024 PS"]),
+        ("postseason", "career", ["Career (PS)"]),
+        ("total", "season", ["2024"]),
+        ("total", "last3", ["2022", "2023", "2024"]),
+        ("total", "career", ["Career"]),
+    ],
+)
+def test_slice_labels(span, rollup, labels) -> None:
+    assert [s.label for s in _select(span, rollup)] == labels
+
+
+def test_single_span_lines_and_totals() -> None:
+    """Regular and postseason slices project their own FanGraphs line."""
+    (reg,) = _select("regular", "season")
+    assert reg.values["FIP"] == 3.20 and reg.values["Team"] == "NYY"
+    assert reg.totals["outs"] == 541 and reg.totals["IP"] == 180.1
+    assert pitcher._standard_section([reg])[0]["ERA"] == pytest.approx(60 * 9 / (541 / 3))
+
+    (post,) = _select("postseason", "season")
+    assert post.values["FIP"] == 2.90 and post.totals["outs"] == 32
+
+    last3 = _select("regular", "last3")
+    assert [s.totals["ER"] for s in last3] == [25, 30, 60]
+    (career,) = _select("total", "career")
+    assert career.totals["outs"] == 1084 + 32 and career.totals["IP"] == 372.0
+
+    assert _select("regular", "season", year=2019) == []
+
+
+def test_total_span_merges_by_weighting_basis() -> None:
+    """Regular + postseason combine per column class into one line."""
+    (s,) = _select("total", "season")
+    t, v = s.totals, s.values
+
+    # 180.1 + 10.2 innings = 541 + 32 outs = 191.0
+    assert t["outs"] == 573 and t["IP"] == 191.0 and t["ip_inn"] == 191.0
+    assert t["ER"] == 64 and t["TBF"] == 784 and t["pLI_sum"] == 1.0 * 30 + 1.5 * 2
+    assert v["WPA"] == 2.5
+
+    assert v["FIP"] == pytest.approx((3.20 * 541 + 2.90 * 32) / 573)  # innings
+    assert v["K%"] == pytest.approx((0.27 * 740 + 0.34 * 44) / 784)  # batters faced
+    assert v["EV"] == pytest.approx((88.0 * 500 + 90.0 * 30) / 530)  # batted-ball events
+    assert v["FBv"] == pytest.approx((95.0 * 2900 + 96.0 * 180) / 3080)  # pitches
+    assert v["Clutch"] == pytest.approx((0.5 * 30 + 1.3 * 2) / 32)  # games
+    assert v["xERA"] == 3.4  # only the regular line has it
+
+    # batted-ball rates from the summed counts: GB 214, FB 160, LD 105, IFFB 21
+    assert v["GB%"] == pytest.approx(214 / 500) and v["FB%"] == pytest.approx(160 / 500)
+    assert v["IFFB%"] == pytest.approx(21 / 500)
+    assert v["GB/FB"] == pytest.approx(214 / 160) and v["HR/FB"] == pytest.approx(21 / 160)
+    # contact quality by balls in play, falling back to events where BIP is missing
+    assert v["Soft%"] == pytest.approx((0.2 * 470 + 0.1 * 30) / 500)
+
+    row = pitcher._clean_section(pitcher._standard_section([s]))[0]
+    assert row["ERA"] == pytest.approx(64 * 9 / 191) and row["IP"] == 191.0
+    assert pitcher._value_from_slice(s, "absent") is None
+
+
+def test_total_span_with_one_side_missing() -> None:
+    """A season without a postseason line keeps the regular rates; counts add to zero."""
+    s = _select("total", "last3")[0]
+    assert s.label == "2022" and s.totals["outs"] == 180 and s.values["ER"] == 25
+    assert s.values["WAR"] == 0 and math.isnan(s.values["GB%"])
+
+    sections = {name: pitcher._clean_section(builder(_select("total", "last3"))) for name, builder in pitcher.FG_SECTIONS.items()}
+    assert all([r["season"] for r in rows] == ["2022", "2023", "2024"] for rows in sections.values())
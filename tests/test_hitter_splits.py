@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.api import server
+
+
+def _pitches() -> pd.DataFrame:
+    return pd.DataFrame({
+        "game_pk": [1, 1, 1, 1, 2, 2],
+        "at_bat_number": [1, 1, 2, 3, 1, 1],
+        "pitch_number": [1, 2, 1, 1, 1, 2],
+        "batter": [7] * 6,
+        "pitch_name": ["Slider", "Slider", "Sinker", "Sinker", "Changeup", "Slider"],
+        "events": [None, "double", "walk", "field_out", None, "single"],
+        "balls": [0, 0, 3, 1, 0, 1],
+        "strikes": [0, 1, 2, 1, 0, 0],
+        "zone": [5.0, 5.0, 14.0, 4.0, 1.0, 6.0],
+        "stand": ["R"] * 6,
+        "game_date": ["2023-05-01"] * 6,
+        "game_type": ["R"] * 6,
+    })
+
+
+def test_multi_split_matches_single_split_calls(monkeypatch) -> None:
+    """Every split from the multi endpoint equals its single-split response; one fetch serves all."""
+    calls = []
+    monkeypatch.setattr(server, "fetch_batter_statcast", lambda *a, **k: calls.append(a) or _pitches())
+    monkeypatch.setattr(server, "PA_TABLES", server.PA_TABLES.__class__())
+    client = TestClient(server.app)
+
+    multi = client.get("/hitters/7/splits/multi?season=2023&splits=pitch_family,count,zone,pitch_family*count").json()
+    assert len(calls) == 1
+    for name in ("pitch_family", "count", "zone"):
+        single = client.get(f"/hitters/7/splits?season=2023&split={name}").json()["data"]
+        assert multi["splits"][name] == single
+
+    combo = {(r["pitch_family"], r["balls"]): r for r in multi["splits"]["pitch_family*count"]}
+    assert combo[("slider", 0)]["H"] == 1 and combo[("slider", 1)]["AVG"] == 1.0
+    assert combo[("sinker", 3)]["AB"] == 0 and combo[("sinker", 3)]["AVG"] is None
+    assert len(calls) == 1
+
+    bad = client.get("/hitters/7/splits/multi?season=2023&splits=pitch_family*inning")
+    assert bad.status_code == 400
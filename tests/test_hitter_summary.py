@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src.scrape_savant import _WOBA_CONSTS, summarize_hitter_seasons
+
+
+def _events() -> pd.DataFrame:
+    return pd.DataFrame({
+        "batter": [1, 1, 1, 1, 2, 2, 2],
+        "game_date": ["2022-05-01", "2022-05-02", "2022-05-03", "2017-04-04", "2022-05-01", "2022-05-01", "2022-05-02"],
+        "events": ["single", "walk", "field_out", "home_run", "double", "strikeout", None],
+    })
+
+
+def test_woba_and_wrc_plus_use_season_weights() -> None:
+    """Each season uses its own linear weights; unknown seasons fall back to 2023."""
+    out = summarize_hitter_seasons(_events()[lambda d: d["batter"] == 1]).set_index("season")
+    c = _WOBA_CONSTS[2022]
+    woba = (c["w1B"] + c["wBB"]) / 3
+    assert np.isclose(out.loc[2022, "wOBA"], woba)
+    wrc = (((woba - c["lg_woba"]) / c["scale"]) + c["lgRPA"]) / c["lgRPA"] * 100.0
+    assert np.isclose(out.loc[2022, "wRC+"], wrc)
+    assert np.isclose(out.loc[2017, "wOBA"], _WOBA_CONSTS[2023]["wHR"])
+
+
+def test_many_players_in_one_pass() -> None:
+    """by=['batter'] gives the same lines as summarizing each player alone."""
+    ev = _events()
+    both = summarize_hitter_seasons(ev, by=["batter"])
+    assert list(both.columns[:2]) == ["batter", "season"]
+    for bid in (1, 2):
+        alone = summarize_hitter_seasons(ev[ev["batter"] == bid]).reset_index(drop=True)
+        mine = both[both["batter"] == bid].drop(columns="batter").reset_index(drop=True)
+        pd.testing.assert_frame_equal(alone, mine)
@@ -0,0 +1,179 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.analytics import metrics
+
+
+def _pitches(n: int = 4000, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    desc = np.array(["ball", "called_strike", "swinging_strike", "swinging_strike_blocked", "foul",
+                     "foul_tip", "hit_into_play", "missed_bunt", "blocked_ball", "hit_by_pitch", None], dtype=object)
+    typ = np.array(["B", "S", "X", None], dtype=object)
+    df = pd.DataFrame({
+        "plate_x": rng.normal(0, 0.9, n),
+        "plate_z": rng.normal(2.5, 1.0, n),
+        "sz_bot": rng.normal(1.6, 0.1, n),
+        "sz_top": rng.normal(3.4, 0.1, n),
+        "description": rng.choice(desc, n),
+        "type": rng.choice(typ, n),
+        "launch_speed": rng.normal(92, 8, n),
+        "launch_angle": rng.normal(20, 15, n),
+    })
+    for col in ["plate_x", "plate_z", "sz_bot", "sz_top", "launch_speed", "launch_angle"]:
+        df.loc[rng.random(n) < 0.05, col] = np.nan
+    return df
+
+
+# ---- per-row season_rollup / split_by the vectorized versions replaced (reference) ----
+
+def legacy_season_rollup(events: pd.DataFrame) -> pd.DataFrame:
+    ev = events.copy()
+    ev["in_zone"] = ev.apply(metrics._is_zone, axis=1)
+    ev["is_swing"] = ev.apply(lambda r: metrics._is_swing(r.get("description", ""), r.get("type", "")), axis=1)
+    ev["is_whiff"] = ev["description"].astype(str).apply(metrics._is_whiff)
+    ev["is_bip"] = ev["type"].astype(str).apply(metrics._is_ball_in_play)
+    ev["hard_hit"] = ev["launch_speed"].astype(float) >= 95
+    ev["barrel_like"] = ev.apply(lambda r: metrics._barrel_like(r.get("launch_speed", np.nan), r.get("launch_angle", np.nan)), axis=1)
+    pas = metrics._dedupe_pas(ev)
+    e = pas["events"].fillna("")
+    ab = int((e.isin(list(metrics.AB_EVENTS_INC)) & (~e.isin(list(metrics.AB_EVENTS_EXC)))).sum())
+    h = int(e.isin(list(metrics.HIT_EVENTS)).sum())
+    bb = int(e.isin(list(metrics.BB_EVENTS)).sum())
+    sf = int(e.isin(list(metrics.SF_EVENTS)).sum())
+    hbp = int(e.isin(list(metrics.HBP_EVENTS)).sum())
+    hr = int((e == "home_run").sum())
+    tb = int((e == "single").sum() + (e == "double").sum() * 2 + (e == "triple").sum() * 3 + hr * 4)
+    avg = round(h / ab, 3) if ab > 0 else 0.0
+    slg = round(tb / ab, 3) if ab > 0 else 0.0
+    bip = ev[ev["is_bip"]]
+    swings = ev[ev["is_swing"]]
+    babip_den = ab - swings["is_whiff"].sum() - hr + sf
+    mean = lambda col, d: round(ev[col].dropna().mean(), d) if col in ev else 0.0  # noqa: E731
+    return pd.DataFrame([{
+        "batter": int(events["batter"].iloc[0]),
+        "player_name": str(events["player_name"].iloc[0]),
+        "season": int(events["game_year"].iloc[0]),
+        "PA": len(pas),
+        "AB": ab,
+        "H": h,
+        "AVG": avg,
+        "OBP": round((h + bb + hbp) / (ab + bb + hbp + sf), 3) if (ab + bb + hbp + sf) > 0 else 0.0,
+        "SLG": slg,
+        "ISO": round(slg - avg, 3) if ab > 0 else 0.0,
+        "BABIP": round((h - hr) / babip_den, 3) if babip_den > 0 else 0.0,
+        "EV": mean("launch_speed", 1),
+        "LA": mean("launch_angle", 1),
+        "HardHitPct": round(bip["hard_hit"].sum() / len(bip), 3) if len(bip) > 0 else 0.0,
+        "BarrelPct": round(bip["barrel_like"].sum() / len(bip), 3) if len(bip) > 0 else 0.0,
+        "WhiffSwingPct": round(swings["is_whiff"].sum() / len(swings), 3) if len(swings) > 0 else 0.0,
+        "ChasePct": round(swings[~swings["in_zone"]].shape[0] / len(swings), 3) if len(swings) > 0 else 0.0,
+        "xwOBA": mean("estimated_woba_using_speedangle", 3),
+        "xBA": mean("estimated_ba_using_speedangle", 3),
+        "xSLG": mean("estimated_slg_using_speedangle", 3),
+    }])
+
+
+def legacy_split_by(events: pd.DataFrame, by: list) -> pd.DataFrame:
+    pas = metrics._dedupe_pas(events.copy())
+    e = pas["events"].fillna("")
+    pas["AB"] = e.isin(list(metrics.AB_EVENTS_INC)) & (~e.isin(list(metrics.AB_EVENTS_EXC)))
+    pas["H"] = e.isin(list(metrics.HIT_EVENTS))
+    pas["BB"] = e.isin(list(metrics.BB_EVENTS))
+    pas["SF"] = e.isin(list(metrics.SF_EVENTS))
+    pas["HBP"] = e.isin(list(metrics.HBP_EVENTS))
+    rows = []
+    for key, g in pas.groupby(by, dropna=False):
+        ab, h = g["AB"].sum(), g["H"].sum()
+        on_base, obp_den = h + g["BB"].sum() + g["HBP"].sum(), ab + g["BB"].sum() + g["HBP"].sum() + g["SF"].sum()
+        rows.append({
+            **dict(zip(by, key if isinstance(key, tuple) else (key,))),
+            "batter": int(g["batter"].iloc[0]),
+            "player_name": str(g["player_name"].iloc[0]),
+            "season": int(g["game_year"].iloc[0]),
+            "PA": len(g),
+            "AB": int(ab),
+            "H": int(h),
+            "AVG": round(h / ab, 3) if ab > 0 else 0.0,
+            "OBP": round(on_base / obp_den, 3) if obp_den > 0 else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def _plate_appearances(n_pa: int = 600, seed: int = 3) -> pd.DataFrame:
+    """Pitches grouped into plate appearances, the outcome on each one's last pitch."""
+    rng = np.random.default_rng(seed)
+    outcomes = np.array(["single", "double", "triple", "home_run", "field_out", "strikeout", "walk", "intent_walk",
+                         "hit_by_pitch", "sac_fly", "sac_bunt", "grounded_into_double_play", "field_error", None], dtype=object)
+    per_pa = rng.integers(1, 7, n_pa)
+    pa = np.repeat(np.arange(n_pa), per_pa)
+    df = _pitches(len(pa), seed).assign(
+        game_pk=pa // 40,
+        at_bat_number=pa % 40 + 1,
+        pitch_number=np.concatenate([np.arange(1, k + 1) for k in per_pa]),
+        batter=7,
+        player_name="Test, Player",
+        game_year=2024,
+        stand=rng.choice(["L", "R"], n_pa)[pa],
+        p_throws=rng.choice(["L", "R"], n_pa)[pa],
+        estimated_woba_using_speedangle=rng.uniform(0, 1.5, len(pa)),
+        estimated_ba_using_speedangle=rng.uniform(0, 1, len(pa)),
+        estimated_slg_using_speedangle=rng.uniform(0, 3, len(pa)),
+    )
+    last = np.r_[pa[1:] != pa[:-1], True]
+    df["events"] = np.where(last, rng.choice(outcomes, len(pa)), None)
+    # shuffled, so the rollups have to order pitches themselves
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_masks_match_row_helpers() -> None:
+    """Vectorized masks agree with the per-row classifiers on every pitch."""
+    ev = _pitches()
+    legacy = {
+        "zone": ev.apply(metrics._is_zone, axis=1),
+        "swing": ev.apply(lambda r: metrics._is_swing(r.get("description", ""), r.get("type", "")), axis=1),
+        "whiff": ev["description"].astype(str).apply(metrics._is_whiff),
+        "bip": ev["type"].astype(str).apply(metrics._is_ball_in_play),
+        "barrel": ev.apply(lambda r: metrics._barrel_like(r.get("launch_speed", np.nan), r.get("launch_angle", np.nan)), axis=1),
+    }
+    vectorized = {
+        "zone": metrics.zone_mask(ev),
+        "swing": metrics.swing_mask(ev),
+        "whiff": metrics.whiff_mask(ev),
+        "bip": metrics.bip_mask(ev),
+        "barrel": metrics.barrel_mask(ev),
+    }
+    for name, expected in legacy.items():
+        assert vectorized[name].tolist() == expected.astype(bool).tolist(), name
+        assert vectorized[name].dtype == bool
+
+
+def test_masks_handle_missing_columns() -> None:
+    """Absent strike-zone columns classify as out of zone, like row.get()."""
+    ev = _pitches(50).drop(columns=["sz_bot", "sz_top"])
+    assert not metrics.zone_mask(ev).any()
+    assert metrics.zone_mask(ev.iloc[:0]).shape == (0,)
+
+
+def test_rollups_match_legacy_per_row_output() -> None:
+    """season_rollup and split_by reproduce the per-row versions; only split_by's SLG changed (it was 0.0)."""
+    ev = _plate_appearances()
+    new, old = metrics.season_rollup(ev).iloc[0], legacy_season_rollup(ev).iloc[0]
+    for col in old.index:
+        assert new[col] == pytest.approx(old[col], abs=1e-12), col
+
+    for by in (["stand"], ["stand", "p_throws"]):
+        new, old = metrics.split_by(ev, by), legacy_split_by(ev, by)
+        assert list(new.columns) == by + ["batter", "player_name", "season", "PA", "AB", "H", "AVG", "OBP", "SLG"]
+        pd.testing.assert_frame_equal(new[list(old.columns)], old, check_dtype=False)
+
+    # the disclosed change: SLG is total bases per at-bat, as in season_rollup
+    (slg,) = metrics.split_by(ev.assign(all=1), ["all"])["SLG"]
+    assert slg == metrics.season_rollup(ev)["SLG"].iloc[0]
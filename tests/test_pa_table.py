@@ -0,0 +1,69 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.analytics.pa_table import FrameCache, build_pa_table, pa_rows
+
+
+def _pitches() -> pd.DataFrame:
+    return pd.DataFrame({
+        "game_pk": [2, 1, 1, 1, 2],
+        "at_bat_number": [1, 1, 1, 2, 1],
+        "pitch_number": [1, 2, 1, 1, 2],
+        "batter": [7, 7, 7, 7, 7],
+        "pitch_name": ["Slider", "4-Seam Fastball", "Sweeper", "Eephus", "Changeup"],
+        "events": [None, "single", None, "walk", "strikeout"],
+    })
+
+
+def test_pa_table_matches_last_pitch_per_pa() -> None:
+    """Flagged rows equal sort + drop_duplicates(keep='last'), families mapped."""
+    raw = _pitches()
+    table = build_pa_table(raw)
+    expected = (
+        raw.sort_values(["game_pk", "at_bat_number", "pitch_number"])
+           .drop_duplicates(["game_pk", "at_bat_number", "batter"], keep="last")
+    )
+    assert pa_rows(table)["events"].tolist() == expected["events"].tolist()
+    assert pa_rows(table)["events"].tolist() == ["single", "walk", "strikeout"]
+    assert table["pitch_family"].tolist() == ["slider", "fastball", "unknown", "slider", "changeup"]
+    assert build_pa_table(pd.DataFrame()).empty
+
+
+def test_frame_cache_builds_once_and_respects_budget() -> None:
+    """Concurrent misses share one build; the byte budget evicts LRU frames."""
+    frame = build_pa_table(_pitches())
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    cache = FrameCache(max_bytes=size * 2)
+    builds = []
+    gate = threading.Event()
+
+    def builder() -> pd.DataFrame:
+        builds.append(1)
+        gate.wait(1.0)
+        return frame
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(cache.get_or_build, "a", builder) for _ in range(6)]
+        time.sleep(0.05)
+        gate.set()
+        assert all(f.result() is frame for f in futures)
+    assert len(builds) == 1
+
+    cache.get_or_build("b", lambda: frame)
+    cache.get("a")
+    cache.get_or_build("c", lambda: frame)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert cache.get("b") is None and cache.get("a") is frame
+
+    cache.put("live", frame, ttl=-1)
+    assert cache.get("live") is None
@@ -0,0 +1,248 @@
+import math
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from sequence_biolab_api.deep_dive import pitcher, summary as pitch_summary
+from sequence_biolab_api.deep_dive.summary import merge_summaries, summarize_pitches
+
+
+# ---- raw-pitch implementations the summaries replaced (reference) ----
+
+def legacy_pitch_mix_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    counts = df.groupby("pitch_type").size().rename("count")
+    total = counts.sum()
+    velo = df.groupby("pitch_type")["release_speed"].mean().rename("v_avg")
+    whiff = (
+        df.assign(is_whiff=df["description"].str.contains("swinging_strike", case=False, na=False))
+        .groupby("pitch_type")["is_whiff"]
+        .mean()
+        .rename("whiff_rate")
+    )
+    out: List[Dict[str, Any]] = []
+    for pitch in counts.index:
+        out.append(
+            {
+                "pitch_type": pitch,
+                "usage_pct": (counts[pitch] / total) if total else 0.0,
+                "avg_velo": float(velo.get(pitch, np.nan)),
+                "whiff_rate": float(whiff.get(pitch, np.nan)),
+                "count": int(counts[pitch]),
+            }
+        )
+    out.sort(key=lambda r: r["usage_pct"], reverse=True)
+    return out
+
+
+def legacy_movement_scatter(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    grouped = df.groupby("pitch_type").agg(
+        horz=("pfx_x", "mean"),
+        vert=("pfx_z", "mean"),
+        vel=("release_speed", "mean"),
+        count=("pitch_type", "size"),
+    )
+    out: List[Dict[str, Any]] = []
+    for pitch, row in grouped.iterrows():
+        out.append(
+            {
+                "pitch_type": pitch,
+                "horz": float(row["horz"]),
+                "vert": float(row["vert"]),
+                "velo": float(row["vel"]),
+                "count": int(row["count"]),
+            }
+        )
+    return out
+
+
+def legacy_velocity_trend(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty or "game_date" not in df.columns:
+        return []
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["game_date"])
+    grouped = df.groupby(["date", "pitch_type"])["release_speed"].mean().reset_index()
+    grouped.sort_values("date", inplace=True)
+    out: List[Dict[str, Any]] = []
+    for _, row in grouped.iterrows():
+        out.append(
+            {
+                "date": row["date"].strftime("%Y-%m-%d"),
+                "pitch_type": row["pitch_type"],
+                "velo": float(row["release_speed"]),
+            }
+        )
+    return out
+
+
+def legacy_pitch_type_splits(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    grouped = df.groupby("pitch_type").agg(
+        count=("pitch_type", "size"),
+        avg_velo=("release_speed", "mean"),
+        avg_spin=("release_spin_rate", "mean"),
+        whiff_rate=("description", lambda x: np.mean(x.str.contains("swinging_strike", case=False, na=False))),
+        csw=("description", lambda x: np.mean(x.str.contains("called_strike|swinging_strike", case=False, na=False))),
+        avg_iva=("launch_speed", "mean"),
+    )
+    total = grouped["count"].sum()
+    grouped["usage"] = grouped["count"] / total if total else 0.0
+    grouped.reset_index(inplace=True)
+    grouped.rename(columns={"pitch_type": "pitch_type"}, inplace=True)
+    for col in grouped.columns:
+        if col != "pitch_type":
+            grouped[col] = grouped[col].astype(float, errors="ignore")
+    return grouped.to_dict(orient="records")
+
+
+def legacy_splits_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    df = df.copy()
+    df["is_whiff"] = df["description"].str.contains("swinging_strike", case=False, na=False)
+    df["is_contact"] = df["description"].str.contains("in_play", case=False, na=False)
+    grouped = df.groupby("stand").agg(
+        pitches=("stand", "size"),
+        whiff_rate=("is_whiff", "mean"),
+        contact_rate=("is_contact", "mean"),
+        avg_velo=("release_speed", "mean"),
+        avg_ev=("launch_speed", "mean"),
+    )
+    grouped.reset_index(inplace=True)
+    grouped.rename(columns={"stand": "handedness"}, inplace=True)
+    return grouped.to_dict(orient="records")
+
+
+def legacy_game_log_from_statcast(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if df.empty:
+        return []
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["game_date"])
+    df["is_whiff"] = df["description"].str.contains("swinging_strike", case=False, na=False)
+    df["is_contact"] = df["description"].str.contains("in_play", case=False, na=False)
+    grouped = df.groupby(["game_pk", "date"]).agg(
+        pitches=("pitch_type", "size"),
+        whiffs=("is_whiff", "sum"),
+        contacts=("is_contact", "sum"),
+        avg_velo=("release_speed", "mean"),
+        avg_launch_speed=("launch_speed", "mean"),
+        avg_launch_angle=("launch_angle", "mean"),
+    ).reset_index()
+    grouped.sort_values("date", inplace=True)
+    out: List[Dict[str, Any]] = []
+    for _, row in grouped.iterrows():
+        out.append(
+            {
+                "game_pk": int(row["game_pk"]),
+                "date": row["date"].strftime("%Y-%m-%d"),
+                "pitches": int(row["pitches"]),
+                "whiffs": float(row["whiffs"]),
+                "contacts": float(row["contacts"]),
+                "avg_velo": float(row["avg_velo"]),
+                "avg_launch_speed": float(row["avg_launch_speed"]) if not math.isnan(row["avg_launch_speed"]) else None,
+                "avg_launch_angle": float(row["avg_launch_angle"]) if not math.isnan(row["avg_launch_angle"]) else None,
+            }
+        )
+    return out
+
+
+def _pitches(seed: int = 5, n: int = 4000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    season = rng.choice([2022, 2023, 2024], n)
+    day = rng.integers(0, 60, n)
+    dates = pd.to_datetime(season.astype(str) + "-04-01") + pd.to_timedelta(day, unit="D")
+    nan = lambda p: rng.random(n) < p  # noqa: E731
+    return pd.DataFrame({
+        "game_pk": season * 1000 + day,
+        "game_date": dates.strftime("%Y-%m-%d"),
+        "game_year": season,
+        "game_type": np.where(nan(0.1), "D", "R"),
+        "pitch_type": np.where(nan(0.02), None, rng.choice(["FF", "SL", "CH", "KC"], n)).astype(object),
+        "stand": np.where(nan(0.01), None, rng.choice(["L", "R"], n)).astype(object),
+        "release_speed": np.where(nan(0.03), np.nan, rng.normal(92, 4, n)),
+        "release_spin_rate": np.where(nan(0.05), np.nan, rng.normal(2300, 200, n)),
+        "pfx_x": rng.normal(0, 0.8, n),
+        "pfx_z": rng.normal(1, 0.5, n),
+        "launch_speed": np.where(nan(0.8), np.nan, rng.normal(88, 10, n)),
+        "launch_angle": np.where(nan(0.8), np.nan, rng.normal(12, 20, n)),
+        "description": rng.choice(["ball", "called_strike", "swinging_strike", "foul", "hit_into_play", None], n),
+    })
+
+
+def _same(new: List[Dict[str, Any]], old: List[Dict[str, Any]], key=None) -> None:
+    if key:
+        new, old = sorted(new, key=key), sorted(old, key=key)
+    assert len(new) == len(old)
+    for a, b in zip(new, old):
+        for k, v in b.items():
+            if isinstance(v, float) and (v is None or math.isnan(v)):
+                assert a[k] is None or math.isnan(a[k]), k
+            elif isinstance(v, (float, np.floating)):
+                assert np.isclose(a[k], v), (k, a[k], v)
+            else:
+                assert a[k] == v, (k, a[k], v)
+
+
+def test_merged_season_summaries_match_raw_sections() -> None:
+    """Merging per-season summaries gives the sections the raw concat used to."""
+    df = _pitches()
+    merged = merge_summaries(summarize_pitches(part) for _, part in df.groupby("game_year"))
+    assert len(merged.pitch) < 100
+
+    _same(pitcher._pitch_mix_from_statcast(merged), legacy_pitch_mix_from_statcast(df))
+    _same(pitcher._movement_scatter(merged), legacy_movement_scatter(df))
+    # the raw version re-sorted by date with an unstable sort; compare per (date, pitch_type)
+    _same(pitcher._velocity_trend(merged), legacy_velocity_trend(df), key=lambda r: (r["date"], r["pitch_type"]))
+    _same(pitcher._pitch_type_splits(merged), legacy_pitch_type_splits(df))
+    _same(pitcher._splits_from_statcast(merged), legacy_splits_from_statcast(df))
+    _same(pitcher._game_log_from_statcast(merged), legacy_game_log_from_statcast(df), key=lambda r: r["game_pk"])
+
+
+def test_extremes_and_spread_merge() -> None:
+    """Min/max and the sum-of-squares spread survive merging."""
+    df = _pitches(seed=9, n=500)
+    merged = merge_summaries(summarize_pitches(part) for _, part in df.groupby("game_year"))
+    mix = {r["pitch_type"]: r for r in pitcher._pitch_mix_from_statcast(merged)}
+    ff = df.loc[df["pitch_type"] == "FF", "release_speed"]
+    assert mix["FF"]["max_velo"] == ff.max()
+    assert np.isclose(mix["FF"]["velo_sd"], ff.std())
+    assert pitcher._pitch_mix_from_statcast(summarize_pitches(df.iloc[0:0])) == []
+
+
+def test_sketch_percentiles_across_seasons_and_game_types() -> None:
+    """p50/p90/max velocity and EV come from merged per-season sketches."""
+    df = _pitches(seed=3)
+    merged = merge_summaries(summarize_pitches(part) for _, part in df.groupby(["game_year", "game_type"]))
+    rows = {r["pitch_type"]: r for r in pitcher._pitch_type_splits(merged)}
+    for pitch, part in df.groupby("pitch_type"):
+        velo, ev = part["release_speed"].dropna(), part["launch_speed"].dropna()
+        assert rows[pitch]["max_velo"] == velo.max() and rows[pitch]["max_ev"] == ev.max()
+        assert abs(rows[pitch]["velo_p90"] - velo.quantile(0.9)) < 0.3
+        assert abs(rows[pitch]["ev_p50"] - ev.quantile(0.5)) < 1.0
+
+
+def test_stored_tables_round_trip_sketches(tmp_path: Path) -> None:
+    """Sketches survive the parquet tables the store persists, empty digests included."""
+    df = _pitches(seed=4, n=800)
+    df.loc[df["pitch_type"] == "KC", "launch_speed"] = np.nan
+    summary = summarize_pitches(df)
+    for name, frame in pitch_summary.to_tables(summary).items():
+        frame.to_parquet(tmp_path / f"{name}.parquet")
+    again = pitch_summary.from_tables({name: pd.read_parquet(tmp_path / f"{name}.parquet") for name in pitch_summary.TABLES})
+
+    for m in pitch_summary.SKETCH_MEASURES:
+        for a, b in zip(again.sketches[m], summary.sketches[m]):
+            assert np.array_equal(a.means, b.means) and np.array_equal(a.weights, b.weights)
+            assert np.array_equal([a.min, a.max], [b.min, b.max], equal_nan=True)
+    _same(pitcher._pitch_type_splits(again), pitcher._pitch_type_splits(summary))
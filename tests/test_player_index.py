@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.api.player_index import PeopleCache, PlayerSearchIndex
+from backend.sequence_src.crosswalk import Crosswalk, crosswalk_frame, write_crosswalk
+
+
+def _write(path: Path, rows) -> None:
+    pd.DataFrame(rows, columns=["batter", "player_name", "season"]).to_csv(path, index=False)
+
+
+def test_ranking_tiers_and_accents(tmp_path) -> None:
+    """Exact (or swapped) names first, then all-token, then any-token matches."""
+    csv = tmp_path / "hitters_season.csv"
+    _write(csv, [
+        (1, "Alonso, Pete", 2023), (1, "Alonso, Pete", 2024),
+        (2, "Ramírez, José", 2024), (3, "Ramirez, Harold", 2024),
+        (4, "Peterson, Jace", 2024), (5, "Alonso, Yonder", 2019),
+    ])
+    index = PlayerSearchIndex(csv)
+
+    assert [p["id"] for p in index.search("pete alonso")] == [1, 5, 4]
+    assert index.search("Jose Ramirez")[0] == {"id": 2, "name": "Ramírez, José"}
+    assert [p["id"] for p in index.search("rami")] == [3, 2]
+    assert index.search("zzz") == [] and index.search("  ") == []
+
+    tuple_ranked = index.search("alonso pete", rank="tuple")
+    assert tuple_ranked[0]["id"] == 1 and {p["id"] for p in tuple_ranked} == {1, 4, 5}
+
+
+def test_rebuilds_when_file_changes(tmp_path) -> None:
+    """A new mtime triggers one rebuild; unchanged files are not re-read."""
+    csv = tmp_path / "hitters_season.csv"
+    _write(csv, [(1, "Alonso, Pete", 2024)])
+    index = PlayerSearchIndex(csv)
+    assert len(index) == 1 and not index.refresh()
+
+    _write(csv, [(1, "Alonso, Pete", 2024), (9, "Soto, Juan", 2024)])
+    stamp = time.time() + 5
+    os.utime(csv, (stamp, stamp))
+    assert index.search("soto") == [{"id": 9, "name": "Soto, Juan"}]
+    assert len(index) == 2
+
+    missing = PlayerSearchIndex(tmp_path / "absent.csv")
+    assert missing.search("soto") == []
+
+
+def test_typos_and_people_cache(tmp_path) -> None:
+    """Misspellings resolve through trigrams; cached remote people join the index with roles."""
+    csv = tmp_path / "hitters_season.csv"
+    _write(csv, [(660271, "Ohtani, Shohei", 2024), (592450, "Judge, Aaron", 2024), (3, "Ramirez, Harold", 2024)])
+    people = PeopleCache(tmp_path / "people.json")
+    index = PlayerSearchIndex(csv, people=people)
+
+    assert index.search("Ohtnai")[0]["id"] == 660271
+    assert index.search("shohei ohtnai")[0]["id"] == 660271
+    assert index.search("aaron jugde")[0]["id"] == 592450
+    assert index.search("Ohtnai", fuzzy=False) == [] and index.search("xqzvw") == []
+
+    assert people.lookup("Skenes") is None
+    people.record("skenes", [{"id": 694973, "name": "Skenes, Paul", "role": "pitcher"},
+                             {"id": 660271, "name": "Ohtani, Shohei", "role": "two-way"}])
+    stamp = time.time() + 5
+    os.utime(people.path, (stamp, stamp))
+    assert [p["id"] for p in PeopleCache(people.path).lookup("SKENES")] == [694973, 660271]
+
+    assert index.search("paul sknees")[0] == {"id": 694973, "name": "Skenes, Paul"}
+    assert {p["id"] for p in index.search("s", role="pitcher")} == {694973, 660271}
+    assert index.search("judge", role="pitcher") == []
+
+
+def test_crosswalk_players_are_searchable(tmp_path) -> None:
+    """Pitchers missing from the hitters table are found through the crosswalk, filtered by position."""
+    csv = tmp_path / "hitters_season.csv"
+    _write(csv, [(592450, "Judge, Aaron", 2024), (669257, "Smith, Will", 2024)])
+    register = pd.DataFrame({
+        "name_last": ["Skenes", "Smith", "Smith", "Judge", "Ryan"],
+        "name_first": ["Paul", "Will", "Will", "Aaron", "Nolan"],
+        "key_mlbam": [694973, 669257, 519293, 592450, 121578],
+        "key_fangraphs": [33677, 24742, 11368, 15640, 1006],
+    })
+    people = pd.DataFrame({"mlbam": [694973, 669257, 519293], "position": ["P", "C", "P"]})
+    crosswalk = Crosswalk(write_crosswalk(crosswalk_frame(register, people), tmp_path / "crosswalk.sqlite"))
+    index = PlayerSearchIndex(csv, crosswalk=crosswalk)
+
+    assert index.search("skenes", role="pitcher") == [{"id": 694973, "name": "Skenes, Paul"}]
+    assert [p["id"] for p in index.search("will smith", role="pitcher")] == [519293]
+    assert [p["id"] for p in index.search("will smith", role="hitter")] == [669257]
+    # no position in the crosswalk: the hitters table's role stands, and unknowns match any filter
+    assert index.search("judge", role="pitcher") == []
+    assert index.search("nolan ryan", role="pitcher") == index.search("nolan ryan", role="hitter") == [{"id": 121578, "name": "Ryan, Nolan"}]
+    assert index.search("paul sknees")[0]["id"] == 694973
@@ -0,0 +1,44 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src.ratelimit import HostRateLimiter, TokenBucket
+
+
+def test_token_bucket_spaces_concurrent_waiters_fifo() -> None:
+    """Concurrent callers are admitted one token at a time, in arrival order."""
+    bucket = TokenBucket(rate=50.0, burst=2.0)
+    order = []
+
+    async def caller(i: int) -> None:
+        await bucket.acquire()
+        order.append((i, time.monotonic()))
+
+    async def main() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*[caller(i) for i in range(8)])
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(main())
+    assert [i for i, _ in order] == list(range(8))
+    # burst of 2 is free, the remaining 6 need 1/50s each
+    assert elapsed >= 6 / 50.0 * 0.9
+    assert bucket.stats.acquired == 8
+    assert bucket.stats.max_queue_depth >= 5
+    assert bucket.stats.queue_depth == 0
+
+
+def test_host_limiter_separates_hosts() -> None:
+    """Each host gets its own configured bucket."""
+    limiter = HostRateLimiter(limits={"www.fangraphs.com": (2.0, 5.0)}, default_rate=7.0, default_burst=3.0)
+    fg = limiter.bucket("https://www.fangraphs.com/api/players/stats")
+    assert fg is limiter.bucket("https://www.fangraphs.com/other")
+    assert (fg.rate, fg.burst) == (2.0, 5.0)
+    savant = limiter.bucket("https://baseballsavant.mlb.com/statcast_search/csv")
+    assert (savant.rate, savant.burst) == (7.0, 3.0)
+    assert set(limiter.stats()) == {"www.fangraphs.com", "baseballsavant.mlb.com"}
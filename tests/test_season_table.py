@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.api.server import _last_pitch_per_PA, _season_table
+from scripts.bench_season_table import synthetic_pitches
+
+
+def _normalize_season_counts(events: pd.Series) -> pd.Series:
+    # Count AB as PAs that are official at-bats (exclude BB, HBP, IBB, catcher interference, sacrifices)
+    if events.empty:
+        return pd.Series({"AB":0, "H":0})
+    ev = events.fillna("")
+    hits = ev.isin(["single","double","triple","home_run"]).sum()
+    non_ab = ev.isin(["walk","intent_walk","hit_by_pitch","catcher_interf","sac_bunt","sac_fly"]).sum()
+    ab = len(ev) - non_ab
+    return pd.Series({"AB": int(ab), "H": int(hits)})
+
+
+def _legacy_season_table(df: pd.DataFrame) -> pd.DataFrame:
+    # row-wise implementation the vectorized table replaced
+    df = df.copy()
+    df["season"] = pd.to_datetime(df["game_date"]).dt.year
+    pa = _last_pitch_per_PA(df)
+    out = pa.groupby(["batter","player_name","season"], dropna=False).agg(
+        PA=("pitch_number","count"),
+        AB=("events", lambda s: _normalize_season_counts(s)["AB"]),
+        H=("events", lambda s: _normalize_season_counts(s)["H"]),
+    ).reset_index()
+    out["AVG"] = (out["H"] / out["AB"].replace(0, np.nan)).round(3)
+
+    def _row_obp(r):
+        sel = (pa["batter"]==r["batter"]) & (pd.to_datetime(pa["game_date"]).dt.year==r["season"])
+        ev = pa.loc[sel, "events"]
+        w, hb = ev.isin(["walk","intent_walk"]).sum(), ev.eq("hit_by_pitch").sum()
+        return round((r["H"] + w + hb) / r["PA"], 3) if r["PA"] else 0.0
+
+    def _row_slg(r):
+        sel = (pa["batter"]==r["batter"]) & (pd.to_datetime(pa["game_date"]).dt.year==r["season"])
+        tb = sum({"single":1, "double":2, "triple":3, "home_run":4}.get(x, 0) for x in pa.loc[sel, "events"].fillna(""))
+        return round(tb / r["AB"], 3) if r["AB"] else 0.0
+
+    out["OBP"] = out.apply(_row_obp, axis=1)
+    out["SLG"] = out.apply(_row_slg, axis=1)
+    return out
+
+
+def test_season_table_matches_row_wise_version() -> None:
+    """Vectorized aggregation reproduces the per-row OBP/SLG implementation."""
+    df = synthetic_pitches(20_000, 40, seed=3)
+    new = _season_table(df)
+    old = _legacy_season_table(df)
+    assert len(new) == len(old) == 40
+    for col in ["batter","season","PA","AB","H"]:
+        assert new[col].tolist() == old[col].astype(int).tolist()
+    for col in ["AVG","OBP","SLG"]:
+        np.testing.assert_allclose(new[col].to_numpy(float), old[col].to_numpy(float), atol=1e-9)
+    assert (new["TB"] >= new["H"]).all()
+    assert list(_season_table(pd.DataFrame()).columns) == list(new.columns)
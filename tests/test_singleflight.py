@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src.singleflight import SingleFlight
+
+
+def test_threaded_callers_share_one_call() -> None:
+    """A burst of identical sync calls runs the function once."""
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def slow() -> int:
+        calls.append(1)
+        gate.wait(1.0)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "k", slow) for _ in range(8)]
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "shared": 7, "inflight": 0}
+
+
+def test_async_callers_share_one_call_and_error() -> None:
+    """Coroutines awaiting the same key get the same result or exception."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "payload"
+
+    async def boom() -> str:
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def main():
+        ok = await asyncio.gather(*[flight.do_async("a", fetch) for _ in range(5)])
+        bad = await asyncio.gather(*[flight.do_async("b", boom) for _ in range(3)], return_exceptions=True)
+        return ok, bad
+
+    ok, bad = asyncio.run(main())
+    assert ok == ["payload"] * 5
+    assert len(calls) == 1
+    assert all(isinstance(e, ValueError) for e in bad)
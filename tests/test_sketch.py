@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.analytics.sketch import TDigest, merge_digests
+
+
+def test_quantiles_are_close_and_bounded() -> None:
+    """Quantiles track the exact ones; the digest stays small and keeps exact extremes."""
+    v = np.random.default_rng(0).normal(92, 3, 50_000)
+    d = TDigest.from_values(np.r_[v, np.nan])
+    assert d.count == len(v) and len(d) <= 100
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert abs(d.quantile(q) - np.quantile(v, q)) < 0.1
+    assert d.quantile(0) == v.min() and d.quantile(1) == v.max()
+    assert [TDigest.from_values([1, 2, 3, 4]).quantile(q) for q in (0, 0.5, 1)] == [1.0, 2.5, 4.0]
+    assert np.isnan(TDigest.from_values([]).quantile(0.5))
+
+
+def test_merge_and_roundtrip() -> None:
+    """Merging per-part digests approximates the whole; dict round-trips exactly."""
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(mu, 2, 3000) for mu in (90, 92, 95)]
+    merged = merge_digests(TDigest.from_values(p) for p in parts)
+    whole = np.concatenate(parts)
+    assert merged.count == len(whole) and merged.max == whole.max()
+    for q in (0.1, 0.5, 0.9):
+        assert abs(merged.quantile(q) - np.quantile(whole, q)) < 0.15
+    again = TDigest.from_dict(merged.to_dict())
+    assert again.quantile(0.9) == merged.quantile(0.9) and again.min == merged.min
+    assert merge_digests([]).count == 0
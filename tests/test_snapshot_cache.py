@@ -0,0 +1,47 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src.snapshot_cache import SnapshotCache
+
+
+def test_snapshot_cache_roundtrip_and_ttl(tmp_path: Path) -> None:
+    """Entries are keyed on url + params and expire after their TTL."""
+    cache = SnapshotCache(tmp_path)
+    url = "https://example.test/api"
+    assert cache.get(url, {"a": 1}) is None
+
+    cache.put(url, {"a": 1}, b"payload")
+    cache.put(url, {"a": 2}, b"short-lived", ttl=0.01)
+    assert cache.get(url, {"a": 1}) == b"payload"
+    time.sleep(0.05)
+    assert cache.get(url, {"a": 2}) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expired"] == 1
+    assert stats["bytes_read"] == len(b"payload")
+    assert stats["entries"] == 1
+
+
+def test_snapshot_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """The byte budget is enforced by dropping the least recently read entry."""
+    cache = SnapshotCache(tmp_path, max_bytes=25)
+    cache.put("u", {"k": "a"}, b"a" * 10)
+    cache.put("u", {"k": "b"}, b"b" * 10)
+    assert cache.get("u", {"k": "a"}) is not None
+    cache.put("u", {"k": "c"}, b"c" * 10)
+
+    assert cache.get("u", {"k": "b"}) is None
+    assert cache.get("u", {"k": "a"}) == b"a" * 10
+    assert cache.get("u", {"k": "c"}) == b"c" * 10
+    assert cache.stats()["evictions"] == 1
+
+    # a second handle on the same directory (another worker) sees the same index
+    other = SnapshotCache(tmp_path, max_bytes=25)
+    assert other.get("u", {"k": "c"}) == b"c" * 10
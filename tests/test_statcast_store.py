@@ -0,0 +1,212 @@
+import asyncio
+import datetime as dt
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.sequence_src import scrape_savant, statcast_store
+from backend.sequence_src.statcast_store import StatcastStore, merge_intervals, missing_intervals
+from sequence_biolab_api.deep_dive import pitcher, summary as pitch_summary
+
+
+def _pitches(rows):
+    return pd.DataFrame(
+        rows,
+        columns=["game_pk", "at_bat_number", "pitch_number", "game_date", "game_year", "game_type", "batter", "release_speed"],
+    )
+
+
+def test_store_partitions_and_dedupes(tmp_path: Path) -> None:
+    """Writes land in season/game_type partitions and re-writes do not duplicate pitches."""
+    store = StatcastStore(tmp_path)
+    df = _pitches([
+        (1, 1, 1, "2023-04-01", 2023, "R", 7, 95.0),
+        (1, 1, 2, "2023-04-01", 2023, "R", 7, 96.0),
+        (2, 5, 1, "2023-10-10", 2023, "D", 7, 97.0),
+        (3, 2, 1, "2024-05-01", 2024, "R", 7, 98.0),
+    ])
+    store.write("batter", 7, df)
+    store.write("batter", 7, df.iloc[[0, 1]])
+
+    assert store.partition_path("batter", 2023, "R", 7).exists()
+    assert store.partition_path("batter", 2023, "D", 7).exists()
+    assert len(store.read("batter", 7)) == 4
+
+    season = store.read("batter", 7, "2023-03-01", "2023-12-31", game_types=["R"])
+    assert sorted(season["pitch_number"]) == [1, 2]
+    assert set(store.read("batter", 7, "2023-10-01", "2024-12-31")["game_pk"]) == {2, 3}
+    assert store.read("batter", 8).empty
+    assert len(store.scan("batter", seasons=[2023])) == 3
+
+
+def test_fetch_reuses_covered_windows(tmp_path: Path, monkeypatch) -> None:
+    """A window inside one already fetched is served from the store."""
+    calls = []
+
+    def fake_fetch(start, end, player_id):
+        calls.append((start, end))
+        return _pitches([(1, 1, 1, "2023-04-01", 2023, "R", player_id, 95.0)])
+
+    monkeypatch.setattr(scrape_savant, "STORE", StatcastStore(tmp_path))
+    monkeypatch.setitem(scrape_savant._FETCHERS, "batter", fake_fetch)
+
+    first = scrape_savant.fetch_batter_statcast(7, "2023-03-01", "2023-10-31")
+    again = scrape_savant.fetch_batter_statcast(7, "2023-04-01", "2023-04-30")
+    assert calls == [("2023-03-01", "2023-10-31")]
+    assert len(first) == len(again) == 1
+
+
+def test_missing_intervals_against_merged_coverage() -> None:
+    """Only the uncovered dates of a window are reported as gaps."""
+    covered = merge_intervals([("2023-03-01", "2023-05-31"), ("2023-06-01", "2023-06-30"), ("2023-09-01", "2023-10-31")])
+    assert covered == [("2023-03-01", "2023-06-30"), ("2023-09-01", "2023-10-31")]
+    assert missing_intervals("2023-03-01", "2023-12-31", covered) == [
+        ("2023-07-01", "2023-08-31"),
+        ("2023-11-01", "2023-12-31"),
+    ]
+    assert missing_intervals("2023-04-01", "2023-04-30", covered) == []
+    assert missing_intervals("2022-12-01", "2023-03-05", covered) == [("2022-12-01", "2023-02-28")]
+
+
+def test_fetch_downloads_only_gaps(tmp_path: Path, monkeypatch) -> None:
+    """Widening a window fetches the new dates and merges without duplicates."""
+    calls = []
+
+    def fake_fetch(start, end, player_id):
+        calls.append((start, end))
+        # upstream may return pitches that overlap what is already stored
+        return _pitches([
+            (1, 1, 1, "2023-04-01", 2023, "R", player_id, 95.0),
+            (9, 1, 1, "2023-11-02", 2023, "R", player_id, 91.0),
+        ])
+
+    monkeypatch.setattr(scrape_savant, "STORE", StatcastStore(tmp_path))
+    monkeypatch.setitem(scrape_savant._FETCHERS, "batter", fake_fetch)
+
+    scrape_savant.fetch_batter_statcast(7, "2023-03-01", "2023-10-31")
+    df = scrape_savant.fetch_batter_statcast(7, "2023-03-01", "2023-12-31")
+    assert calls == [("2023-03-01", "2023-10-31"), ("2023-11-01", "2023-12-31")]
+    assert sorted(df["game_pk"]) == [1, 9]
+
+
+def test_finished_seasons_seal_and_live_days_throttle(tmp_path: Path, monkeypatch) -> None:
+    """A fully fetched past season is final; the current season only re-checks unsettled days after LIVE_TTL."""
+    calls = []
+
+    def fake_fetch(start, end, player_id):
+        calls.append((start, end))
+        return _pitches([(len(calls), 1, 1, start, int(start[:4]), "R", player_id, 95.0)])
+
+    store = StatcastStore(tmp_path)
+    monkeypatch.setattr(scrape_savant, "STORE", store)
+    monkeypatch.setitem(scrape_savant._FETCHERS, "pitcher", fake_fetch)
+
+    scrape_savant.fetch_pitcher_statcast(7, "2023-03-01", "2023-11-30")
+    assert store.sealed("pitcher", 7) == {2023}
+    scrape_savant._fetch_statcast("pitcher", 7, "2023-03-01", "2023-11-30", refresh=True)
+    assert len(calls) == 1
+    # sealed partitions are never rewritten
+    store.write("pitcher", 7, _pitches([(99, 1, 1, "2023-05-01", 2023, "R", 7, 90.0)]))
+    assert list(store.read("pitcher", 7)["game_pk"]) == [1]
+
+    today = dt.date.today()
+    start, end = f"{today.year}-01-01", f"{today.year}-12-31"
+    scrape_savant.fetch_pitcher_statcast(7, start, end)
+    # future dates are not requested
+    assert calls[-1] == (start, today.isoformat()) and store.sealed("pitcher", 7) == {2023}
+    scrape_savant.fetch_pitcher_statcast(7, start, end)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(statcast_store, "LIVE_TTL", 0.0)
+    scrape_savant.fetch_pitcher_statcast(7, start, end)
+    settled = today - dt.timedelta(days=statcast_store.SETTLE_DAYS)
+    assert calls[-1] == ((settled + dt.timedelta(days=1)).isoformat(), today.isoformat())
+
+
+def test_empty_fetch_is_rechecked_and_never_seals(tmp_path: Path, monkeypatch) -> None:
+    """An empty download holds for EMPTY_TTL only; the season seals once real pitches arrive."""
+    calls = []
+    responses = [_pitches([]), _pitches([(1, 1, 1, "2023-04-01", 2023, "R", 7, 95.0)])]
+
+    def fake_fetch(start, end, player_id):
+        calls.append((start, end))
+        return responses[len(calls) - 1]
+
+    store = StatcastStore(tmp_path)
+    monkeypatch.setattr(scrape_savant, "STORE", store)
+    monkeypatch.setitem(scrape_savant._FETCHERS, "pitcher", fake_fetch)
+
+    assert scrape_savant.fetch_pitcher_statcast(7, "2023-03-01", "2023-11-30").empty
+    assert store.sealed("pitcher", 7) == set()
+    scrape_savant.fetch_pitcher_statcast(7, "2023-03-01", "2023-11-30")
+    assert len(calls) == 1
+
+    monkeypatch.setattr(statcast_store, "EMPTY_TTL", 0.0)
+    df = scrape_savant.fetch_pitcher_statcast(7, "2023-03-01", "2023-11-30")
+    assert calls == [("2023-03-01", "2023-11-30")] * 2
+    assert list(df["game_pk"]) == [1] and store.sealed("pitcher", 7) == {2023}
+
+
+def test_sealed_season_summary_is_persisted(tmp_path: Path, monkeypatch) -> None:
+    """A sealed season is summarized from the store once; later loads read the persisted tables."""
+    df = _pitches([
+        (1, 1, 1, "2023-04-01", 2023, "R", 5, 95.0),
+        (1, 1, 2, "2023-04-01", 2023, "R", 5, 97.0),
+        (2, 3, 1, "2023-10-10", 2023, "D", 6, 99.0),
+    ])
+    store = StatcastStore(tmp_path)
+    monkeypatch.setattr(scrape_savant, "STORE", store)
+    monkeypatch.setattr(pitcher, "STATCAST_STORE", store)
+    monkeypatch.setitem(scrape_savant._FETCHERS, "pitcher", lambda start, end, player_id: df)
+    scrape_savant.fetch_pitcher_statcast(7, "2023-03-01", "2023-11-30")
+    assert store.sealed("pitcher", 7) == {2023}
+
+    def summaries():
+        monkeypatch.setattr(pitcher, "_summary_cache", pitcher.TTLCache(ttl_seconds=float("inf")))
+        return [asyncio.run(pitcher._fetch_statcast(7, [2023], span)) for span in ("regular", "postseason")]
+
+    first = summaries()
+    assert store.summary_path("pitcher", 2023, pitch_summary.STORED_NAME, "pitch", 7).exists()
+    monkeypatch.setattr(store, "read", lambda *a, **k: pytest.fail("sealed summary re-read the partitions"))
+    again = summaries()
+
+    for got, want, rows in zip(again, first, (df.iloc[:2], df.iloc[2:])):
+        expected = pitch_summary.summarize_pitches(rows)
+        for frame in ("pitch", "game"):
+            pd.testing.assert_frame_equal(getattr(got, frame), getattr(want, frame), check_dtype=False)
+            pd.testing.assert_frame_equal(getattr(got, frame), getattr(expected, frame), check_dtype=False)
+        assert [d.quantile(0.5) for d in got.sketches["release_speed"]] == [
+            d.quantile(0.5) for d in expected.sketches["release_speed"]
+        ]
+
+
+def test_live_season_summary_refetches_after_live_ttl(tmp_path: Path, monkeypatch) -> None:
+    """The deep dive's cached current-season summary does not outlive LIVE_TTL."""
+    calls = []
+
+    def fake_fetch(start, end, player_id):
+        calls.append((start, end))
+        return _pitches([(len(calls), 1, 1, end, int(end[:4]), "R", player_id, 95.0)])
+
+    store = StatcastStore(tmp_path)
+    monkeypatch.setattr(scrape_savant, "STORE", store)
+    monkeypatch.setattr(pitcher, "STATCAST_STORE", store)
+    monkeypatch.setattr(pitcher, "_summary_cache", pitcher.TTLCache(ttl_seconds=float("inf")))
+    monkeypatch.setitem(scrape_savant._FETCHERS, "pitcher", fake_fetch)
+    year = dt.date.today().year
+
+    def pitches() -> int:
+        summary = asyncio.run(pitcher._fetch_statcast(7, [year], "regular"))
+        return int(summary.pitch["n"].sum())
+
+    assert pitches() == 1 and pitches() == 1
+    assert len(calls) == 1
+    monkeypatch.setattr(statcast_store, "LIVE_TTL", 0.0)
+    assert pitches() == 2 and pitches() == 3
+    assert len(calls) == 3
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.analytics.zones import (
+    HEATMAP_GRID, ZONE_25, ZoneGrid, _gaussian_kernel, cell_index, gaussian_smooth, pitch_layers, smoothed_rate, zone_layers,
+)
+
+
+def _locations(n: int = 3000, seed: int = 2) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 0.8, n)
+    z = rng.normal(2.5, 1.0, n)
+    # exact bin edges and missing values must follow pd.cut semantics
+    x[:10] = np.linspace(-0.85, 0.85, 10)
+    z[10:20] = np.linspace(1.0, 4.0, 10)
+    x[20:25] = np.nan
+    return pd.DataFrame({
+        "plate_x": x,
+        "plate_z": z,
+        "sz_bot": np.where(rng.random(n) < 0.1, np.nan, rng.normal(1.6, 0.1, n)),
+        "sz_top": rng.normal(3.4, 0.1, n),
+        "type": rng.choice(["B", "S", "X"], n),
+        "description": rng.choice(["ball", "called_strike", "swinging_strike", "foul", "hit_into_play"], n),
+        "estimated_woba_using_speedangle": np.where(rng.random(n) < 0.7, np.nan, rng.random(n)),
+    })
+
+
+def test_absolute_grid_matches_pd_cut_pivot() -> None:
+    """Counts equal the previous pd.cut + pivot_table heatmap, edges included."""
+    df = _locations()
+    xb = pd.cut(df["plate_x"], bins=np.linspace(-0.85, 0.85, 10), labels=False, include_lowest=True)
+    zb = pd.cut(df["plate_z"], bins=np.linspace(1.0, 4.0, 10), labels=False, include_lowest=True)
+    pivot = (
+        df.assign(xb=xb, zb=zb, n=1).dropna(subset=["xb", "zb"])
+          .pivot_table(index="zb", columns="xb", values="n", aggfunc="count", fill_value=0)
+          .reindex(index=range(9), columns=range(9), fill_value=0)
+    )
+    grid = zone_layers(df, HEATMAP_GRID, {"pitches": None})["pitches"]
+    assert grid.astype(int).tolist() == pivot.astype(int).values.tolist()
+
+
+def test_normalized_clipped_grid_and_layers() -> None:
+    """Strike-zone units clamp into edge bins; all layers share one set of indices."""
+    df = _locations()
+    idx = cell_index(df, ZONE_25)
+    assert ((idx >= 0) == df["plate_x"].notna().to_numpy()).all()
+    bot = df["sz_bot"].fillna(1.5)
+    nz = ((df["plate_z"] - bot) / (df["sz_top"] - bot)).clip(0, 1)
+    row = (nz * 5).clip(0, 4.9999).astype(int)
+    valid = idx >= 0
+    assert (idx[valid] // 5 == row[valid].to_numpy()).all()
+
+    layers = zone_layers(df, ZONE_25, pitch_layers(df))
+    assert layers["pitches"].sum() == valid.sum()
+    assert (layers["whiffs"] <= layers["swings"]).all()
+    assert layers["xwoba_n"].sum() == df.loc[valid, "estimated_woba_using_speedangle"].notna().sum()
+
+    fine = zone_layers(df, ZoneGrid(40, 40), {"pitches": None})["pitches"]
+    assert fine.shape == (40, 40)
+
+
+def test_fft_smoothing_matches_direct_convolution() -> None:
+    """FFT blur equals a direct zero-padded separable convolution; rates mask thin cells."""
+    rng = np.random.default_rng(4)
+    grid = rng.poisson(0.3, (30, 40)).astype(float)
+    kz, kx = _gaussian_kernel(1.5), _gaussian_kernel(2.5)
+    rows = np.apply_along_axis(lambda r: np.convolve(r, kx, mode="same"), 1, grid)
+    direct = np.apply_along_axis(lambda c: np.convolve(c, kz, mode="same"), 0, rows)
+    np.testing.assert_allclose(gaussian_smooth(grid, (1.5, 2.5)), direct, atol=1e-12)
+
+    centre = np.zeros((41, 41))
+    centre[20, 20] = 10
+    assert np.isclose(gaussian_smooth(centre, 3.0).sum(), 10)
+
+    rate = smoothed_rate(np.array([1.0, 0.0, 2.0]), np.array([2.0, 0.0, 0.1]), min_den=0.5)
+    assert rate[0] == 0.5 and np.isnan(rate[1]) and np.isnan(rate[2])